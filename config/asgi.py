@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Bildirim uç noktaları (/api/notifications/stream, /api/notifications/poll) uzun
+ömürlü bağlantılardır; ASGI sunucusuyla çalıştırın: `uvicorn config.asgi:application`.
+Birden fazla süreç/düğümde NOTIFICATIONS_BROKER=database kullanın.
 """
 
 import os
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,6 +51,10 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    # En dışta: tüm katmanların sorgu/süresi ölçülsün (core/instrumentation.py)
+    'core.instrumentation.RequestMetricsMiddleware',
+    # Güvenli metotlu isteklerin okumaları replikaya, yazmadan sonra primary'ye pin (core/db_router.py)
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,12 +87,107 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgres: üretim profili. Django'nun psycopg bağlantı havuzu (pip install
+# "psycopg[binary,pool]"); havuz kalıcı bağlantıyla (CONN_MAX_AGE) birlikte kullanılamaz,
+# DB_POOL=0 ise havuz yerine kalıcı bağlantı. Health check iki durumda da açık.
+# Varsayılan SQLite (geliştirme/test): kalıcı bağlantı, IMMEDIATE transaction ve
+# bağlantı açılışında SQLITE_PRAGMAS (WAL vb., bkz. core/signals.py).
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+if DB_ENGINE == "postgres":
+    DB_POOL = os.environ.get("DB_POOL", "1") == "1"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("POSTGRES_DB", "pi_course"),
+            'USER': os.environ.get("POSTGRES_USER", "postgres"),
+            'PASSWORD': os.environ.get("POSTGRES_PASSWORD", ""),
+            'HOST': os.environ.get("POSTGRES_HOST", "localhost"),
+            'PORT': os.environ.get("POSTGRES_PORT", "5432"),
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "600")),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                    'max_size': int(os.environ.get("DB_POOL_MAX_SIZE", "20")),
+                    # Havuz doluysa bağlantı için en fazla bu kadar beklenir
+                    'timeout': float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+                    'max_idle': 300,
+                },
+            } if DB_POOL else {},
+        }
+    }
+elif DB_ENGINE == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Yazma kilidi transaction başında alınır: okumadan yazmaya geçişte
+                # busy_timeout beklenmeden "database is locked" olmaz
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
+else:
+    raise ImproperlyConfigured(f"Unknown DB_ENGINE: {DB_ENGINE!r} (expected 'sqlite' or 'postgres').")
+
+# Okuma replikaları (core/db_router.py): postgres'te POSTGRES_REPLICA_HOSTS="h1,h2",
+# sqlite'ta SQLITE_REPLICA_PATHS="/tmp/replica.sqlite3" (yerel deneme; primary'den
+# `manage.py sync_sqlite_replica` ile kopyalanır). Testlerde replikalar primary'nin aynasıdır.
+if DB_ENGINE == "postgres":
+    _replicas = [{'HOST': host} for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",") if host]
+else:
+    _replicas = [{'NAME': path} for path in os.environ.get("SQLITE_REPLICA_PATHS", "").split(",") if path]
+DATABASE_REPLICAS = []
+for _i, _override in enumerate(_replicas, start=1):
+    DATABASES[f"replica{_i}"] = {
+        **DATABASES['default'],
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        'TEST': {'MIRROR': 'default'},
+        **_override,
+    }
+    DATABASE_REPLICAS.append(f"replica{_i}")
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+# Yazmadan sonra istemcinin okumaları bu kadar süre primary'de (read-your-writes)
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+
+SQLITE_PRAGMAS = {
+    "busy_timeout": 5000,
+    "cache_size": -20000,  # KiB
+    "temp_store": "memory",
+    "mmap_size": 128 * 2**20,
 }
+# WAL: okuyucular yazarı beklemez; tek yazar kilidi kısa tutulur. journal_mode dosyaya kalıcı
+# yazılır (ve -wal/-shm dosyaları açılır): yalnızca sunucu / benchmark profilinde SQLITE_WAL=1
+SQLITE_WAL = os.environ.get("SQLITE_WAL", "0") == "1"
+if SQLITE_WAL:
+    SQLITE_PRAGMAS.update({"journal_mode": "wal", "synchronous": "normal"})
+
+# Cache: REDIS_URL verilirse paylaşılan Redis, yoksa süreç içi locmem
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# Throttle sayaçları (core/throttling.py): süreçler arası paylaşılmalı.
+# Redis varsa Lua/GCRA, yoksa veritabanındaki ThrottleBucket tablosu
+THROTTLE_STORE = os.environ.get("THROTTLE_STORE", "redis" if os.environ.get("REDIS_URL") else "db")
+
+# Public okuma uç noktaları için response cache (core/response_cache.py)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_TIMEOUT = 300
 
 AUTH_USER_MODEL = "core.User"
 # Password validation
@@ -107,6 +209,30 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Parola hasher'ları: ilki yeni hash'ler için; diğerleriyle üretilmiş hash'ler girişte ilkine
+# yükseltilir (core/hashing.py). Varsayılan PBKDF2. PASSWORD_HASHER=argon2 ancak argon2-cffi
+# tüm düğümlerde kuruluyken açılmalı (pip install argon2-cffi): kurulu olmayan düğüm argon2
+# hash'lerini doğrulayamaz
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2_sha256")
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "core.hashing.TunedArgon2PasswordHasher",
+]
+if PASSWORD_HASHER == "argon2":
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured("PASSWORD_HASHER=argon2 requires argon2-cffi (pip install argon2-cffi).")
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop())
+elif PASSWORD_HASHER != "pbkdf2_sha256":
+    raise ImproperlyConfigured(f"Unknown PASSWORD_HASHER: {PASSWORD_HASHER!r} (expected 'pbkdf2_sha256' or 'argon2').")
+# Argon2id parametreleri (memory_cost KiB); değişince mevcut hash'ler girişte yeniden üretilir
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "1"))
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -131,7 +257,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # role/pv claim'lerinden kullanıcı kurar, istek başına User sorgusu yok
+        "core.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -151,6 +278,94 @@ REST_FRAMEWORK = {
         # Alternatifler:
         # "lesson_request": "1/minute",
         # "lesson_request": "20/day",
+        # Kayıt/giriş: IP başına, girişte ayrıca email başına (core/async_views.py)
+        "auth": "5/hour",
+    },
+}
+
+# Claim tabanlı auth (core/authentication.py)
+# Deny-list cache ömrü: çok süreçli locmem'de iptalin diğer worker'lara yansıma süresi
+AUTH_DENYLIST_TTL = 30
+# Claim dışı kullanıcı alanlarının (email, ad, ...) cache ömrü
+AUTH_USER_CACHE_TTL = 300
+
+# Tek bir dersin azami süresi; çakışma sorgusunun tarama aralığını da sınırlar
+LESSON_MAX_DURATION_MINUTES = 8 * 60
+
+# Tutor puanı Bayes düzeltmesi (core/ratings.py): m önsel ortalama, C önsel yorum sayısı (0 = düz ortalama)
+RATING_PRIOR_MEAN = float(os.environ.get("RATING_PRIOR_MEAN", "4.0"))
+RATING_PRIOR_WEIGHT = float(os.environ.get("RATING_PRIOR_WEIGHT", "5"))
+
+# Delta sync (core/sync.py): commit gecikmesi payı, tombstone saklama süresi, sayfa boyutu
+SYNC_SETTLE_SECONDS = 2
+SYNC_TOMBSTONE_TTL = 30 * 24 * 3600
+SYNC_BATCH_SIZE = 500
+
+# Ders talebi bildirimleri (core/notifications.py): "memory" tek düğüm, "database" çok düğüm
+NOTIFICATIONS_BROKER = os.environ.get("NOTIFICATIONS_BROKER", "memory")
+NOTIFICATIONS_POLL_INTERVAL = 1.0  # database broker: düğüm başına yeni olay sorgusu aralığı (sn)
+NOTIFICATIONS_REORDER_WINDOW = 200  # database broker: geç commit olan olaylar için yeniden okunan son id sayısı
+NOTIFICATIONS_RETENTION = 24 * 3600  # database broker: olay saklama (Last-Event-ID replay)
+NOTIFICATIONS_HEARTBEAT = 15  # SSE ": ping" aralığı (sn)
+NOTIFICATIONS_RETRY_MS = 3000  # SSE istemci yeniden bağlanma beklemesi
+NOTIFICATIONS_POLL_TIMEOUT = 25  # long-poll azami bekleme (sn)
+
+# Liste serializer'ları için compiled (dict tabanlı) okuma yolu; çıktı birebir aynıdır
+COMPILED_READ_SERIALIZERS = os.environ.get("COMPILED_READ_SERIALIZERS", "0") == "1"
+
+# Subject -> tutor id indeksi (core/subject_index.py)
+# Yerel indeks en fazla bu kadar saniye kullanılır, sonra yeniden kurulur
+SUBJECT_INDEX_TTL = 300
+# id__in için üst sınır; aşılırsa through tablosuna alt sorgu kullanılır
+SUBJECT_INDEX_MAX_IN = 5000
+
+# Tutor listesi fasetleri (core/facets.py): aralık alt sınırları, son aralık üstten açık
+FACET_HOURLY_RATE_BUCKETS = [0, 250, 500, 750, 1000, 1500]
+FACET_RATING_BUCKETS = [0, 1, 2, 3, 4, 4.5]
+
+# Tutor önerileri (core/recommendations.py): skor bileşen ağırlıkları ve NumPy snapshot'ı
+RECOMMENDATION_WEIGHTS = {"subject": 0.5, "price": 0.2, "rating": 0.2, "approval": 0.1}
+# Snapshot en fazla bu kadar saniye kullanılır, sonra yeniden kurulur
+RECOMMENDATION_SNAPSHOT_TTL = 300
+# Daha fazla kaçırılmış değişiklik kaydı varsa tek tek uygulamak yerine yeniden kur
+RECOMMENDATION_MAX_REPLAY = 1000
+
+# Test ayarları: `manage.py test` DJANGO_TESTING=1 verir; başka koşucular (pytest vb.) da vermeli
+TESTING = os.environ.get("DJANGO_TESTING", "0") == "1"
+
+if TESTING and not DATABASE_REPLICAS:
+    # Replika yönlendirme testleri için ayrı, boş bir bellek DB'si (en uç replika gecikmesi);
+    # yalnızca `databases` içinde isteyen testler oluşturur, DATABASE_REPLICAS'a testte eklenir
+    DATABASES["replica"] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+# View başına sorgu bütçesi (query_budget) aşımı: testlerde hata, diğer ortamlarda uyarı logu
+QUERY_BUDGET_STRICT = TESTING or os.environ.get("QUERY_BUDGET_STRICT", "0") == "1"
+
+# Kayıt/giriş parola hash'leme havuzu (core/hashing.py). Ayarlar sunucu worker süreci başınadır:
+# her worker kendi havuzunu açar, düğümdeki toplam hash süreci = worker sayısı x
+# PASSWORD_HASH_WORKERS (0 = thread'de, testlerde varsayılan). Azami bekleyen iş de worker
+# başına (0 = 4 x havuz süreci); doluyken 503 Retry-After (sn)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "0" if TESTING else "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "0"))
+PASSWORD_HASH_RETRY_AFTER = 1
+
+# LessonRequest arşivi (core/archive.py): start_time'ı bu kadar günden eski talepler
+# `archive_lesson_requests` ile ArchivedLessonRequest'e taşınır
+ARCHIVE_LESSON_REQUESTS_AFTER_DAYS = int(os.environ.get("ARCHIVE_LESSON_REQUESTS_AFTER_DAYS", "180"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # İstek başına tek satır JSON ölçüm (sorgu sayısı, DB/serializer süresi, boyut)
+        "core.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("REQUEST_LOG_LEVEL", "WARNING" if TESTING else "INFO"),
+            "propagate": False,
+        },
     },
 }
 
@@ -158,4 +373,6 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "Pi Course API",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
+    # Async kayıt/giriş view'ları da şemada (core/schema.py)
+    "DEFAULT_GENERATOR_CLASS": "core.schema.SchemaGenerator",
 }
\ No newline at end of file
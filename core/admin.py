@@ -1,6 +1,6 @@
 # core/admin.py
 from django.contrib import admin
-from .models import User, Subject, TutorProfile, StudentProfile, LessonRequest
+from .models import User, Subject, TutorProfile, StudentProfile, LessonRequest, ArchivedLessonRequest
 
 
 @admin.register(User)
@@ -41,3 +41,23 @@ class LessonRequestAdmin(admin.ModelAdmin):
         "subject__name",
     )
     list_filter = ("status", "subject")
+
+
+@admin.register(ArchivedLessonRequest)
+class ArchivedLessonRequestAdmin(admin.ModelAdmin):
+    """Salt okunur; satırlar `archive_lesson_requests` ile gelir (core/archive.py)."""
+    list_display = ("id", "student", "tutor", "subject", "status", "start_time", "archived_at")
+    list_select_related = ("student", "tutor", "subject")
+    search_fields = (
+        "student__email", "student__username",
+        "tutor__email", "tutor__username",
+    )
+    list_filter = ("status",)
+    # Arşiv büyür: filtresiz toplam için ikinci COUNT(*) yapılmasın
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
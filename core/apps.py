@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Sinyal alıcılarını bağla (arama dokümanı vb.)
+        from . import signals  # noqa: F401
@@ -0,0 +1,136 @@
+# core/archive.py
+"""
+LessonRequest sıcak/soğuk katmanı.
+
+Talepler sürekli birikir; listeler, admin ve index'ler kimsenin bakmadığı geçmiş
+(reddedilmiş, çoktan bitmiş) derslerin maliyetini öder.
+
+- start_time'ı ARCHIVE_LESSON_REQUESTS_AFTER_DAYS günden eski talepler aynı id ile
+  ArchivedLessonRequest'e taşınır (`python manage.py archive_lesson_requests`).
+  Her parti (id sırasıyla) tek transaction: INSERT + sıcak tablodan DELETE. Komut yarıda
+  kesilirse kaldığı yerden devam eder; taşınmış satır tekrar seçilmez.
+- Silme sinyalsizdir: TutorStats ömür boyu sayaçları korunur (rebuild iki tabloyu da okur),
+  /api/sync'e tombstone yazılmaz (istemcideki eski kayıt geçerli kalır).
+- Review'i olan talepler sıcak katmanda kalır (Review -> LessonRequest FK'sı).
+- Varsayılan liste yalnızca sıcak tabloyu okur; `?include_archived=1` ikisini birleştirir
+  (CombinedLessonRequests: sayfa için sıralı birleştirme, export için UNION ALL).
+"""
+import heapq
+import time
+from datetime import timedelta
+from itertools import islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedLessonRequest, LessonRequest
+
+INCLUDE_ARCHIVED_PARAM = "include_archived"
+TRUE_VALUES = {"1", "true", "yes"}
+
+# Taşınan alanlar (archived_at hariç, o an yazılır)
+FIELDS = (
+    "id", "student_id", "tutor_id", "subject_id", "start_time", "duration_minutes", "end_time",
+    "status", "note", "created_at", "responded_at", "updated_at",
+)
+
+
+def include_archived(request):
+    return request.query_params.get(INCLUDE_ARCHIVED_PARAM, "").lower() in TRUE_VALUES
+
+
+def cutoff(days=None, now=None):
+    days = settings.ARCHIVE_LESSON_REQUESTS_AFTER_DAYS if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def candidates(before):
+    return LessonRequest.objects.filter(start_time__lt=before, review__isnull=True)
+
+
+def archive_batch(before, batch_size=1000, after_id=0):
+    """id > after_id olan ilk `batch_size` adayı taşır; (taşınan, son_id). Hiç yoksa (0, None)."""
+    with transaction.atomic():
+        rows = list(
+            candidates(before).filter(id__gt=after_id).order_by("id")
+            .select_for_update(of=("self",))
+            .values(*FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, None
+        ids = [row["id"] for row in rows]
+        # Önceki yarım kalmış koşu satırı zaten yazdıysa çakışma yok sayılır
+        ArchivedLessonRequest.objects.bulk_create(
+            [ArchivedLessonRequest(**row) for row in rows], ignore_conflicts=True,
+        )
+        # QuerySet.delete() satır başına post_delete (TutorStats, tombstone) çalıştırırdı
+        hot = LessonRequest.objects.filter(id__in=ids)
+        hot._raw_delete(hot.db)
+    return len(ids), ids[-1]
+
+
+def archive(before, batch_size=1000, max_batches=None, pause=0.0):
+    """Partiler halinde taşır; her partiden sonra (taşınan, son_id) üretir."""
+    after_id, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        moved, last_id = archive_batch(before, batch_size, after_id)
+        if not moved:
+            return
+        yield moved, last_id
+        after_id, batches = last_id, batches + 1
+        if pause:
+            # Yazma kilidini diğer isteklere bırak
+            time.sleep(pause)
+
+
+class CombinedLessonRequests:
+    """
+    Sıcak + arşiv queryset çifti (aynı filtrelerle). Sayfalama (order_by, filter, dilim,
+    count) ve export (values) için gereken kadar QuerySet arayüzü sunar.
+
+    Dilim: her tablodan aynı sırayla en fazla `stop` satır (select_related, tablo başına bir
+    sorgu) okunup Python'da birleştirilir; SQLite birleşik sorgunun parçalarında LIMIT'e
+    izin vermez, parçasız UNION ise kullanıcının tüm arşivini sıralardı.
+    """
+
+    # Filtre backend'leri (OrderingFilter vb.) queryset.model'e bakar
+    model = LessonRequest
+
+    def __init__(self, hot, archived, ordering=("-created_at", "-id")):
+        self.hot = hot
+        self.archived = archived
+        self.ordering = tuple(ordering)
+
+    def filter(self, *args, **kwargs):
+        return CombinedLessonRequests(
+            self.hot.filter(*args, **kwargs), self.archived.filter(*args, **kwargs), self.ordering,
+        )
+
+    def order_by(self, *fields):
+        return CombinedLessonRequests(self.hot, self.archived, fields)
+
+    def count(self):
+        return self.hot.count() + self.archived.count()
+
+    def values(self, *fields):
+        return (
+            self.hot.order_by().values(*fields)
+            .union(self.archived.order_by().values(*fields), all=True)
+            .order_by(*self.ordering)
+        )
+
+    def __getitem__(self, k):
+        if not isinstance(k, slice) or k.step is not None:
+            raise TypeError("CombinedLessonRequests only supports slicing without step.")
+        directions = {field.startswith("-") for field in self.ordering}
+        if len(directions) != 1:
+            raise ValueError("CombinedLessonRequests needs a single ordering direction.")
+        key = attrgetter(*(field.lstrip("-") for field in self.ordering))
+        parts = [qs.order_by(*self.ordering) for qs in (self.hot, self.archived)]
+        if k.stop is not None:
+            # Her taraftan en fazla `stop` satır yeter
+            parts = [part[:k.stop] for part in parts]
+        merged = heapq.merge(*parts, key=key, reverse=directions.pop())
+        return list(islice(merged, k.start, k.stop))
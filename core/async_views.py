@@ -0,0 +1,328 @@
+# core/async_views.py
+"""
+ASGI-native okuma yolu: /api/async/tutors, /api/async/subjects (list + detail),
+uzun ömürlü bildirim bağlantıları: /api/notifications/stream (SSE), /api/notifications/poll
+ve parola hash'i süreç havuzunda çalışan kayıt/giriş: /api/auth/register, /api/auth/login.
+
+Sync DRF viewset'leri ASGI altında thread havuzunda çalışır; bu view'lar ise
+event loop üzerinde kalır ve DB'ye async ORM (acount, aget, aiterator) ile gider.
+Cevap şekli sync uç noktalarla aynıdır (LimitOffset sayfalama, compiled serializer
+çıktısı). Response cache/ETag bu yolda yok; cache'li okuma için sync uç noktalar.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.exceptions import APIException, Throttled, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import hashing, notifications, schema
+from .authentication import ClaimsJWTAuthentication, ClaimsRefreshToken
+from .instrumentation import timed_serializer
+from .models import Subject
+from .serializers import LoginSerializer, RegisterSerializer, TutorDetailSerializer, TutorMiniSerializer
+from .throttling import AuthThrottle
+from .views import tutor_queryset
+
+User = get_user_model()
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def not_found(model):
+    # get_object_or_404 + DRF ile aynı gövde
+    return json_response({"detail": f"No {model._meta.object_name} matches the given query."}, status=404)
+
+
+async def paginate(request, qs, serialize):
+    """LimitOffsetPagination ile aynı parametreler ve cevap şekli."""
+    paginator = LimitOffsetPagination()
+    drf_request = Request(request)
+    paginator.request = drf_request
+    paginator.limit = paginator.get_limit(drf_request)
+    paginator.offset = paginator.get_offset(drf_request)
+    paginator.count = await qs.acount()
+    page = []
+    if paginator.count and paginator.offset < paginator.count:
+        window = qs[paginator.offset:paginator.offset + paginator.limit]
+        # prefetch_related, aiterator'da chunk_size ile çalışır
+        page = [obj async for obj in window.aiterator(chunk_size=paginator.limit)]
+    with timed_serializer():
+        results = serialize(page)
+    return json_response({
+        "count": paginator.count,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        "results": results,
+    })
+
+
+@require_GET
+async def tutor_list(request):
+    try:
+        # subject indeksi sync (cache + gerekirse DB); queryset kurulumu thread'de
+        qs = await sync_to_async(tutor_queryset)(request.GET)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    return await paginate(request, qs, TutorMiniSerializer().compiled_representation)
+
+
+tutor_list.query_budget = 4
+
+
+@require_GET
+async def tutor_detail(request, id):
+    try:
+        user = await tutor_queryset({}).select_related("stats").aget(id=id)
+    except User.DoesNotExist:
+        return not_found(User)
+    with timed_serializer():
+        data = TutorDetailSerializer().compiled_representation([user])[0]
+    return json_response(data)
+
+
+tutor_detail.query_budget = 2
+
+
+def subject_rows(subjects):
+    return [{"id": s["id"], "name": s["name"]} for s in subjects]
+
+
+@require_GET
+async def subject_list(request):
+    qs = Subject.objects.order_by("name").values("id", "name")
+    return await paginate(request, qs, subject_rows)
+
+
+subject_list.query_budget = 2
+
+
+@require_GET
+async def subject_detail(request, id):
+    try:
+        subject = await Subject.objects.values("id", "name").aget(id=id)
+    except Subject.DoesNotExist:
+        return not_found(Subject)
+    return json_response(subject)
+
+
+subject_detail.query_budget = 1
+
+
+# -----------------------------
+# Kayıt / giriş (parola hash'i core/hashing.py havuzunda)
+# -----------------------------
+def request_data(request):
+    """DRF view'larıyla aynı parser'lar (JSON, form, multipart)."""
+    parsers = [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]
+    return Request(request, parsers=parsers).data
+
+
+def busy_response(exc):
+    response = json_response({"detail": str(exc.detail)}, status=exc.status_code)
+    response["Retry-After"] = hashing.retry_after()
+    return response
+
+
+async def throttled(request, action, *idents):
+    """DRF throttle'ları bu view'larda çalışmaz: AuthThrottle reddederse 429 + Retry-After."""
+    throttle = AuthThrottle()
+    # Kova DB'de (ya da Redis'te): thread'de
+    if await sync_to_async(throttle.allow)(request, action, *idents):
+        return None
+    exc = Throttled(throttle.wait())
+    response = json_response({"detail": str(exc.detail)}, status=exc.status_code)
+    response["Retry-After"] = str(exc.wait)
+    return response
+
+
+@schema.documented_by(schema.RegisterSchemaView)
+@csrf_exempt
+@require_POST
+async def register(request):
+    """
+    POST /api/auth/register (RegisterSerializer ile aynı gövde ve cevap)
+    Doğrulama (benzersizlik sorguları) thread'de, hash havuzda, kayıt thread'de.
+    """
+    response = await throttled(request, "register")
+    if response is not None:
+        return response
+    try:
+        data = request_data(request)
+    except APIException as exc:
+        return json_response({"detail": str(exc.detail)}, status=exc.status_code)
+    serializer = RegisterSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return json_response(serializer.errors, status=400)
+    try:
+        encoded = await hashing.amake_password(serializer.validated_data["password"])
+    except hashing.HashingBusy as exc:
+        return busy_response(exc)
+
+    def save():
+        serializer.save(password_hash=encoded)
+        return serializer.data
+
+    try:
+        return json_response(await sync_to_async(save)(), status=201)
+    except IntegrityError:
+        # Hash sürerken aynı email/username ile kayıt oldu: alan hatası olarak dön
+        retry = RegisterSerializer(data=data)
+        await sync_to_async(retry.is_valid)()
+        return json_response(retry.errors or {"detail": "Account already exists."}, status=400)
+
+
+# Throttle kovası (ilk istekte UPDATE + savepoint'li INSERT, dakikada bir temizlik);
+# tutor kaydı: benzersizlik kontrolleri, user/profil/istatistik yazımları, arama dokümanı
+# (user ve profil kaydında iki kez) ve savepoint'ler
+register.query_budget = 26
+
+
+@schema.documented_by(schema.LoginSchemaView)
+@csrf_exempt
+@require_POST
+async def login(request):
+    """
+    POST /api/auth/login -> {refresh, access} (simplejwt TokenObtainPairView ile aynı cevaplar).
+    Eski hasher'la ya da eski parametrelerle üretilmiş hash başarılı girişte yenilenir.
+    """
+    try:
+        data = request_data(request)
+    except APIException as exc:
+        return json_response({"detail": str(exc.detail)}, status=exc.status_code)
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=400)
+    email, password = serializer.validated_data["email"], serializer.validated_data["password"]
+    response = await throttled(request, "login", email.lower())
+    if response is not None:
+        return response
+    user = await User.objects.filter(email=email).afirst()
+    try:
+        ok, upgraded = await hashing.averify(password, user.password if user else None)
+    except hashing.HashingBusy as exc:
+        return busy_response(exc)
+    if not ok or not user.is_active:
+        response = json_response({"detail": "No active account found with the given credentials"}, status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="api"'
+        return response
+    if upgraded:
+        # Aynı parola: profile_version/sinyal yok; arada parola değiştiyse dokunma
+        await User.objects.filter(pk=user.pk, password=user.password).aupdate(password=upgraded)
+    refresh = ClaimsRefreshToken.for_user(user)
+    return json_response({"refresh": str(refresh), "access": str(refresh.access_token)})
+
+
+# IP ve email kovaları (ilk istekte UPDATE + savepoint'li INSERT, dakikada bir temizlik),
+# kullanıcı, hash yükseltme
+login.query_budget = 13
+
+
+# -----------------------------
+# Bildirimler (core/notifications.py)
+# -----------------------------
+async def authenticate(request):
+    """JWT (Authorization: Bearer); (user, None) ya da (None, 401 cevabı)."""
+    auth = ClaimsJWTAuthentication()
+    try:
+        # Deny-list cache/DB'ye dokunabilir: thread'de
+        result = await sync_to_async(auth.authenticate)(Request(request))
+    except APIException as exc:
+        return None, json_response({"detail": str(exc.detail)}, status=exc.status_code)
+    if result is None:
+        return None, json_response({"detail": "Authentication credentials were not provided."}, status=401)
+    return result[0], None
+
+
+def parse_event_id(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        raise ValidationError({"last_event_id": "Expected an integer event id."})
+
+
+def sse_frame(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+@require_GET
+async def notification_stream(request):
+    """
+    Server-sent events. Yeniden bağlanırken Last-Event-ID (ya da ?last_event_id=)
+    kaçırılan olayları tekrar gönderir; boşta `: ping` ile bağlantı canlı tutulur.
+    """
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+    try:
+        last_event_id = parse_event_id(
+            request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+        )
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    subscription, backlog = await notifications.get_broker().subscribe(user.pk, last_event_id)
+
+    async def stream():
+        try:
+            yield f"retry: {settings.NOTIFICATIONS_RETRY_MS}\n\n"
+            for event in backlog:
+                yield sse_frame(event)
+            while True:
+                event = await subscription.get(timeout=settings.NOTIFICATIONS_HEARTBEAT)
+                yield sse_frame(event) if event is not None else ": ping\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # nginx vb. ara katmanlar tamponlamasın
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+notification_stream.query_budget = 2
+# Replikadan okunan backlog, poller'ın primary'den başladığı noktayla arada olay kaçırır
+notification_stream.replica_reads = False
+
+
+@require_GET
+async def notification_poll(request):
+    """
+    Long-poll: ?after=<son olay id>&timeout=<sn>. Olay varsa hemen, yoksa timeout
+    sonunda boş liste döner. {"events": [...], "last_event_id": ...}
+    """
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+    try:
+        after = parse_event_id(request.GET.get("after"))
+        timeout = min(float(request.GET.get("timeout") or settings.NOTIFICATIONS_POLL_TIMEOUT),
+                      settings.NOTIFICATIONS_POLL_TIMEOUT)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    except ValueError:
+        return json_response({"timeout": "Expected a number of seconds."}, status=400)
+
+    subscription, events = await notifications.get_broker().subscribe(user.pk, after)
+    try:
+        if not events:
+            event = await subscription.get(timeout=max(timeout, 0))
+            events = [event] if event is not None else []
+    finally:
+        subscription.close()
+    return json_response({"events": events, "last_event_id": events[-1]["id"] if events else after})
+
+
+notification_poll.query_budget = 2
+# Replikadan okunan backlog, poller'ın primary'den başladığı noktayla arada olay kaçırır
+notification_poll.replica_reads = False
@@ -0,0 +1,158 @@
+# core/authentication.py
+"""
+Claim tabanlı JWT doğrulama: istek başına kullanıcı satırı okunmaz.
+
+- Access token'a `role` ve `pv` (User.profile_version) claim'leri eklenir.
+- ClaimsJWTAuthentication kullanıcıyı claim'lerden kurar (User.from_claims); id/role
+  dışındaki alanlar ilk erişimde kısa TTL'li cache'ten gelir (yoksa tek sorgu).
+- İptal: son ACCESS_TOKEN_LIFETIME içinde yetki durumu değişen (auth_changed_at) ya da
+  silinen (DeletedUser, silmeyle aynı transaction'da) kullanıcılardan oluşan küçük bir
+  deny-list ({user_id: güncel pv, pasif/silinmişse None}) DB'den kurulup cache'te tutulur.
+  Pasif/silinmiş -> 401; claim'leri eski (pv küçük) -> kullanıcı DB'den okunur.
+- Claim'siz eski token'lar simplejwt'nin normal (DB'li) yoluna düşer.
+
+Not: değişikliği yapan süreç cache'i commit'te siler; locmem cache süreç başına olduğundan
+diğer worker'lar (pasifleştirme, rol değişimi ve silme) en geç AUTH_DENYLIST_TTL saniye sonra
+görür. Çok süreçli kurulumda REDIS_URL önerilir.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import IntegerField, Q, Value
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from . import db_router
+from .models import DeletedUser
+
+User = get_user_model()
+
+DENYLIST_KEY = "auth:denylist"
+# Claim'ler dışında cache'lenen alanlar (parola asla)
+CACHED_FIELDS = ("email", "username", "first_name", "last_name", "is_staff", "is_superuser")
+
+
+# -----------------------------
+# Token'lar
+# -----------------------------
+def add_claims(token, user):
+    token["role"] = user.role
+    token["pv"] = user.profile_version
+    return token
+
+
+class ClaimsAccessToken(AccessToken):
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    # Refresh'ten üretilen access token claim'leri kopyalar
+    access_token_class = ClaimsAccessToken
+
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+# -----------------------------
+# Deny-list
+# -----------------------------
+def _window():
+    return api_settings.ACCESS_TOKEN_LIFETIME
+
+
+def get_denylist():
+    denylist = cache.get(DENYLIST_KEY)
+    if denylist is None:
+        # Yalnızca son access token ömrü içinde değişenler: liste küçük kalır
+        since = timezone.now() - _window()
+        # Replika gecikmesi yeni pasifleştirilen kullanıcıyı kaçırır; sonuç TTL boyunca cache'te kalır
+        # Silinenler aynı sorguda (UNION): pasif gibi
+        deleted = DeletedUser.objects.filter(deleted_at__gte=since).annotate(
+            pv=Value(None, IntegerField()), active=Value(False),
+        ).values_list("user_id", "pv", "active")
+        with db_router.primary():
+            rows = list(
+                User.objects.filter(auth_changed_at__gte=since)
+                .values_list("id", "profile_version", "is_active").union(deleted, all=True)
+            )
+        denylist = {uid: (pv if active else None) for uid, pv, active in rows}
+        cache.set(DENYLIST_KEY, denylist, timeout=getattr(settings, "AUTH_DENYLIST_TTL", 30))
+    return denylist
+
+
+def invalidate_denylist():
+    transaction.on_commit(lambda: cache.delete(DENYLIST_KEY))
+
+
+def deny_deleted_user(user_id):
+    # Silinen satır User'dan türetilemez: iz aynı transaction'da yazılır, eskiler budanır
+    now = timezone.now()
+    DeletedUser.objects.filter(deleted_at__lt=now - _window()).delete()
+    DeletedUser.objects.bulk_create([DeletedUser(user_id=user_id, deleted_at=now)], ignore_conflicts=True)
+    invalidate_denylist()
+
+
+# -----------------------------
+# Ertelenmiş alan cache'i
+# -----------------------------
+def _fields_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def load_cached_fields(user, fields):
+    """User.refresh_from_db içinden çağrılır; alanlar doldurulduysa True."""
+    if not set(fields) <= set(CACHED_FIELDS):
+        return False
+    key = _fields_key(user.pk)
+    values = cache.get(key)
+    if values is None:
+        values = User.objects.filter(pk=user.pk).values(*CACHED_FIELDS).first()
+        if values is None:
+            return False
+        cache.set(key, values, timeout=getattr(settings, "AUTH_USER_CACHE_TTL", 300))
+    # Tek seferde hepsini doldur; sonraki alan erişimleri sorgu yapmaz
+    for name, value in values.items():
+        user.__dict__.setdefault(name, value)
+    return True
+
+
+def invalidate_cached_fields(user_id):
+    transaction.on_commit(lambda: cache.delete(_fields_key(user_id)))
+
+
+# -----------------------------
+# DRF authentication
+# -----------------------------
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        role = validated_token.get("role")
+        version = validated_token.get("pv")
+        if role is None or version is None:
+            return self.get_current_user(validated_token)
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
+
+        denylist = get_denylist()
+        if user_id in denylist:
+            current = denylist[user_id]
+            if current is None:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            if version < current:
+                # Rol vb. değişmiş: claim'lere güvenme, güncel satırı oku
+                return self.get_current_user(validated_token)
+        return User.from_claims(user_id, role, version)
+
+    def get_current_user(self, validated_token):
+        # is_active / rol kararı: replikadaki eski satır değil
+        with db_router.primary():
+            return super().get_user(validated_token)
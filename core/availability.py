@@ -0,0 +1,104 @@
+# core/availability.py
+"""
+Tutor takvimi: çakışma kontrolü ve boş slot hesabı.
+
+Çakışma koşulu: mevcut.start_time < yeni.end AND mevcut.end_time > yeni.start.
+Ders süresi LESSON_MAX_DURATION_MINUTES ile sınırlı olduğundan aday kayıtlar
+start_time ∈ (start - max_süre, end) aralığındadır; bu aralık
+(tutor, status, start_time) index'i üzerinde O(log n + k) range scan'dir.
+Tutor'un tüm geçmişi taranmaz.
+"""
+import bisect
+from datetime import timedelta
+
+from django.conf import settings
+
+from .models import LessonRequest
+
+
+def max_duration():
+    return timedelta(minutes=settings.LESSON_MAX_DURATION_MINUTES)
+
+
+def busy_lessons(tutor_id, start, end, statuses=(LessonRequest.Status.APPROVED,)):
+    """[start, end) aralığıyla kesişen dersler (start_time'a göre sıralı)."""
+    return (
+        LessonRequest.objects
+        .filter(
+            tutor_id=tutor_id,
+            status__in=statuses,
+            start_time__gt=start - max_duration(),
+            start_time__lt=end,
+            end_time__gt=start,
+        )
+        .order_by("start_time")
+    )
+
+
+def find_conflicts(tutor_id, start, end, exclude_id=None):
+    qs = busy_lessons(tutor_id, start, end)
+    if exclude_id is not None:
+        qs = qs.exclude(id=exclude_id)
+    return qs
+
+
+def has_conflict(tutor_id, start, end, exclude_id=None):
+    return find_conflicts(tutor_id, start, end, exclude_id=exclude_id).exists()
+
+
+def merge_intervals(intervals):
+    """Sıralı (start, end) çiftlerini birleştirir; çakışan/bitişik olanlar tek aralık olur."""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(s, e) for s, e in merged]
+
+
+def free_slots(tutor_id, start, end):
+    """
+    [start, end) penceresindeki dolu (onaylı) aralıklar ve aradaki boşluklar.
+    Dönüş: (busy, free) -> her biri (start, end) listesi.
+    """
+    rows = busy_lessons(tutor_id, start, end).values_list("start_time", "end_time")
+    busy = merge_intervals((max(s, start), min(e, end)) for s, e in rows)
+
+    free = []
+    cursor = start
+    for s, e in busy:
+        if s > cursor:
+            free.append((cursor, s))
+        cursor = max(cursor, e)
+    if cursor < end:
+        free.append((cursor, end))
+    return busy, free
+
+
+class BusyIntervals:
+    """
+    Bellekte, start'a göre sıralı onaylı ders aralıkları. Toplu status geçişlerinde
+    (bulk-status) tek sorguyla yüklenir; her çakışma kontrolü bisect ile O(log n + k).
+    """
+
+    def __init__(self, rows=()):
+        self._items = sorted(rows)                 # (start, end, id)
+        self._starts = [item[0] for item in self._items]
+
+    @classmethod
+    def load(cls, tutor_id, start, end, exclude_ids=()):
+        qs = busy_lessons(tutor_id, start, end).exclude(id__in=list(exclude_ids))
+        return cls(qs.values_list("start_time", "end_time", "id"))
+
+    def overlaps(self, start, end):
+        # Adaylar: start_time ∈ (start - max_süre, end)
+        lo = bisect.bisect_right(self._starts, start - max_duration())
+        hi = bisect.bisect_left(self._starts, end)
+        return any(item[1] > start for item in self._items[lo:hi])
+
+    def add(self, start, end, pk):
+        pos = bisect.bisect_right(self._starts, start)
+        self._starts.insert(pos, start)
+        self._items.insert(pos, (start, end, pk))
@@ -0,0 +1,113 @@
+# core/benchmarking.py
+"""
+Benchmark / yük testi komutları için ortak yardımcılar.
+
+- throwaway_database(): komut süresince geçici bir test veritabanı (gerçek DB'ye dokunmaz)
+- quiet_request_log(): istek başına ölçüm loglarını sustur
+- percentile_summary(): gecikme örneklerinden p50/p95/p99
+- save_baseline()/compare_baseline(): sonuçları JSON olarak saklayıp koşular arası fark
+"""
+import json
+import logging
+import statistics
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database(verbosity=0, test_name=None):
+    """
+    test_name: SQLite için dosya yolu; varsayılan paylaşımlı bellek DB'si thread'ler
+    arası eşzamanlılık ölçümünde (WAL, kilitler) gerçekçi değil.
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    old_test_name = test_settings.get("NAME")
+    if test_name is not None:
+        test_settings["NAME"] = test_name
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        if getattr(connection, "pool", None):
+            # Havuzdaki bağlantılar test DB'sinin silinmesini engeller
+            connection.close_pool()
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings["NAME"] = old_test_name
+
+
+@contextmanager
+def quiet_request_log():
+    """Benchmark süresince istek başına JSON log satırlarını (core.requests) sustur."""
+    logger = logging.getLogger("core.requests")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def percentile_summary(samples):
+    """ms cinsinden örnekler -> {"p50", "p95", "p99", "mean"}"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    if len(samples) == 1:
+        value = samples[0]
+        return {"p50": value, "p95": value, "p99": value, "mean": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "mean": round(statistics.fmean(samples), 3),
+    }
+
+
+def save_baseline(path, results, meta=None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"meta": meta or {}, "results": results}, indent=2, sort_keys=True))
+
+
+def load_baseline(path):
+    return json.loads(Path(path).read_text())
+
+
+# Karşılaştırılan metrikler: (anahtar yolu, göreli tolerans). Sorgu sayısında tolerans yok.
+COMPARED_METRICS = (
+    (("latency_ms", "p50"), 0.20),
+    (("latency_ms", "p95"), 0.20),
+    (("latency_ms", "p99"), 0.30),
+    (("queries",), 0.0),
+    (("alloc_kib",), 0.20),
+)
+
+
+def _dig(data, path):
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def compare_baseline(baseline, current, scale=1.0):
+    """
+    Her senaryo/metrik için (senaryo, metrik, eski, yeni, değişim_oranı, regresyon_mu) üretir.
+    `scale` toleransları topluca genişletir/daraltır.
+    """
+    rows = []
+    for name, result in current.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for path, tolerance in COMPARED_METRICS:
+            before, after = _dig(old, path), _dig(result, path)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+            rows.append((name, ".".join(path), before, after, change, change > tolerance * scale))
+    return rows
@@ -0,0 +1,136 @@
+# core/db_router.py
+"""
+Okuma replikası yönlendirmesi (settings.DATABASE_ROUTERS, settings.DATABASE_REPLICAS).
+
+- Yazmalar ve istek dışındaki her şey (komutlar, poller, on_commit işleri) primary'ye ("default").
+- Güvenli metotlu (GET/HEAD/OPTIONS) isteklerin okumaları istek başına seçilen bir replikaya.
+  View `replica_reads = False` ile kapatır (delta sync, bildirimler: replika gecikmesi
+  token/olay atlatır). Response cache'e yazılacak cevaplar primary'den üretilir.
+- Read-your-writes: başarılı bir yazma isteğinden sonra REPLICA_PIN_SECONDS boyunca aynı
+  istemcinin okumaları primary'de kalır. Pin iki yerde tutulur: cookie (kayıt gibi kimliksiz
+  yazmalar, tarayıcılar) ve kullanıcı başına cache anahtarı (JWT ile gelen, cookie taşımayan
+  istemciler). Pin yalnızca yönlendirme ipucudur, yetki için kullanılmaz.
+
+Yerelde iki SQLite dosyasıyla denenebilir: SQLITE_REPLICA_PATHS ve `manage.py sync_sqlite_replica`.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "db_pin"
+
+# İstek boyunca okuma alias'ı; None = primary
+_read_alias = ContextVar("core_db_read_alias", default=None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar primary'nin kopyası: nesneler alias'lar arasında ilişkilendirilebilir
+        return True
+
+
+@contextmanager
+def primary():
+    """Blok içindeki okumalar primary'ye."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def _pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def _bearer_user_id(request):
+    # İmza doğrulanmaz: sahte id yalnızca primary'den okumaya yol açar
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    try:
+        claims = jwt.decode(header[7:], options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get(jwt_settings.USER_ID_CLAIM)
+
+
+def is_pinned(request):
+    try:
+        if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    user_id = _bearer_user_id(request)
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+def pin(request, response):
+    seconds = settings.REPLICA_PIN_SECONDS
+    response.set_cookie(PIN_COOKIE, str(int(time.time() + seconds)), max_age=seconds, httponly=True, samesite="Lax")
+    # DRF kimlik doğrulaması kullanıcıyı Django request'ine de yazar
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), 1, timeout=seconds)
+
+
+def choose_replica(request, view_func):
+    replicas = getattr(settings, "DATABASE_REPLICAS", ())
+    if not replicas or request.method not in SAFE_METHODS:
+        return None
+    cls = getattr(view_func, "cls", None)
+    if not getattr(cls or view_func, "replica_reads", True) or is_pinned(request):
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _read_alias.set(choose_replica(request, view_func))
+        return None
+
+    def finish(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin(request, response)
+        return response
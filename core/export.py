@@ -0,0 +1,93 @@
+# core/export.py
+"""
+Lesson request geçmişinin akışlı (streaming) dışa aktarımı: NDJSON ve CSV.
+
+Satırlar `values()` projeksiyonu + `.iterator(chunk_size)` ile okunur; model örneği
+ve tam liste oluşmaz, bellek satır sayısından bağımsızdır. NDJSON satırları list
+cevabıyla aynı şekildedir (LessonRequestListSerializer.compile_values_row).
+
+CSV'de serbest metin hücreleri (not, subject adı, email) formül karakteriyle başlıyorsa
+başına ' eklenir (CSV injection).
+
+`?format=ndjson|csv` DRF'in format override'ı ile seçilir; bu yüzden iki format
+birer renderer olarak tanımlı (hata cevapları da aynı formatta döner).
+"""
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from .serializers import LessonRequestListSerializer
+
+CSV_COLUMNS = (
+    "id", "student_email", "tutor_email", "subject_id", "subject_name",
+    "start_time", "duration_minutes", "status", "note", "created_at",
+)
+
+# Hesap tablolarında formül başlatan karakterler (sekme/CR dahil)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return "".join(ndjson_line(row) for row in rows).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Sadece hata gövdeleri buradan geçer ({"detail": ...})
+        data = data if isinstance(data, dict) else {"detail": data}
+        buffer = _LineBuffer()
+        writer = csv.writer(buffer)
+        return (writer.writerow(data.keys()) + writer.writerow(data.values())).encode(self.charset)
+
+
+class _LineBuffer:
+    """csv.writer'ın yazdığı satırı döndürür (bellekte birikmez)."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_line(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_rows(queryset, chunk_size):
+    return queryset.values(*LessonRequestListSerializer.values_fields).iterator(chunk_size=chunk_size)
+
+
+def stream_ndjson(queryset, tz, chunk_size=2000):
+    compile_row = LessonRequestListSerializer.compile_values_row
+    for row in iter_rows(queryset, chunk_size):
+        yield ndjson_line(compile_row(row, tz))
+
+
+def csv_text(value):
+    """Kullanıcı metni tabloda formül olarak çalışmasın (=, +, -, @ ile başlayan hücre)."""
+    if value and value[0] in FORMULA_PREFIXES:
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset, tz, chunk_size=2000):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(CSV_COLUMNS)
+    compile_row = LessonRequestListSerializer.compile_values_row
+    for row in iter_rows(queryset, chunk_size):
+        item = compile_row(row, tz)
+        yield writer.writerow((
+            item["id"], csv_text(item["student_email"]), csv_text(item["tutor_email"]),
+            item["subject"]["id"], csv_text(item["subject"]["name"]),
+            item["start_time"], item["duration_minutes"], item["status"], csv_text(item["note"]),
+            item["created_at"],
+        ))
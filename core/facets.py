@@ -0,0 +1,123 @@
+# core/facets.py
+"""
+Tutor listesi faset sayıları (GET /api/tutors?facets=subject,hourly_rate,rating).
+
+Filtre ekranı, mevcut `?search=` / `?subject=` sonuç kümesi için subject başına tutor
+sayısını ve ücret / puan dağılımını ister. Faset başına ayrı COUNT yerine:
+
+- İstenen her faset, sonuç kümesi (tutor_queryset) üzerinde (faset, anahtar, etiket, adet)
+  döndüren bir GROUP BY'dır; hepsi UNION ALL ile tek sorguda çalışır (bkz. core/sync.py'deki
+  aynı düzen).
+- Ücret ve puan aralıkları ayarlardan gelir (FACET_HOURLY_RATE_BUCKETS,
+  FACET_RATING_BUCKETS; alt sınırlar, son aralık üstten açık); boş aralıklar da döner.
+
+Sonuç sayfadan ve sıralamadan bağımsızdır: normalize edilmiş filtre kümesi + subject/tutor
+versiyonlarıyla ayrı cache'lenir (response cache'le aynı sayaçlar, bkz. core/response_cache.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, IntegerField, Value, When
+from rest_framework.exceptions import ValidationError
+
+from . import response_cache
+
+FACETS = ("subject", "hourly_rate", "rating")
+# Sonucu etkileyen filtreler (sayfa/sıralama hariç)
+FILTER_PARAMS = ("subject", "subject_mode", "search")
+VERSIONS = ("subjects", "tutors")
+
+
+def parse_facets(params):
+    raw = params.get("facets")
+    if not raw:
+        return []
+    names = sorted({part.strip() for part in raw.split(",") if part.strip()})
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValidationError({"facets": f"Unknown facet(s): {', '.join(unknown)}. Expected: {', '.join(FACETS)}."})
+    return names
+
+
+def bucket_edges():
+    return {
+        "hourly_rate": list(getattr(settings, "FACET_HOURLY_RATE_BUCKETS", [0, 250, 500, 750, 1000, 1500])),
+        "rating": list(getattr(settings, "FACET_RATING_BUCKETS", [0, 1, 2, 3, 4, 4.5])),
+    }
+
+
+def _bucket(field, edges):
+    # İlk eşleşen When kazanır: en büyük alt sınırdan başla
+    whens = [When(**{f"{field}__gte": edge}, then=Value(i)) for i, edge in reversed(list(enumerate(edges)))]
+    return Case(*whens, default=Value(0), output_field=IntegerField())
+
+
+def _grouped(qs, facet, key, label):
+    return (
+        qs.order_by()
+        .annotate(facet=Value(FACETS.index(facet), output_field=IntegerField()), key=key, label=label)
+        .values_list("facet", "key", "label")
+        .annotate(n=Count("id"))
+    )
+
+
+def compute(tutors, names):
+    """`tutors`: sonuç kümesinin User queryset'i (tutor_queryset). Tek sorgu."""
+    if not names:
+        return {}
+    edges = bucket_edges()
+    no_label = Value(None, output_field=CharField())
+    # Her parça sonuç kümesinin kendisi üzerinde gruplar (alt sorgu değil): arama backend'lerinin
+    # tabloya doğrudan atıf yapan koşulları (FTS join) bozulmaz
+    parts = []
+    for name in names:
+        if name == "subject":
+            key, label = F("tutorprofile__subjects__id"), F("tutorprofile__subjects__name")
+            parts.append(_grouped(tutors, name, key, label))
+        else:
+            profiled = tutors.filter(tutorprofile__isnull=False)
+            parts.append(_grouped(profiled, name, _bucket(f"tutorprofile__{name}", edges[name]), no_label))
+    union = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+
+    counts = {name: {} for name in names}
+    labels = {}
+    for facet, key, label, n in union:
+        if key is None:
+            # Subject'i olmayan tutor'lar (LEFT JOIN)
+            continue
+        counts[FACETS[facet]][key] = n
+        if label is not None:
+            labels[key] = label
+    result = {}
+    for name in names:
+        if name == "subject":
+            rows = [{"id": key, "name": labels[key], "count": n} for key, n in counts[name].items()]
+            result[name] = sorted(rows, key=lambda row: (-row["count"], row["name"], row["id"]))
+        else:
+            bounds = edges[name]
+            result[name] = [
+                {"min": low, "max": bounds[i + 1] if i + 1 < len(bounds) else None, "count": counts[name].get(i, 0)}
+                for i, low in enumerate(bounds)
+            ]
+    return result
+
+
+def cached(request, tutors, names):
+    """Normalize edilmiş filtre kümesi + faset adları başına cache; sayfalar/sıralamalar paylaşır."""
+    if not names:
+        return {}
+    if not getattr(settings, "RESPONSE_CACHE_ENABLED", True):
+        return compute(tutors, names)
+    raw = "|".join([
+        ",".join(f"{n}:{v}" for n, v in zip(VERSIONS, response_cache.get_versions(VERSIONS))),
+        response_cache.normalized_query(request, FILTER_PARAMS),
+        ",".join(names),
+        repr(bucket_edges()),
+    ])
+    key = f"{response_cache.KEY_PREFIX}:facets:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    result = cache.get(key)
+    if result is None:
+        result = compute(tutors, names)
+        cache.set(key, result, timeout=getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+    return result
@@ -0,0 +1,156 @@
+# core/hashing.py
+"""
+Parola hash'leme havuzu (kayıt ve giriş; bkz. core/async_views.py).
+
+PBKDF2 / Argon2 istek başına yüzlerce ms CPU harcar. Sync view'da bu süre boyunca
+worker (ve GIL) tutulur; dönem başı kayıt yoğunluğunda diğer uç noktalar aç kalır.
+
+- Hash üretme ve doğrulama sınırlı bir ProcessPoolExecutor'da çalışır
+  (PASSWORD_HASH_WORKERS; 0 = aynı süreçte, thread'de). Async view event loop'u bırakır.
+  Havuz ve sınır sunucu worker süreci başınadır: düğümdeki toplam hash süreci
+  worker sayısı x PASSWORD_HASH_WORKERS.
+- Süreç başına eşzamanlılık sınırı: en fazla PASSWORD_HASH_MAX_PENDING iş (kuyruk dahil).
+  Dolu ise beklemeden HashingBusy (503 + Retry-After: PASSWORD_HASH_RETRY_AFTER).
+- Şeffaf yükseltme: doğrulama başarılıysa ve hash tercih edilen hasher'la (PASSWORD_HASHERS[0])
+  ya da onun güncel parametreleriyle üretilmemişse, aynı iş içinde yeni hash da üretilir;
+  çağıran parolayı koşullu UPDATE ile değiştirir (aynı parola: profile_version artmaz).
+- TunedArgon2PasswordHasher: PASSWORD_HASHER=argon2 ile tercih edilen hasher (settings);
+  parametreler ARGON2_TIME_COST / ARGON2_MEMORY_COST / ARGON2_PARALLELISM. Parametre
+  değişince eski argon2 hash'leri de girişte yeniden üretilir.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, get_hasher, identify_hasher, is_password_usable, make_password,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests, retry shortly."
+    default_code = "hashing_busy"
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Algoritma adı aynı ("argon2"); must_update parametre farkını yakalar."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+# -----------------------------
+# Alt süreçte çalışan işler
+# -----------------------------
+def _init_worker():
+    # spawn: alt süreç Django'yu kendisi kurar
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        django.setup()
+
+
+def _hash(raw):
+    return make_password(raw)
+
+
+def _verify(raw, encoded):
+    """(eşleşti_mi, yeni_hash | None). encoded None: kullanıcı yok, süre yine de harcanır."""
+    preferred = get_hasher("default")
+    if encoded is None or not is_password_usable(encoded):
+        # Var olmayan hesapla var olanı süreden ayırt etmek zorlaşsın (ModelBackend ile aynı)
+        make_password(raw)
+        return False, None
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False, None
+    if not hasher.verify(raw, encoded):
+        return False, None
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return True, preferred.encode(raw, preferred.salt())
+    return True, None
+
+
+# -----------------------------
+# Havuz
+# -----------------------------
+class HashingPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = None
+        self._executor = None
+        self._slots = None
+
+    def _current(self):
+        workers = settings.PASSWORD_HASH_WORKERS
+        pending = settings.PASSWORD_HASH_MAX_PENDING or max(workers, 1) * 4
+        with self._lock:
+            if self._config != (workers, pending):
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                # fork, thread'li (sunucu) bir süreçte güvenli değil
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) if workers else None
+                self._slots = threading.BoundedSemaphore(pending)
+                self._config = (workers, pending)
+            return self._executor, self._slots
+
+    async def run(self, fn, *args):
+        executor, slots = self._current()
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        if executor is None:
+            try:
+                return await sync_to_async(fn, thread_sensitive=False)(*args)
+            finally:
+                slots.release()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        # İstemci koparsa bile yer, iş gerçekten bitince boşalır
+        future.add_done_callback(lambda _: slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._config = self._executor = self._slots = None
+
+
+pool = HashingPool()
+
+
+async def amake_password(raw):
+    return await pool.run(_hash, raw)
+
+
+async def averify(raw, encoded):
+    return await pool.run(_verify, raw, encoded)
+
+
+def retry_after():
+    return str(settings.PASSWORD_HASH_RETRY_AFTER)
@@ -0,0 +1,198 @@
+# core/instrumentation.py
+"""
+İstek başına ölçüm: SQL sorgu sayısı, toplam DB süresi, serializer süresi, cevap boyutu.
+
+- RequestMetricsMiddleware her isteği ölçer; sonuç `Server-Timing` header'ı ve
+  `core.requests` logger'ına tek satır JSON olarak yazılır.
+- View'lar `query_budget` tanımlar (int ya da {action: int}). Bütçe aşılırsa
+  QUERY_BUDGET_STRICT açıkken (testler) QueryBudgetExceeded fırlatılır, kapalıyken uyarı loglanır.
+- Testler için: cevapta `response.metrics`, birden çok istek için record_requests().
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger("core.requests")
+
+_current = ContextVar("request_metrics", default=None)
+_recorders = []
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_ms: float = 0.0
+    serializer_ms: float = 0.0
+    total_ms: float = 0.0
+    response_bytes: int | None = None
+    view: str = ""
+    action: str = ""
+    budget: int | None = None
+    _serializer_depth: int = 0
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.queries > self.budget
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_ms:.1f}",
+            f"total;dur={self.total_ms:.1f}",
+        ])
+
+    def as_log(self, request, status_code):
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": status_code,
+            "view": self.view,
+            "action": self.action,
+            "queries": self.queries,
+            "query_budget": self.budget,
+            "db_ms": round(self.db_ms, 2),
+            "serializer_ms": round(self.serializer_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+            "bytes": self.response_bytes,
+        }
+
+
+def current_metrics():
+    return _current.get()
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    # contextvar sync_to_async thread'lerine de taşındığı için async ORM sorguları da sayılır
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_ms += (time.perf_counter() - t0) * 1000
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """connection_created sinyali: her bağlantıya kalıcı ölçüm sarmalayıcısı (bkz. core/signals.py)."""
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def record_requests():
+    """Test yardımcısı: blok içindeki isteklerin ölçümlerini sırayla toplar."""
+    recorded = []
+    _recorders.append(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorders.remove(recorded)
+
+
+@contextmanager
+def timed_serializer():
+    """İç içe serializer'lar (nested/list child) tek kez sayılır."""
+    metrics = _current.get()
+    if metrics is None or metrics._serializer_depth:
+        yield
+        return
+    metrics._serializer_depth += 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serializer_depth -= 1
+        metrics.serializer_ms += (time.perf_counter() - t0) * 1000
+
+
+class TimedSerializerMixin:
+    """`.data` üretim süresini istek ölçümüne ekler (serializer ve list serializer'lar için)."""
+
+    @property
+    def data(self):
+        with timed_serializer():
+            return super().data
+
+
+def resolve_budget(view_func, method):
+    cls = getattr(view_func, "cls", None)
+    # Sınıf tabanlı view'larda sınıf özniteliği, fonksiyon view'larda fonksiyon özniteliği
+    budget = getattr(cls or view_func, "query_budget", None)
+    # ViewSet'lerde HTTP metodu -> action eşlemesi as_view() üzerinde
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    if isinstance(budget, dict):
+        budget = budget.get(action)
+    return (cls.__name__ if cls else getattr(view_func, "__name__", "")), action, budget
+
+
+class RequestMetricsMiddleware:
+    # ASGI'de async view'lar thread havuzuna düşmesin diye iki modu da destekler
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        metrics.total_ms = (time.perf_counter() - metrics.started) * 1000
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+        response["Server-Timing"] = metrics.server_timing()
+        response.metrics = metrics
+        for recorded in _recorders:
+            recorded.append(metrics)
+
+        line = metrics.as_log(request, response.status_code)
+        if metrics.over_budget:
+            message = (
+                f"{metrics.view}.{metrics.action}: {metrics.queries} queries "
+                f"(budget {metrics.budget}) for {request.method} {request.path}"
+            )
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning("query budget exceeded: %s", json.dumps(line))
+        else:
+            logger.info(json.dumps(line))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view, metrics.action, metrics.budget = resolve_budget(view_func, request.method)
+        return None
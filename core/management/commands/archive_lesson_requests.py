@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "start_time'ı --older-than-days günden eski LessonRequest'leri partiler halinde "
+        "ArchivedLessonRequest'e taşır. Her parti ayrı transaction; yarıda kesilirse tekrar "
+        "çalıştırmak kaldığı yerden devam eder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_LESSON_REQUESTS_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-batches", type=int, help="Bu kadar partiden sonra dur (sonraki koşu devam eder)")
+        parser.add_argument("--pause", type=float, default=0.0, help="Partiler arası bekleme (sn)")
+        parser.add_argument("--dry-run", action="store_true", help="Sadece taşınacak satır sayısını yaz")
+
+    def handle(self, *args, **opts):
+        if opts["older_than_days"] < 1 or opts["batch_size"] < 1:
+            raise CommandError("--older-than-days ve --batch-size pozitif olmalı")
+        before = archive.cutoff(opts["older_than_days"])
+        if opts["dry_run"]:
+            count = archive.candidates(before).count()
+            self.stdout.write(f"{count} talep taşınacak (start_time < {before.isoformat()}).")
+            return
+
+        started = time.perf_counter()
+        total = 0
+        for moved, last_id in archive.archive(
+            before, batch_size=opts["batch_size"], max_batches=opts["max_batches"], pause=opts["pause"],
+        ):
+            total += moved
+            if opts["verbosity"] > 1:
+                self.stdout.write(f"  {moved} talep taşındı (son id {last_id})")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} talep arşivlendi (start_time < {before.isoformat()}, {elapsed:.2f}s)."
+        ))
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core import benchmarking, synthetic
+
+TARGETS = {
+    "tutors": ("/api/tutors/", "/api/async/tutors/"),
+    "subjects": ("/api/subjects/", "/api/async/subjects/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync TutorViewSet/SubjectViewSet ile ASGI-native async okuma yolunu aynı ASGI uygulaması "
+        "üzerinden, N eşzamanlı bağlantıyla kıyaslar: istek/sn, gecikme, bellek (tracemalloc tepe), thread."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=2000)
+        parser.add_argument("--target", choices=sorted(TARGETS), default="tutors")
+        parser.add_argument("--query", default="limit=20", help="Örn: 'subject=1&ordering=hourly_rate'")
+        parser.add_argument("--concurrency", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=5000, help="Mod başına toplam istek")
+        parser.add_argument(
+            "--client-delay-ms", type=float, default=0.0,
+            help="Yavaş istemci: cevap gövdesi her gönderildiğinde bekleme",
+        )
+        parser.add_argument("--with-response-cache", action="store_true",
+                            help="Sync yolda response cache açık kalsın (varsayılan: kapalı, adil kıyas)")
+
+    def handle(self, *args, **opts):
+        if opts["concurrency"] < 1 or opts["requests"] < 1:
+            raise CommandError("--concurrency ve --requests pozitif olmalı")
+        sync_path, async_path = TARGETS[opts["target"]]
+        with benchmarking.throwaway_database(), benchmarking.quiet_request_log(), \
+                override_settings(RESPONSE_CACHE_ENABLED=opts["with_response_cache"]):
+            synthetic.generate(tutors=opts["tutors"], students=10, lessons=0)
+            app = ASGIHandler()
+            rows = []
+            for mode, path in (("sync", sync_path), ("async", async_path)):
+                url = f"{path}?{opts['query']}" if opts["query"] else path
+                rows.append((mode, url, asyncio.run(self.run_mode(app, url, opts))))
+
+        self.stdout.write(
+            f"{opts['concurrency']} eşzamanlı bağlantı, mod başına {opts['requests']} istek, "
+            f"istemci gecikmesi {opts['client_delay_ms']} ms"
+        )
+        self.stdout.write(
+            f"{'mode':<7}{'path':<36}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'peak MiB':>10}{'threads':>9}{'errors':>8}"
+        )
+        for mode, url, r in rows:
+            lat = r["latency_ms"]
+            self.stdout.write(
+                f"{mode:<7}{url:<36}{r['rps']:>9.0f}{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}"
+                f"{r['peak_mib']:>10.1f}{r['threads']:>9}{r['errors']:>8}"
+            )
+
+    async def run_mode(self, app, url, opts):
+        # Isınma: ilk istekte URL çözümleme, middleware zinciri vb.
+        await self.request(app, url, 0)
+        latencies, errors, peak_threads, elapsed = await self.drive(app, url, opts, opts["requests"])
+        # Bellek ayrı ve daha kısa bir turda: tracemalloc her tahsisi izler, hızı bozar
+        tracemalloc.start()
+        try:
+            await self.drive(app, url, opts, max(opts["concurrency"], opts["requests"] // 10))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            "rps": len(latencies) / elapsed,
+            "latency_ms": benchmarking.percentile_summary(latencies),
+            "peak_mib": peak / 2**20,
+            "threads": peak_threads,
+            "errors": errors,
+        }
+
+    async def drive(self, app, url, opts, total):
+        latencies, errors = [], 0
+        remaining = total
+        peak_threads = threading.active_count()
+        delay = opts["client_delay_ms"] / 1000
+
+        async def connection():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                t0 = time.perf_counter()
+                status = await self.request(app, url, delay)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                errors += status != 200
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while True:
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.01)
+
+        sampler = asyncio.create_task(sample_threads())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(connection() for _ in range(opts["concurrency"])))
+        finally:
+            sampler.cancel()
+        return latencies, errors, peak_threads, time.perf_counter() - started
+
+    @staticmethod
+    async def request(app, url, delay):
+        parts = urlsplit(url)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        finished = asyncio.Event()
+        body_sent = False
+        status = None
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Bağlantı cevap bitene kadar açık kalır
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                if delay:
+                    await asyncio.sleep(delay)
+                if not message.get("more_body"):
+                    finished.set()
+
+        await app(scope, receive, send)
+        finished.set()
+        return status
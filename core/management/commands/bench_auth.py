@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core import benchmarking, hashing
+
+PASSWORD = "bench-pass-123"
+
+
+@contextmanager
+def quiet_django_request_log():
+    # 503'ler beklenen sonuç; her biri için uyarı satırı basılmasın
+    logger = logging.getLogger("django.request")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+class Command(BaseCommand):
+    help = (
+        "Eşzamanlı girişler (POST /api/auth/login, ASGI): parola hash'i aynı süreçte (thread) ile "
+        "süreç havuzunda kıyaslanır; istek/sn, gecikme, 503 sayısı ve aynı anda ölçülen "
+        "GET /api/subjects/ gecikmesi (aç kalma)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--requests", type=int, default=400, help="Mod başına toplam giriş")
+        parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS or 4,
+                            help="Havuz modu için süreç sayısı")
+        parser.add_argument("--max-pending", type=int, default=None,
+                            help="Eşzamanlılık sınırı, aşılırsa 503 (varsayılan: --concurrency)")
+
+    def handle(self, *args, **opts):
+        if min(opts["users"], opts["concurrency"], opts["requests"], opts["workers"]) < 1:
+            raise CommandError("--users, --concurrency, --requests ve --workers pozitif olmalı")
+        max_pending = opts["max_pending"] or opts["concurrency"]
+        User = get_user_model()
+        with benchmarking.throwaway_database(), benchmarking.quiet_request_log(), quiet_django_request_log():
+            # Tek hash yeterli: hepsi aynı parola, salt'ın farklı olması ölçümü değiştirmez
+            encoded = make_password(PASSWORD)
+            User.objects.bulk_create([
+                User(email=f"bench{i}@example.com", username=f"bench{i}", password=encoded, role="student")
+                for i in range(opts["users"])
+            ])
+            app = ASGIHandler()
+            rows = []
+            for mode, workers in (("inline", 0), ("pool", opts["workers"])):
+                with override_settings(PASSWORD_HASH_WORKERS=workers,
+                                       PASSWORD_HASH_MAX_PENDING=max_pending):
+                    try:
+                        rows.append((mode, workers, asyncio.run(self.run_mode(app, opts))))
+                    finally:
+                        hashing.pool.shutdown()
+
+        self.stdout.write(
+            f"{opts['concurrency']} eşzamanlı bağlantı, mod başına {opts['requests']} giriş, "
+            f"hasher {make_password('x').split('$', 1)[0]}"
+        )
+        self.stdout.write(
+            f"{'mode':<8}{'workers':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'503':>6}{'errors':>8}"
+            f"{'probe p95':>11}"
+        )
+        for mode, workers, r in rows:
+            lat = r["latency_ms"]
+            self.stdout.write(
+                f"{mode:<8}{workers:>8}{r['rps']:>9.1f}{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}"
+                f"{r['busy']:>6}{r['errors']:>8}{r['probe_ms']['p95']:>11.1f}"
+            )
+
+    async def run_mode(self, app, opts):
+        # Isınma: havuz süreçleri Django'yu kurar, URL çözümleme vb.
+        await self.request(app, "POST", "/api/auth/login", self.body(0))
+        latencies, probes = [], []
+        counts = {"busy": 0, "errors": 0}
+        remaining = opts["requests"]
+        done = asyncio.Event()
+
+        async def connection():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                body = self.body(remaining % opts["users"])
+                t0 = time.perf_counter()
+                status = await self.request(app, "POST", "/api/auth/login", body)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                if status == 503:
+                    counts["busy"] += 1
+                elif status != 200:
+                    counts["errors"] += 1
+
+        async def probe():
+            # Hash yükü altında diğer uç noktalar ne kadar bekliyor
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await self.request(app, "GET", "/api/subjects/")
+                probes.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.05)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(connection() for _ in range(opts["concurrency"])))
+        finally:
+            elapsed = time.perf_counter() - started
+            done.set()
+            await prober
+        return {
+            "rps": len(latencies) / elapsed,
+            "latency_ms": benchmarking.percentile_summary(latencies),
+            "probe_ms": benchmarking.percentile_summary(probes),
+            **counts,
+        }
+
+    @staticmethod
+    def body(i):
+        return json.dumps({"email": f"bench{i}@example.com", "password": PASSWORD}).encode()
+
+    @staticmethod
+    async def request(app, method, path, body=b""):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        finished = asyncio.Event()
+        body_sent = False
+        status = None
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                finished.set()
+
+        await app(scope, receive, send)
+        finished.set()
+        return status
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core import benchmarking, synthetic
+from core.authentication import ClaimsAccessToken
+from core.models import User
+from core.throttling import LessonRequestThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Paralel ders talebi oluşturma (POST /api/lesson-requests/) kıyası, aktif DB profiliyle "
+        "(DB_ENGINE). Her thread gerçek WSGI handler üzerinden istek atar; bağlantı istek sonunda "
+        "kapanır, havuza döner ya da (CONN_MAX_AGE) açık kalır. --baseline aynı ölçümü Django "
+        "varsayılanlarıyla (havuz/PRAGMA/IMMEDIATE yok, CONN_MAX_AGE=0) da koşar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+        parser.add_argument("--requests", type=int, default=400, help="Thread sayısı başına toplam istek")
+        parser.add_argument("--tutors", type=int, default=50)
+        parser.add_argument("--students", type=int, default=200)
+        parser.add_argument("--baseline", action="store_true")
+
+    def handle(self, *args, **opts):
+        if opts["requests"] < 1 or min(opts["threads"]) < 1:
+            raise CommandError("--threads ve --requests pozitif olmalı")
+        variants = (["baseline"] if opts["baseline"] else []) + ["tuned"]
+        rows = []
+        with tempfile.TemporaryDirectory() as tmp, benchmarking.quiet_request_log(), quiet_errors(), \
+                mock.patch.dict(LessonRequestThrottle.THROTTLE_RATES, {"lesson_request": "1000000/hour"}):
+            for variant in variants:
+                # Her varyant kendi DB'sinde: SQLite'ta journal_mode dosyada kalıcı
+                test_name = os.path.join(tmp, f"{variant}.sqlite3") if connection.vendor == "sqlite" else None
+                with baseline_profile(variant == "baseline"), benchmarking.throwaway_database(test_name=test_name):
+                    data = synthetic.generate(
+                        tutors=opts["tutors"], students=opts["students"], subjects=4, lessons=0,
+                    )
+                    describe = describe_profile()
+                    tokens = [
+                        str(ClaimsAccessToken.for_user(u)) for u in User.objects.filter(id__in=data.student_ids)
+                    ]
+                    connections.close_all()
+                    for threads in opts["threads"]:
+                        result = self.run(threads, opts["requests"], tokens, data)
+                        rows.append((variant, describe, threads, result))
+
+        self.stdout.write(f"{'profile':<10}{'threads':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+        for variant, describe, threads, r in rows:
+            lat = r["latency_ms"]
+            self.stdout.write(
+                f"{variant:<10}{threads:>8}{r['rps']:>9.0f}{lat['p50']:>9.1f}{lat['p95']:>9.1f}"
+                f"{lat['p99']:>9.1f}{r['errors']:>8}"
+            )
+        for variant in variants:
+            describe = next(d for v, d, _, _ in rows if v == variant)
+            self.stdout.write(f"{variant}: {json.dumps(describe, sort_keys=True)}")
+
+    def run(self, threads, total, tokens, data):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        base = timezone.now() + timezone.timedelta(days=30)
+        counter = iter(range(total))
+        lock = threading.Lock()
+        latencies, errors = [], []
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        i = next(counter, None)
+                    if i is None:
+                        return
+                    body = {
+                        "tutor_id": data.tutor_ids[i % len(data.tutor_ids)],
+                        "subject_id": data.subject_ids[i % len(data.subject_ids)],
+                        # Her talep ayrı saat dilimi: çakışma kontrolü sonucu değiştirmesin
+                        "start_time": (base + timezone.timedelta(hours=i)).isoformat(),
+                        "duration_minutes": 60,
+                    }
+                    environ = factory.post(
+                        "/api/lesson-requests/", json.dumps(body), content_type="application/json",
+                        HTTP_AUTHORIZATION=f"Bearer {tokens[i % len(tokens)]}",
+                    ).environ
+                    t0 = time.perf_counter()
+                    response = handler(environ, lambda status, headers: None)
+                    b"".join(response)
+                    # request_finished: bağlantı kapanır / havuza döner
+                    response.close()
+                    elapsed = (time.perf_counter() - t0) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                        if response.status_code != 201:
+                            errors.append(response.status_code)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+        return {
+            "rps": len(latencies) / elapsed,
+            "latency_ms": benchmarking.percentile_summary(latencies),
+            "errors": len(errors),
+        }
+
+
+@contextmanager
+def baseline_profile(enabled):
+    """Django varsayılanları: her istekte yeni bağlantı, havuz / PRAGMA / IMMEDIATE yok."""
+    if not enabled:
+        # Ayarlanmış profil WAL ile (geçici dosyada; bkz. settings.SQLITE_WAL)
+        wal = {"journal_mode": "wal", "synchronous": "normal"}
+        with override_settings(SQLITE_PRAGMAS={**settings.SQLITE_PRAGMAS, **wal}):
+            yield
+        return
+    # Thread'lerin bağlantıları aynı settings sözlüğünden açılır
+    db = connections["default"].settings_dict
+    saved_age, saved_options = db.get("CONN_MAX_AGE"), dict(db["OPTIONS"])
+    db["CONN_MAX_AGE"] = 0
+    for key in ("pool", "transaction_mode"):
+        db["OPTIONS"].pop(key, None)
+    try:
+        with override_settings(SQLITE_PRAGMAS={}):
+            yield
+    finally:
+        db["CONN_MAX_AGE"] = saved_age
+        db["OPTIONS"].clear()
+        db["OPTIONS"].update(saved_options)
+
+
+@contextmanager
+def quiet_errors():
+    # "database is locked" vb. 500'ler hata sayısında görünür; traceback ve
+    # (DEBUG hata sayfasının yol açtığı) bütçe uyarıları basılmasın
+    loggers = [logging.getLogger(name) for name in ("django.request", "core.requests")]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
+
+
+def describe_profile():
+    db = connection.settings_dict
+    profile = {
+        "vendor": connection.vendor,
+        "conn_max_age": db.get("CONN_MAX_AGE"),
+        "pool": bool(db["OPTIONS"].get("pool")),
+    }
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            profile["journal_mode"] = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+            profile["busy_timeout_ms"] = cursor.execute("PRAGMA busy_timeout").fetchone()[0]
+        profile["transaction_mode"] = db["OPTIONS"].get("transaction_mode") or "DEFERRED"
+    return profile
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIClient
+
+from core import archive, benchmarking, synthetic
+from core.models import ArchivedLessonRequest, LessonRequest, User
+
+
+class Command(BaseCommand):
+    help = (
+        "LessonRequest arşivi: tutor talep listesinin gecikmesini arşivlemeden önce, sonra "
+        "(yalnızca sıcak tablo) ve ?include_archived=1 ile kıyaslar (geçici test DB'si üzerinde)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=200)
+        parser.add_argument("--students", type=int, default=2000)
+        parser.add_argument("--lessons", type=int, default=200_000)
+        parser.add_argument("--history-days", type=int, default=1095, help="Talep geçmişinin yayıldığı gün sayısı")
+        parser.add_argument("--older-than-days", type=int, default=180)
+        parser.add_argument("--samples", type=int, default=200, help="Mod başına istek")
+        parser.add_argument("--query", default="role=tutor&status=pending&limit=20")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        if opts["samples"] < 1 or opts["older_than_days"] < 1:
+            raise CommandError("--samples ve --older-than-days pozitif olmalı")
+        with benchmarking.throwaway_database(), benchmarking.quiet_request_log():
+            started = time.perf_counter()
+            data = synthetic.generate(
+                tutors=opts["tutors"], students=opts["students"], lessons=opts["lessons"],
+                days=opts["history_days"], seed=opts["seed"],
+            )
+            self.stdout.write(f"{opts['lessons']} talep üretildi ({time.perf_counter() - started:.1f}s)")
+            url = f"/api/lesson-requests/?{opts['query']}"
+            rows = [("önce", url, self.measure(data.tutor_ids, url, opts))]
+
+            started = time.perf_counter()
+            moved = sum(n for n, _ in archive.archive(archive.cutoff(opts["older_than_days"]), batch_size=5000))
+            self.stdout.write(f"{moved} talep arşivlendi ({time.perf_counter() - started:.1f}s)")
+            rows.append(("sonra", url, self.measure(data.tutor_ids, url, opts)))
+            merged = f"{url}&include_archived=1"
+            rows.append(("sonra", merged, self.measure(data.tutor_ids, merged, opts)))
+            hot, cold = LessonRequest.objects.count(), ArchivedLessonRequest.objects.count()
+
+        self.stdout.write(f"sıcak: {hot} satır, arşiv: {cold} satır")
+        self.stdout.write(f"{'':<7}{'path':<76}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+        for label, path, lat in rows:
+            self.stdout.write(f"{label:<7}{path:<76}{lat['p50']:>9.2f}{lat['p95']:>9.2f}{lat['p99']:>9.2f}")
+
+    @staticmethod
+    def measure(tutor_ids, url, opts):
+        rng = random.Random(opts["seed"])
+        tutors = User.objects.in_bulk(tutor_ids)
+        client = APIClient()
+        samples = []
+        for _ in range(opts["samples"]):
+            client.force_authenticate(tutors[rng.choice(tutor_ids)])
+            t0 = time.perf_counter()
+            res = client.get(url)
+            samples.append((time.perf_counter() - t0) * 1000)
+            if res.status_code != 200:
+                raise CommandError(f"{url}: {res.status_code}")
+        return benchmarking.percentile_summary(samples)
@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmarking, recommendations, synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Tutor önerisi: NumPy snapshot puanlaması ile aynı skorun ORM karşılığını "
+        "(recommendations.orm_ranking) karşılaştırır (geçici test DB'si üzerinde)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=100_000)
+        parser.add_argument("--students", type=int, default=200)
+        parser.add_argument("--lessons", type=int, default=20_000)
+        parser.add_argument("--samples", type=int, default=20, help="Ölçülen öğrenci sayısı")
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        if opts["samples"] < 1 or opts["limit"] < 1:
+            raise CommandError("--samples ve --limit pozitif olmalı")
+        with benchmarking.throwaway_database():
+            started = time.perf_counter()
+            data = synthetic.generate(
+                tutors=opts["tutors"], students=opts["students"], lessons=opts["lessons"], seed=opts["seed"],
+            )
+            self.stdout.write(f"{opts['tutors']} tutor üretildi ({time.perf_counter() - started:.1f}s)")
+            self.run(data.student_ids[:opts["samples"]], opts["limit"])
+
+    def run(self, student_ids, limit):
+        snapshot = recommendations.TutorSnapshot()
+        t0 = time.perf_counter()
+        snapshot._load()
+        self.stdout.write(f"snapshot kurulumu: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        numpy_ms, score_ms, orm_ms, matches = [], [], [], 0
+        for student_id in student_ids:
+            t0 = time.perf_counter()
+            subjects, tutors = recommendations.student_history(student_id)
+            t1 = time.perf_counter()
+            top = snapshot.rank(subjects, tutors)[:limit]
+            t2 = time.perf_counter()
+            expected = list(recommendations.orm_ranking(student_id)[:limit])
+            t3 = time.perf_counter()
+            numpy_ms.append((t2 - t0) * 1000)
+            score_ms.append((t2 - t1) * 1000)
+            orm_ms.append((t3 - t2) * 1000)
+            matches += [uid for uid, _ in top] == [uid for uid, _ in expected]
+
+        self.stdout.write(f"{'path':<28}{'p50':>10}{'max':>10}  (ms, {len(student_ids)} öğrenci, ilk {limit})")
+        for name, samples in (
+            ("numpy (geçmiş + puanlama)", numpy_ms),
+            ("numpy (yalnızca puanlama)", score_ms),
+            ("orm", orm_ms),
+        ):
+            self.stdout.write(f"{name:<28}{statistics.median(samples):>10.2f}{max(samples):>10.2f}")
+        self.stdout.write(f"aynı sıralama: {matches}/{len(student_ids)}")
@@ -0,0 +1,87 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Subject, TutorProfile, LessonRequest
+from core.serializers import TutorMiniSerializer, LessonRequestListSerializer
+
+User = get_user_model()
+
+PAGE_SIZES = (10, 50, 100, 250, 500)
+
+
+class Command(BaseCommand):
+    help = "TutorMini/LessonRequestList serializer'ları: DRF yolu vs compiled yol (satır/saniye)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.populate(max(PAGE_SIZES), random.Random(opts["seed"]))
+            self.run(opts["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self, n, rng):
+        subjects = Subject.objects.bulk_create([Subject(name=f"Subject {i}") for i in range(20)])
+        tutors = User.objects.bulk_create([
+            User(username=f"t{i}", email=f"t{i}@bench.local", first_name="Ad", last_name=f"Soyad{i}",
+                 role="tutor", password="!")
+            for i in range(n)
+        ])
+        student = User.objects.create(username="s", email="s@bench.local", role="student", password="!")
+        profiles = TutorProfile.objects.bulk_create([
+            TutorProfile(user=u, bio="bio " * 10, hourly_rate=rng.randint(100, 900),
+                         rating=round(rng.uniform(0, 5), 1))
+            for u in tutors
+        ])
+        through = TutorProfile.subjects.through
+        through.objects.bulk_create([
+            through(tutorprofile_id=p.id, subject_id=s.id)
+            for p in profiles for s in rng.sample(subjects, 3)
+        ])
+        now = timezone.now()
+        LessonRequest.objects.bulk_create([
+            LessonRequest(student=student, tutor=rng.choice(tutors), subject=rng.choice(subjects),
+                          start_time=now, duration_minutes=60, note="not")
+            for _ in range(n)
+        ])
+
+    def measure(self, serializer_cls, objects, repeat):
+        renderer = JSONRenderer()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            body = renderer.render(serializer_cls(objects, many=True).data)
+        elapsed = time.perf_counter() - started
+        return len(objects) * repeat / elapsed, body
+
+    def run(self, repeat):
+        tutors = list(
+            User.objects.filter(role="tutor").select_related("tutorprofile")
+            .prefetch_related("tutorprofile__subjects").order_by("id")
+        )
+        lessons = list(LessonRequest.objects.for_list().order_by("id"))
+        self.stdout.write(f"{'serializer':<28}{'page':>6}{'drf rows/s':>14}{'compiled rows/s':>18}{'x':>7}")
+        for name, cls, objects in (
+            ("TutorMiniSerializer", TutorMiniSerializer, tutors),
+            ("LessonRequestListSerializer", LessonRequestListSerializer, lessons),
+        ):
+            for size in PAGE_SIZES:
+                page = objects[:size]
+                with override_settings(COMPILED_READ_SERIALIZERS=False):
+                    slow, slow_body = self.measure(cls, page, repeat)
+                with override_settings(COMPILED_READ_SERIALIZERS=True):
+                    fast, fast_body = self.measure(cls, page, repeat)
+                if slow_body != fast_body:
+                    self.stderr.write(f"{name} page={size}: JSON çıktıları farklı!")
+                self.stdout.write(f"{name:<28}{size:>6}{slow:>14.0f}{fast:>18.0f}{fast / slow:>7.1f}")
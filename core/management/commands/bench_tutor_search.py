@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from core import search
+from core.models import TutorProfile
+
+User = get_user_model()
+
+FIRST_NAMES = ["Ayşe", "Mehmet", "Elif", "Can", "Zeynep", "Emre", "Selin", "Burak", "Deniz", "Ece"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Öztürk", "Aydın", "Arslan", "Doğan", "Kılıç"]
+BIO_WORDS = [
+    "fizik", "matematik", "kimya", "biyoloji", "ingilizce", "doktora", "yüksek", "lisans",
+    "deneyimli", "öğretmen", "sınav", "hazırlık", "ODTÜ", "Boğaziçi", "kuantum", "geometri",
+]
+QUERIES = ["ayşe", "kaya", "fizik", "doktora kuantum", "mehmet demir", "tutor123", "xyz"]
+
+
+def legacy_filter(qs, term):
+    # Eski TutorViewSet yolu: beş kolonlu icontains OR + join
+    return qs.filter(
+        Q(username__icontains=term)
+        | Q(first_name__icontains=term)
+        | Q(last_name__icontains=term)
+        | Q(email__icontains=term)
+        | Q(tutorprofile__bio__icontains=term)
+    ).distinct()
+
+
+class Command(BaseCommand):
+    help = "?search= için eski icontains yolu ile arama indeksini karşılaştırır (geçici test DB'si üzerinde)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.populate(opts["tutors"], random.Random(opts["seed"]))
+            self.run(opts["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self, n, rng):
+        started = time.perf_counter()
+        batch = 5000
+        for offset in range(0, n, batch):
+            users = [
+                User(
+                    username=f"tutor{i}",
+                    email=f"tutor{i}@bench.local",
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    role="tutor",
+                    password="!",
+                )
+                for i in range(offset, min(offset + batch, n))
+            ]
+            User.objects.bulk_create(users)
+            TutorProfile.objects.bulk_create([
+                TutorProfile(user=u, bio=" ".join(rng.sample(BIO_WORDS, 6)),
+                             hourly_rate=rng.randint(100, 1000),
+                             rating=round(rng.uniform(0, 5), 1))
+                for u in users
+            ])
+        search.index_tutors()
+        self.stdout.write(f"{n} tutor oluşturuldu ve indekslendi ({time.perf_counter() - started:.1f}s)")
+
+    def timed(self, fn, repeat):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples)
+
+    def run(self, repeat):
+        base = User.objects.filter(role="tutor")
+        self.stdout.write(f"{'query':<18}{'legacy count':>14}{'index count':>14}{'legacy page':>14}{'index page':>14}  (ms, median)")
+        for term in QUERIES:
+            legacy = legacy_filter(base, term).order_by("-tutorprofile__rating")
+            indexed = search.order_by_relevance(search.search_tutors(base, term))
+            row = [
+                self.timed(legacy.count, repeat),
+                self.timed(indexed.count, repeat),
+                self.timed(lambda: list(legacy[:10]), repeat),
+                self.timed(lambda: list(indexed[:10]), repeat),
+            ]
+            self.stdout.write(f"{term:<18}" + "".join(f"{v:>14.2f}" for v in row))
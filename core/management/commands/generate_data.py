@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core import synthetic
+
+
+class Command(BaseCommand):
+    help = "Deterministik sentetik veri üretir (tutors/students/subjects/lesson requests)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=1000)
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--subjects", type=int, default=16)
+        parser.add_argument("--lessons", type=int, default=20000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        data = synthetic.generate(
+            tutors=opts["tutors"], students=opts["students"], subjects=opts["subjects"],
+            lessons=opts["lessons"], days=opts["days"], seed=opts["seed"], stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Oluşturuldu: {data.subjects} subject, {data.tutors} tutor, {data.students} student, "
+            f"{data.lessons} lesson request (parola: {synthetic.SYNTHETIC_PASSWORD})"
+        ))
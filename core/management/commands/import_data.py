@@ -0,0 +1,313 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from core import recommendations, response_cache, search, tutor_stats
+from core.models import Subject, TutorProfile, StudentProfile, LessonRequest
+from core.subject_index import subject_index
+
+User = get_user_model()
+
+KINDS = ("subjects", "tutors", "students", "lessons")
+
+
+def _init_worker():
+    # spawn tabanlı platformlarda (macOS/Windows) alt süreç Django'yu kendisi kurmalı
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        django.setup()
+
+
+def _hash_password(raw):
+    return make_password(raw or None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Eski sistemden toplu veri aktarımı (CSV/JSONL, parça parça akış). "
+        "Örn: import_data tutors tutors.jsonl --chunk-size 5000 --workers 8 --resume"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"), help="Varsayılan: dosya uzantısı")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=1000, help="bulk_create batch_size")
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Parola hash'leme için süreç sayısı (0: aynı süreçte)",
+        )
+        parser.add_argument("--state-file", help="Varsayılan: <path>.import-state.json")
+        parser.add_argument("--resume", action="store_true", help="Son başarılı parçadan devam et")
+
+    # ---------- giriş ----------
+    def read_rows(self, path, fmt):
+        with open(path, newline="", encoding="utf-8") as fh:
+            if fmt == "csv":
+                yield from csv.DictReader(fh)
+            else:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+
+    @staticmethod
+    def chunks(rows, size):
+        it = iter(rows)
+        while True:
+            chunk = list(islice(it, size))
+            if not chunk:
+                return
+            yield chunk
+
+    # ---------- checkpoint ----------
+    def load_state(self, state_path, kind, path):
+        if not state_path.exists():
+            return 0
+        state = json.loads(state_path.read_text())
+        if state.get("kind") != kind or state.get("path") != str(path):
+            raise CommandError(f"{state_path} başka bir aktarıma ait; silin ya da --state-file verin.")
+        return state["rows_done"]
+
+    def save_state(self, state_path, kind, path, rows_done):
+        tmp = state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"kind": kind, "path": str(path), "rows_done": rows_done}))
+        tmp.replace(state_path)
+
+    def handle(self, *args, **opts):
+        kind = opts["kind"]
+        path = Path(opts["path"]).resolve()
+        if not path.exists():
+            raise CommandError(f"{path} bulunamadı")
+        fmt = opts["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+        state_path = Path(opts["state_file"] or f"{path}.import-state.json")
+        self.batch_size = opts["batch_size"]
+
+        skip = self.load_state(state_path, kind, path) if opts["resume"] else 0
+        if skip:
+            self.stdout.write(f"Devam: ilk {skip} satır atlanıyor")
+
+        # Subject adı -> id: tek sorgu, aktarım boyunca bellekte
+        self.subject_ids = dict(Subject.objects.values_list("name", "id"))
+
+        pool = None
+        self.workers = opts["workers"]
+        if kind in ("tutors", "students") and self.workers > 0:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self.pool = pool
+
+        handler = getattr(self, f"import_{kind}")
+        rows = islice(self.read_rows(path, fmt), skip, None)
+        done = skip
+        total_rows = 0
+        started = time.perf_counter()
+        try:
+            for index, chunk in enumerate(self.chunks(rows, opts["chunk_size"])):
+                chunk_started = time.perf_counter()
+                # Hata mesajlarında dosyadaki satır numarası için
+                self.chunk_start = done
+                try:
+                    with transaction.atomic():
+                        handler(chunk)
+                except Exception as exc:
+                    raise CommandError(
+                        f"Parça #{index} (satır {done}-{done + len(chunk)}) başarısız: {exc}. "
+                        f"Düzeltip --resume ile devam edebilirsiniz."
+                    ) from exc
+                done += len(chunk)
+                total_rows += len(chunk)
+                self.save_state(state_path, kind, path, done)
+                elapsed = time.perf_counter() - chunk_started
+                self.stdout.write(
+                    f"parça #{index}: {len(chunk)} satır, {len(chunk) / elapsed:,.0f} satır/sn (toplam {done})"
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            self.after_import(kind)
+
+        elapsed = time.perf_counter() - started
+        rate = total_rows / elapsed if elapsed else 0
+        state_path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"{kind}: {total_rows} satır {elapsed:.1f}s içinde aktarıldı ({rate:,.0f} satır/sn)."
+        ))
+
+    def after_import(self, kind):
+        # bulk_create sinyal tetiklemez: türetilmiş yapıları toplu olarak tazele
+        if kind in ("subjects", "tutors"):
+            subject_index.invalidate()
+            recommendations.snapshot.invalidate()
+            response_cache.bump_on_commit("subjects", "tutors")
+        elif kind == "lessons":
+            tutor_stats.rebuild()
+
+    # ---------- yardımcılar ----------
+    def resolve_subjects(self, names):
+        """Ad -> id (eksikler oluşturulur, boş adlar atlanır)."""
+        missing = {n for n in names if n and n not in self.subject_ids}
+        if missing:
+            Subject.objects.bulk_create(
+                [Subject(name=n) for n in missing], ignore_conflicts=True, batch_size=self.batch_size
+            )
+            self.subject_ids.update(Subject.objects.filter(name__in=missing).values_list("name", "id"))
+        return {n: self.subject_ids[n] for n in names if n}
+
+    @staticmethod
+    def split_subjects(value):
+        if not value:
+            return []
+        if isinstance(value, list):
+            return [str(v).strip() for v in value]
+        return [part.strip() for part in value.split(";") if part.strip()]
+
+    def hash_passwords(self, raws):
+        if self.pool is None:
+            return [_hash_password(r) for r in raws]
+        chunksize = max(1, len(raws) // (self.workers * 4))
+        return list(self.pool.map(_hash_password, raws, chunksize=chunksize))
+
+    @staticmethod
+    def assign_usernames(chunk, emails):
+        """
+        Verilmeyen username email'in yerel kısmıdır; o ad dosyada ya da DB'de başka bir
+        email'e aitse email'in tamamı kullanılır (john@a.com ve john@b.com birlikte gelebilir).
+        """
+        given = [(row.get("username") or "").strip() for row in chunk]
+        local = [email.split("@")[0] for email in emails]
+        owners = dict(
+            User.objects.filter(username__in={*local, *filter(None, given)}).values_list("username", "email")
+        )
+        # Açıkça verilen adlar önce sahiplenilir
+        for name, email in zip(given, emails):
+            if name:
+                owners.setdefault(name, email)
+        usernames = []
+        for name, default, email in zip(given, local, emails):
+            if not name:
+                name = default if owners.setdefault(default, email) == email else email
+            usernames.append(name)
+        return usernames
+
+    def create_users(self, chunk, role):
+        emails = [row["email"].strip().lower() for row in chunk]
+        usernames = self.assign_usernames(chunk, emails)
+        hashes = self.hash_passwords([row.get("password") for row in chunk])
+        users = [
+            User(
+                email=email,
+                username=username,
+                first_name=row.get("first_name", ""),
+                last_name=row.get("last_name", ""),
+                role=role,
+                password=pwd,
+            )
+            for row, email, username, pwd in zip(chunk, emails, usernames, hashes)
+        ]
+        # Tekrar çalıştırmada var olanları atla; id'leri tek sorguyla geri oku
+        User.objects.bulk_create(users, ignore_conflicts=True, batch_size=self.batch_size)
+        ids = dict(User.objects.filter(email__in=emails).values_list("email", "id"))
+        skipped = [
+            f"satır {self.chunk_start + i + 1} ({email})" for i, email in enumerate(emails) if email not in ids
+        ]
+        if skipped:
+            # Verilen username başka bir kullanıcıya ait: satır sessizce atlanmasın
+            raise CommandError(f"username çakışması: {', '.join(skipped[:5])}")
+        return ids
+
+    # ---------- türler ----------
+    def import_subjects(self, chunk):
+        self.resolve_subjects([row["name"].strip() for row in chunk])
+
+    def import_tutors(self, chunk):
+        ids = self.create_users(chunk, User.Role.TUTOR)
+        profiles = [
+            TutorProfile(
+                user_id=ids[row["email"].strip().lower()],
+                bio=row.get("bio", ""),
+                hourly_rate=int(row.get("hourly_rate") or 0),
+                rating=row.get("rating") or 0,
+            )
+            for row in chunk
+        ]
+        TutorProfile.objects.bulk_create(profiles, ignore_conflicts=True, batch_size=self.batch_size)
+        profile_ids = dict(
+            TutorProfile.objects.filter(user_id__in=ids.values()).values_list("user_id", "id")
+        )
+
+        # M2M: through tablosuna doğrudan toplu insert
+        through = TutorProfile.subjects.through
+        links = []
+        for row in chunk:
+            profile_id = profile_ids[ids[row["email"].strip().lower()]]
+            for subject_id in self.resolve_subjects(self.split_subjects(row.get("subjects"))).values():
+                links.append(through(tutorprofile_id=profile_id, subject_id=subject_id))
+        through.objects.bulk_create(links, ignore_conflicts=True, batch_size=self.batch_size)
+
+        search.index_tutors(ids.values())
+        tutor_stats.ensure_rows(ids.values())
+
+    def import_students(self, chunk):
+        ids = self.create_users(chunk, User.Role.STUDENT)
+        StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(user_id=ids[row["email"].strip().lower()], grade_level=row.get("grade_level", ""))
+                for row in chunk
+            ],
+            ignore_conflicts=True,
+            batch_size=self.batch_size,
+        )
+
+    def import_lessons(self, chunk):
+        emails = {row["student_email"].strip().lower() for row in chunk}
+        emails |= {row["tutor_email"].strip().lower() for row in chunk}
+        user_ids = dict(User.objects.filter(email__in=emails).values_list("email", "id"))
+        missing = emails - user_ids.keys()
+        if missing:
+            raise CommandError(f"Bilinmeyen kullanıcılar: {', '.join(sorted(missing)[:5])}")
+        names = [(row.get("subject") or "").strip() for row in chunk]
+        for i, name in enumerate(names):
+            if not name:
+                raise CommandError(f"Satır {self.chunk_start + i + 1}: subject boş")
+        subject_ids = self.resolve_subjects(names)
+
+        lessons, created_at = [], []
+        for row, name in zip(chunk, names):
+            start = parse_datetime(row["start_time"])
+            if start is None:
+                raise CommandError(f"Geçersiz start_time: {row['start_time']!r}")
+            lessons.append(LessonRequest(
+                student_id=user_ids[row["student_email"].strip().lower()],
+                tutor_id=user_ids[row["tutor_email"].strip().lower()],
+                subject_id=subject_ids[name],
+                start_time=start,
+                duration_minutes=int(row["duration_minutes"]),
+                status=row.get("status") or LessonRequest.Status.PENDING,
+                note=row.get("note", ""),
+                responded_at=parse_datetime(row["responded_at"]) if row.get("responded_at") else None,
+            ))
+            created_at.append(parse_datetime(row["created_at"]) if row.get("created_at") else None)
+
+        LessonRequest.objects.bulk_create(lessons, batch_size=self.batch_size)
+        # auto_now_add bulk_create'te de "şimdi"yi yazar; tarihsel created_at'i geri koy
+        historical = []
+        for lesson, ts in zip(lessons, created_at):
+            if ts is not None:
+                lesson.created_at = ts
+                historical.append(lesson)
+        if historical:
+            LessonRequest.objects.bulk_update(historical, ["created_at"], batch_size=self.batch_size)
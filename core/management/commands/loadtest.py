@@ -0,0 +1,158 @@
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core import benchmarking, synthetic
+from core.authentication import ClaimsAccessToken
+from core.models import LessonRequest, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Sentetik veri üzerinde API yük testi (Django test client): "
+        "p50/p95/p99 gecikme, istek başına sorgu ve bellek. Geçici test DB'si kullanır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutors", type=int, default=2000)
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--subjects", type=int, default=16)
+        parser.add_argument("--lessons", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--requests", type=int, default=200, help="Senaryo başına istek sayısı")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--only", nargs="*", help="Sadece bu senaryolar")
+        parser.add_argument("--no-response-cache", action="store_true")
+        parser.add_argument("--save-baseline", help="Sonuçları bu JSON dosyasına yaz")
+        parser.add_argument("--compare", help="Bu baseline JSON ile karşılaştır")
+        parser.add_argument("--tolerance-scale", type=float, default=1.0)
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **opts):
+        with benchmarking.throwaway_database(), benchmarking.quiet_request_log():
+            started = time.perf_counter()
+            data = synthetic.generate(
+                tutors=opts["tutors"], students=opts["students"], subjects=opts["subjects"],
+                lessons=opts["lessons"], seed=opts["seed"],
+            )
+            self.stdout.write(f"Veri üretildi ({time.perf_counter() - started:.1f}s)")
+
+            scenarios = self.build_scenarios(data)
+            if opts["only"]:
+                unknown = set(opts["only"]) - {s[0] for s in scenarios}
+                if unknown:
+                    raise CommandError(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+                scenarios = [s for s in scenarios if s[0] in opts["only"]]
+
+            with override_settings(RESPONSE_CACHE_ENABLED=not opts["no_response_cache"]):
+                results = {
+                    name: self.run_scenario(name, path, token, opts["requests"], opts["warmup"])
+                    for name, path, token in scenarios
+                }
+
+        self.report(results)
+        meta = {
+            "tutors": opts["tutors"], "students": opts["students"], "subjects": opts["subjects"],
+            "lessons": opts["lessons"], "seed": opts["seed"], "requests": opts["requests"],
+            "response_cache": not opts["no_response_cache"],
+            "compiled_serializers": getattr(settings, "COMPILED_READ_SERIALIZERS", False),
+        }
+        regressions = 0
+        if opts["compare"]:
+            regressions = self.report_comparison(
+                benchmarking.load_baseline(opts["compare"]), results, opts["tolerance_scale"]
+            )
+        if opts["save_baseline"]:
+            benchmarking.save_baseline(opts["save_baseline"], results, meta)
+            self.stdout.write(f"Baseline yazıldı: {opts['save_baseline']}")
+        if regressions and opts["fail_on_regression"]:
+            raise CommandError(f"{regressions} metrikte regresyon")
+
+    # ---------- senaryolar ----------
+    def build_scenarios(self, data):
+        # En çok kaydı olan öğrenci/eğitmen: en kötü durum listeleri
+        busiest_student = (
+            LessonRequest.objects.values("student").annotate(n=Count("id")).order_by("-n")[0]["student"]
+        )
+        busiest_tutor = (
+            LessonRequest.objects.values("tutor").annotate(n=Count("id")).order_by("-n")[0]["tutor"]
+        )
+        student_token = str(ClaimsAccessToken.for_user(User.objects.get(id=busiest_student)))
+        tutor_token = str(ClaimsAccessToken.for_user(User.objects.get(id=busiest_tutor)))
+        tutor_id = data.tutor_ids[len(data.tutor_ids) // 2]
+        subject_id = data.subject_ids[0]
+        return [
+            ("subjects", "/api/subjects/", None),
+            ("tutors", "/api/tutors/", None),
+            ("tutors_subject", f"/api/tutors/?subject={subject_id}&ordering=hourly_rate", None),
+            ("tutors_search", "/api/tutors/?search=deneyimli", None),
+            ("tutor_detail", f"/api/tutors/{tutor_id}/", None),
+            ("lesson_requests_student", "/api/lesson-requests/", student_token),
+            ("lesson_requests_tutor", "/api/lesson-requests/?role=tutor&status=pending", tutor_token),
+            ("lesson_requests_offset_deep", "/api/lesson-requests/?pagination=offset&offset=200", tutor_token),
+            ("me_student", "/api/me", student_token),
+            ("me_tutor", "/api/me", tutor_token),
+        ]
+
+    def run_scenario(self, name, path, token, n, warmup):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        client = Client(**headers)
+        for _ in range(warmup):
+            res = client.get(path)
+            if res.status_code != 200:
+                raise CommandError(f"{name}: {path} -> {res.status_code}")
+
+        latencies, queries = [], []
+        for _ in range(n):
+            with CaptureQueriesContext(connection) as ctx:
+                t0 = time.perf_counter()
+                client.get(path)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            queries.append(len(ctx.captured_queries))
+
+        # Bellek ayrı turda ölçülür (tracemalloc gecikmeyi bozar)
+        allocs = []
+        tracemalloc.start()
+        try:
+            for _ in range(max(1, n // 10)):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                client.get(path)
+                allocs.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "path": path,
+            "latency_ms": benchmarking.percentile_summary(latencies),
+            "queries": round(sum(queries) / len(queries), 2),
+            "alloc_kib": round(sum(allocs) / len(allocs), 1),
+        }
+
+    # ---------- rapor ----------
+    def report(self, results):
+        self.stdout.write(f"{'scenario':<30}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'alloc KiB':>11}")
+        for name, r in results.items():
+            lat = r["latency_ms"]
+            self.stdout.write(
+                f"{name:<30}{lat['p50']:>9.2f}{lat['p95']:>9.2f}{lat['p99']:>9.2f}"
+                f"{r['queries']:>9.1f}{r['alloc_kib']:>11.1f}"
+            )
+
+    def report_comparison(self, baseline, results, scale):
+        rows = benchmarking.compare_baseline(baseline, results, scale)
+        regressions = 0
+        self.stdout.write("")
+        self.stdout.write(f"{'scenario':<30}{'metric':<18}{'before':>10}{'after':>10}{'change':>9}")
+        for name, metric, before, after, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            regressions += regressed
+            line = f"{name:<30}{metric:<18}{before:>10.2f}{after:>10.2f}{change:>+9.1%}{flag}"
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        return regressions
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Tutor arama dokümanlarını (ve FTS/tsvector indeksini) toplu olarak yeniden kurar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **opts):
+        started = time.perf_counter()
+        count = search.index_tutors(using=opts["database"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} tutor indekslendi ({elapsed:.2f}s)."
+        ))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import tutor_stats
+
+
+class Command(BaseCommand):
+    help = "TutorStats satırlarını LessonRequest (ve arşiv) tablolarından toplu olarak yeniden kurar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutor", type=int, action="append", dest="tutor_ids",
+                            help="Sadece bu tutor(lar) (tekrarlanabilir)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        started = time.perf_counter()
+        count = tutor_stats.rebuild(opts["tutor_ids"], batch_size=opts["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} tutor istatistiği yeniden kuruldu ({elapsed:.2f}s)."
+        ))
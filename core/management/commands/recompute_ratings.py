@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Tutor puan toplamlarını (rating_sum/rating_count) Review tablosundan yeniden hesaplar; "
+        "kaymaları raporlar ve düzeltir"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tutor", type=int, action="append", dest="tutor_ids",
+                            help="Sadece bu tutor(lar) (tekrarlanabilir)")
+        parser.add_argument("--dry-run", action="store_true", help="Sadece raporla, yazma")
+        parser.add_argument("--fail-on-drift", action="store_true",
+                            help="Kayma bulunursa hata koduyla çık (CI / cron alarmı için)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        started = time.perf_counter()
+        drift = ratings.recompute(opts["tutor_ids"], fix=not opts["dry_run"], batch_size=opts["batch_size"])
+        elapsed = time.perf_counter() - started
+        for tutor_id, (old_sum, old_count), (new_sum, new_count) in drift:
+            self.stdout.write(f"tutor {tutor_id}: {old_sum}/{old_count} -> {new_sum}/{new_count}")
+        action = "raporlandı" if opts["dry_run"] else "düzeltildi"
+        self.stdout.write(self.style.SUCCESS(f"{len(drift)} kayma {action} ({elapsed:.2f}s)."))
+        if drift and opts["fail_on_drift"]:
+            raise CommandError(f"{len(drift)} tutor puanında kayma var.")
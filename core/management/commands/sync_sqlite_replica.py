@@ -0,0 +1,39 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Yerel replika denemesi: primary SQLite dosyasını DATABASE_REPLICAS'taki SQLite "
+        "dosyalarına kopyalar (online backup). Aralıklı çalıştırmak replikasyon gecikmesini taklit eder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, help="Saniyede bir tekrarla (Ctrl-C ile durur)")
+
+    def handle(self, *args, **opts):
+        primary = connections["default"]
+        replicas = [connections[alias] for alias in settings.DATABASE_REPLICAS]
+        if primary.vendor != "sqlite" or not replicas or any(r.vendor != "sqlite" for r in replicas):
+            raise CommandError("SQLite primary ve en az bir SQLite replika gerekli (SQLITE_REPLICA_PATHS)")
+        while True:
+            for replica in replicas:
+                self.copy(primary.settings_dict["NAME"], replica.settings_dict["NAME"])
+            self.stdout.write(f"{len(replicas)} replika güncellendi.")
+            if not opts["every"]:
+                return
+            time.sleep(opts["every"])
+
+    @staticmethod
+    def copy(source, target):
+        # Django bağlantıları değil ham sqlite3: PRAGMA / transaction ayarlarından bağımsız
+        src, dst = sqlite3.connect(source), sqlite3.connect(target)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
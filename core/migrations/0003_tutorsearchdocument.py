@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core import search
+
+
+def install_search_backend(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cursor:
+        search.get_backend(conn).install(cursor)
+
+    # Mevcut tutor'lar için dokümanları doldur
+    User = apps.get_model("core", "User")
+    TutorSearchDocument = apps.get_model("core", "TutorSearchDocument")
+    rows = (
+        User.objects.using(conn.alias)
+        .filter(role="tutor")
+        .values_list("id", "username", "first_name", "last_name", "email", "tutorprofile__bio")
+    )
+    docs = [(uid, search.build_document(u, f, l, e, bio or "")) for uid, u, f, l, e, bio in rows]
+    TutorSearchDocument.objects.using(conn.alias).bulk_create(
+        [TutorSearchDocument(user_id=uid, document=doc) for uid, doc in docs], batch_size=2000
+    )
+    with conn.cursor() as cursor:
+        search.get_backend(conn).index_many(cursor, docs)
+
+
+def uninstall_search_backend(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cursor:
+        search.get_backend(conn).uninstall(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_lessonrequest_core_lesson_status_ad8b3c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(install_search_backend, uninstall_search_backend),
+    ]
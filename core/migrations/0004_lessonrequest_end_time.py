@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_end_time(apps, schema_editor):
+    LessonRequest = apps.get_model("core", "LessonRequest")
+    db = schema_editor.connection.alias
+    batch = []
+    qs = LessonRequest.objects.using(db).only("id", "start_time", "duration_minutes")
+    for lr in qs.iterator(chunk_size=2000):
+        lr.end_time = lr.start_time + timedelta(minutes=lr.duration_minutes)
+        batch.append(lr)
+        if len(batch) >= 2000:
+            LessonRequest.objects.using(db).bulk_update(batch, ["end_time"])
+            batch = []
+    if batch:
+        LessonRequest.objects.using(db).bulk_update(batch, ["end_time"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tutorsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonrequest',
+            name='end_time',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lessonrequest',
+            name='end_time',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='lessonrequest',
+            index=models.Index(fields=['tutor', 'status', 'start_time'], name='core_lesson_tutor_i_bc113e_idx'),
+        ),
+    ]
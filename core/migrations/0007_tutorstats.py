@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_user_profile_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonrequest',
+            name='responded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='TutorStats',
+            fields=[
+                ('tutor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('approved_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('responded_count', models.PositiveIntegerField(default=0)),
+                ('response_seconds_total', models.BigIntegerField(default=0)),
+                ('approval_rate', models.FloatField(null=True)),
+                ('avg_response_seconds', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['approval_rate'], name='core_tutors_approva_3150d1_idx'), models.Index(fields=['avg_response_seconds'], name='core_tutors_avg_res_37dc89_idx'), models.Index(fields=['approved_count'], name='core_tutors_approve_8c2f03_idx')],
+            },
+        ),
+    ]
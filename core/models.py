@@ -1,6 +1,10 @@
 # core/models.py
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.utils import timezone
 
 
 # -----------------------------
@@ -36,6 +40,14 @@ class LessonRequestQuerySet(models.QuerySet):
     def for_list(self):
         return self.select_related("student", "tutor", "subject")
 
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() atlandığı için türetilmiş end_time burada doldurulur
+        objs = list(objs)
+        for obj in objs:
+            if obj.end_time is None:
+                obj.compute_end_time()
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class SubjectQuerySet(models.QuerySet):
     def with_tutors(self):
@@ -59,16 +71,66 @@ class User(AbstractUser):
 
     email = models.EmailField(unique=True)
     role = models.CharField(max_length=10, choices=Role.choices)
+    # Token claim'lerindeki yetki durumu (role, is_active, password) değişince artar;
+    # eski claim'li token'lar deny-list üzerinden yakalanır (bkz. core/authentication.py)
+    profile_version = models.PositiveIntegerField(default=0)
+    auth_changed_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]  # createsuperuser için
 
+    AUTH_STATE_FIELDS = ("role", "is_active", "password")
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._auth_state = instance.auth_state()
+        return instance
+
+    @classmethod
+    def from_claims(cls, user_id, role, profile_version, db="default"):
+        """
+        Token claim'lerinden DB'ye gitmeden kullanıcı. Diğer alanlar ertelenmiştir;
+        ilk erişimde kısa süreli cache'ten (ya da tek sorguyla) doldurulur.
+        """
+        known = {"id": user_id, "role": role, "profile_version": profile_version, "is_active": True}
+        names = [f.attname for f in cls._meta.concrete_fields if f.attname in known]
+        user = cls.from_db(db, names, [known[name] for name in names])
+        user._from_claims = True
+        return user
+
+    def auth_state(self):
+        # Ertelenmiş alanlar None sayılır; yalnızca yüklü alanların değişimi önemlidir
+        return tuple(self.__dict__.get(name) for name in self.AUTH_STATE_FIELDS)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if getattr(self, "_from_claims", False) and fields and from_queryset is None:
+            from .authentication import load_cached_fields
+
+            if load_cached_fields(self, fields):
+                return
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def save(self, *args, **kwargs):
+        original = getattr(self, "_auth_state", None)
+        self._auth_state_changed = original is not None and self.auth_state() != original
+        if self._auth_state_changed:
+            self.profile_version += 1
+            self.auth_changed_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"profile_version", "auth_changed_at"}
+        super().save(*args, **kwargs)
+        self._auth_state = self.auth_state()
+
 
 class Subject(models.Model):
     name = models.CharField(max_length=64, unique=True)
+    # Delta sync (core/sync.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # N+1 azaltma için özel manager
     objects = SubjectQuerySet.as_manager()
@@ -81,8 +143,15 @@ class TutorProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
     hourly_rate = models.PositiveIntegerField(default=0)
+    # Gösterilen ortalama; yorum varsa rating_sum / rating_count (core/ratings.py günceller)
     rating = models.DecimalField(max_digits=2, decimal_places=1, default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    # Bayes düzeltmeli skor (az yorumlu uç değerler öne geçmesin); yorum yoksa NULL
+    rating_score = models.FloatField(null=True, blank=True)
     subjects = models.ManyToManyField(Subject, blank=True, related_name="tutors")
+    # Delta sync (core/sync.py); kullanıcı adı / subject değişiklikleri de dokunur (core/signals.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # N+1 azaltma için özel manager
     objects = TutorProfileQuerySet.as_manager()
@@ -91,6 +160,7 @@ class TutorProfile(models.Model):
         indexes = [
             models.Index(fields=["rating"]),
             models.Index(fields=["hourly_rate"]),
+            models.Index(fields=["rating_score"]),
         ]
 
     def __str__(self):
@@ -119,9 +189,15 @@ class LessonRequest(models.Model):
     subject = models.ForeignKey(Subject, on_delete=models.PROTECT)
     start_time = models.DateTimeField()
     duration_minutes = models.PositiveIntegerField()
+    # start_time + duration_minutes; çakışma sorguları için saklanır (save() hesaplar)
+    end_time = models.DateTimeField(editable=False)
     status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
     note = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # pending'den ilk çıkış anı (tutor yanıt süresi; bkz. core/tutor_stats.py)
+    responded_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Delta sync (core/sync.py); bulk_update yolları elle set eder
+    updated_at = models.DateTimeField(auto_now=True)
 
     # N+1 azaltma için özel manager
     objects = LessonRequestQuerySet.as_manager()
@@ -131,7 +207,227 @@ class LessonRequest(models.Model):
         indexes = [
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["start_time"]),
+            # Tutor takvimi: (tutor, status, start_time) aralık taraması (core/availability.py)
+            models.Index(fields=["tutor", "status", "start_time"]),
+            # /api/sync: kullanıcının kendi talepleri, updated_at aralığı
+            models.Index(fields=["student", "updated_at"]),
+            models.Index(fields=["tutor", "updated_at"]),
         ]
 
     def __str__(self):
         return f"{self.student.email} -> {self.tutor.email} ({self.subject.name})"
+
+    def compute_end_time(self):
+        self.end_time = self.start_time + timedelta(minutes=self.duration_minutes)
+        return self.end_time
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # TutorStats için status geçişi (eski -> yeni) takibi
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def mark_status_change(self, previous_status):
+        """pending'den çıkışta responded_at'i doldurur; doldurduysa True."""
+        if previous_status == self.Status.PENDING and self.status != previous_status and self.responded_at is None:
+            self.responded_at = timezone.now()
+            return True
+        return False
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if self.start_time is not None and self.duration_minutes is not None:
+            self.compute_end_time()
+            if update_fields is not None and {"start_time", "duration_minutes"} & set(update_fields):
+                update_fields = set(update_fields) | {"end_time"}
+        previous = None if self._state.adding else getattr(self, "_loaded_status", None)
+        status_saved = update_fields is None or "status" in update_fields
+        self._responded = status_saved and self.mark_status_change(previous)
+        if self._responded and update_fields is not None:
+            update_fields = set(update_fields) | {"responded_at"}
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields
+        # post_save (TutorStats) için geçiş; aynı transaction içinde uygulanır
+        changed = self._state.adding or (status_saved and previous != self.status)
+        self._status_change = (previous, self.status) if changed else None
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+        if status_saved:
+            self._loaded_status = self.status
+
+
+class ArchivedLessonRequest(models.Model):
+    """
+    Soğuk katman: start_time'ı ARCHIVE_LESSON_REQUESTS_AFTER_DAYS'ten eski talepler
+    (core/archive.py, `python manage.py archive_lesson_requests`). id ve alanlar
+    LessonRequest'tekiyle aynı; satırlar salt okunur, sinyal çalıştırmaz.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_sent_requests")
+    tutor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_received_requests")
+    subject = models.ForeignKey(Subject, on_delete=models.PROTECT, related_name="+")
+    start_time = models.DateTimeField()
+    duration_minutes = models.PositiveIntegerField()
+    end_time = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=LessonRequest.Status.choices)
+    note = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # ?include_archived=1 listesi: kullanıcının kendi talepleri, (created_at, id) sırası
+            models.Index(fields=["student", "created_at"]),
+            models.Index(fields=["tutor", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"ArchivedLessonRequest<{self.id}>"
+
+
+class TutorSearchDocument(models.Model):
+    """
+    Tutor başına önceden hesaplanmış, normalize arama dokümanı.
+    Bakım: core/signals.py (artımlı) ve `rebuild_search_index` komutu (toplu).
+    Sorgu tarafı için bkz. core/search.py.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="search_document"
+    )
+    document = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"TutorSearchDocument<{self.user_id}>"
+
+
+class ThrottleBucket(models.Model):
+    """
+    GCRA throttle durumu (Redis yokken paylaşılan depo): anahtar başına tek satır,
+    `tat` = teorik bir sonraki varış zamanı (epoch saniye). Bkz. core/throttling.py.
+    """
+    key = models.CharField(max_length=200, primary_key=True)
+    tat = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return f"ThrottleBucket<{self.key}>"
+
+
+class DeletedUser(models.Model):
+    """
+    Silinen kullanıcıların izi (claim tabanlı auth deny-list'i; core/authentication.py).
+    Silme ile aynı transaction'da yazılır; ACCESS_TOKEN_LIFETIME'dan eskiler budanır.
+    """
+    user_id = models.BigIntegerField(primary_key=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"DeletedUser<{self.user_id}>"
+
+
+class TutorStats(models.Model):
+    """
+    Tutor başına özet: talep sayıları, onay oranı, ortalama yanıt süresi.
+    Artımlı bakım: core/tutor_stats.py (LessonRequest kaydıyla aynı transaction'da);
+    toplu yeniden kurma: `python manage.py rebuild_tutor_stats`.
+    """
+    tutor = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    pending_count = models.PositiveIntegerField(default=0)
+    approved_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    responded_count = models.PositiveIntegerField(default=0)
+    response_seconds_total = models.BigIntegerField(default=0)
+    # approved / (approved + rejected); karar yoksa NULL
+    approval_rate = models.FloatField(null=True)
+    avg_response_seconds = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # TutorViewSet ?ordering=approval_rate / response_time / approved_count
+            models.Index(fields=["approval_rate"]),
+            models.Index(fields=["avg_response_seconds"]),
+            models.Index(fields=["approved_count"]),
+        ]
+
+    def __str__(self):
+        return f"TutorStats<{self.tutor_id}>"
+
+
+class Review(models.Model):
+    """
+    Öğrencinin onaylanmış bir ders talebi için verdiği puan (1-5); ders başına tek yorum.
+    Tutor puanı TutorProfile.rating_sum/rating_count üzerinde artımlı tutulur (core/ratings.py).
+    """
+    lesson_request = models.OneToOneField(LessonRequest, on_delete=models.CASCADE, related_name="review")
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reviews_given")
+    tutor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reviews_received")
+    score = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["tutor", "-created_at"]),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get("score")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # post_save (core/ratings.py) puan farkını aynı transaction'da uygular
+        self._score_change = (None if self._state.adding else getattr(self, "_loaded_score", None), self.score)
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+        self._loaded_score = self.score
+
+    def __str__(self):
+        return f"Review<{self.lesson_request_id}: {self.score}>"
+
+
+class Tombstone(models.Model):
+    """
+    Silinen kayıtların izi; /api/sync silmeleri buradan okur (core/sync.py).
+    Kullanıcı kolonları FK değil: kullanıcı silinse de iz kalmalı.
+    """
+    class Kind(models.TextChoices):
+        SUBJECT = "subject", "Subject"
+        TUTOR = "tutor", "Tutor"
+        LESSON_REQUEST = "lesson_request", "Lesson request"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    # Sadece lesson_request: hangi kullanıcıların feed'inde görünür
+    student_id = models.BigIntegerField(null=True, blank=True)
+    tutor_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Tombstone<{self.kind}:{self.object_id}>"
+
+
+class NotificationEvent(models.Model):
+    """
+    "database" bildirim broker'ının kuyruğu (core/notifications.py): alıcı başına bir satır.
+    Yazma, olayı üreten değişiklikle aynı transaction'dadır; düğümler id > son_id ile okur.
+    """
+    user_id = models.BigIntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Yeniden bağlanan istemcinin kaçırdıkları (Last-Event-ID)
+            models.Index(fields=["user_id", "id"]),
+        ]
+
+    def __str__(self):
+        return f"NotificationEvent<{self.user_id}:{self.payload.get('type')}>"
@@ -0,0 +1,240 @@
+# core/notifications.py
+"""
+Ders talebi bildirimleri: oluşturma ve status değişimi olayları, SSE / long-poll ile
+ilgili öğrenci ve tutor'a iletilir (uç noktalar: core/async_views.py).
+
+Broker'lar (settings.NOTIFICATIONS_BROKER):
+- "memory": süreç içi dağıtım; olay commit'ten sonra yayınlanır. Tek düğüm içindir.
+- "database": olay NotificationEvent tablosuna değişiklikle aynı transaction'da yazılır;
+  her süreçte tek bir poller yeni satırları okur (bağlı istemci sayısından bağımsız,
+  aralık başına tek indeksli sorgu) ve yerelde dağıtır. Çok düğümlü kurulumlar için
+  (Postgres'te LISTEN/NOTIFY ile uyandırmanın yerini tutar). id commit'ten önce alındığından
+  son NOTIFICATIONS_REORDER_WINDOW id yeniden okunur (bkz. PollCursor).
+
+İki broker da yerel dağıtımı paylaşır: kullanıcı başına bağlı abonelikler, her biri
+kendi event loop'unda bir asyncio.Queue. Yayın thread'den (sync view) gelebilir.
+"""
+import asyncio
+import contextvars
+import itertools
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import NotificationEvent
+
+
+def lesson_request_event(lesson_request, previous_status=None):
+    created = previous_status is None
+    return {
+        "type": "lesson_request.created" if created else "lesson_request.status_changed",
+        "lesson_request": {
+            "id": lesson_request.id,
+            "status": lesson_request.status,
+            "previous_status": previous_status,
+            "student_id": lesson_request.student_id,
+            "tutor_id": lesson_request.tutor_id,
+        },
+        "at": timezone.now().isoformat(),
+    }
+
+
+def publish_lesson_requests(changes):
+    """[(lesson_request, önceki_status | None), ...] -> tek seferde yayın."""
+    get_broker().publish_many([
+        ([lr.student_id, lr.tutor_id], lesson_request_event(lr, previous)) for lr, previous in changes
+    ])
+
+
+# -----------------------------
+# Yerel dağıtım
+# -----------------------------
+class Subscription:
+    """Tek bir bağlantının kuyruğu; taşarsa en eski olay düşer (istemci /api/sync ile toparlar)."""
+
+    def __init__(self, broker, user_id, maxsize=100):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalFanout:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def fan_out(self, user_ids, event):
+        with self._lock:
+            targets = [sub for uid in user_ids for sub in self._subscribers.get(uid, ())]
+        for sub in targets:
+            try:
+                sub.push(event)
+            except RuntimeError:
+                # Event loop kapanmış (bağlantı koptu, close çağrılmadı)
+                self.unsubscribe(sub)
+
+    async def subscribe(self, user_id, last_event_id=None):
+        """Abonelik ve (last_event_id verildiyse) kaçırılan olaylar."""
+        sub = Subscription(self, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(sub)
+        backlog = await self.backlog(user_id, last_event_id) if last_event_id is not None else []
+        return sub, backlog
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+
+    async def backlog(self, user_id, last_event_id):
+        return []
+
+
+class InMemoryBroker(LocalFanout):
+    """Tek süreç: olaylar commit'ten sonra yerelde dağıtılır, son olaylar replay için bellekte."""
+
+    def __init__(self, history=1000):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self._recent = deque(maxlen=history)
+
+    def publish_many(self, items):
+        transaction.on_commit(lambda: self.dispatch(items))
+
+    def dispatch(self, items):
+        for user_ids, event in items:
+            event = {"id": next(self._ids), **event}
+            with self._lock:
+                self._recent.append((event["id"], set(user_ids), event))
+            self.fan_out(user_ids, event)
+
+    async def backlog(self, user_id, last_event_id):
+        with self._lock:
+            return [e for eid, users, e in self._recent if eid > last_event_id and user_id in users]
+
+
+class DatabaseBroker(LocalFanout):
+    """NotificationEvent tablosu üzerinden düğümler arası dağıtım."""
+
+    def __init__(self):
+        super().__init__()
+        self._pollers = {}
+        self._last_prune = 0.0
+
+    def publish_many(self, items):
+        # Değişiklikle aynı transaction: rollback olursa olay da yok. Tek INSERT.
+        NotificationEvent.objects.bulk_create([
+            NotificationEvent(user_id=uid, payload=event)
+            for user_ids, event in items for uid in dict.fromkeys(user_ids)
+        ])
+
+    async def subscribe(self, user_id, last_event_id=None):
+        self.ensure_poller()
+        return await super().subscribe(user_id, last_event_id)
+
+    async def backlog(self, user_id, last_event_id):
+        rows = NotificationEvent.objects.filter(user_id=user_id, id__gt=last_event_id).order_by("id")[:100]
+        return [{"id": row.id, **row.payload} async for row in rows]
+
+    def ensure_poller(self):
+        # Event loop başına tek poller (sunucuda tek loop; testler her seferinde yeni loop açar)
+        loop = asyncio.get_running_loop()
+        task = self._pollers.get(loop)
+        if task is None or task.done():
+            self._pollers = {lp: t for lp, t in self._pollers.items() if not t.done()}
+            # Boş context: başlatan isteğin (replika yönlendirmesi vb.) durumunu devralmasın
+            self._pollers[loop] = loop.create_task(self.poll(), context=contextvars.Context())
+
+    async def poll(self):
+        interval = settings.NOTIFICATIONS_POLL_INTERVAL
+        cursor = await sync_to_async(PollCursor.start)()
+        while self._subscribers:
+            rows = await sync_to_async(cursor.fetch)()
+            for row_id, user_id, payload in rows:
+                self.fan_out([user_id], {"id": row_id, **payload})
+            await sync_to_async(self.prune)()
+            if len(rows) < cursor.batch_size:
+                await asyncio.sleep(interval)
+
+    def prune(self):
+        if time.monotonic() - self._last_prune < 600:
+            return
+        self._last_prune = time.monotonic()
+        cutoff = timezone.now() - timezone.timedelta(seconds=settings.NOTIFICATIONS_RETENTION)
+        NotificationEvent.objects.filter(created_at__lt=cutoff).delete()
+
+
+
+class PollCursor:
+    """
+    DatabaseBroker poller'ının konumu. `id > son_id` yetmez: Postgres'te id INSERT'te alınır,
+    düşük id'li olay daha yüksek id okunduktan sonra commit olabilir. Her okuma son `window`
+    id'yi de kapsar; o aralıkta dağıtılmış id'ler sorguda hariç tutulur.
+    """
+    batch_size = 500
+
+    def __init__(self, last_id, seen, window):
+        self.last_id = last_id
+        self.seen = set(seen)
+        self.window = window
+
+    @classmethod
+    def start(cls, window=None):
+        # Başlangıçta pencerede olanlar dağıtılmış sayılır (yeni abonelere eski olay gitmesin)
+        window = settings.NOTIFICATIONS_REORDER_WINDOW if window is None else window
+        last_id = NotificationEvent.objects.aggregate(last=Max("id"))["last"] or 0
+        seen = NotificationEvent.objects.filter(id__gt=last_id - window).values_list("id", flat=True)
+        return cls(last_id, seen, window)
+
+    def fetch(self):
+        rows = list(
+            NotificationEvent.objects.filter(id__gt=self.last_id - self.window).exclude(id__in=self.seen)
+            .order_by("id").values_list("id", "user_id", "payload")[:self.batch_size]
+        )
+        if rows:
+            self.seen.update(row[0] for row in rows)
+            self.last_id = max(self.last_id, rows[-1][0])
+            floor = self.last_id - self.window
+            self.seen = {row_id for row_id in self.seen if row_id > floor}
+        return rows
+
+
+BROKERS = {
+    "memory": InMemoryBroker,
+    "database": DatabaseBroker,
+}
+_brokers = {}
+
+
+def get_broker():
+    name = getattr(settings, "NOTIFICATIONS_BROKER", "memory")
+    if name not in _brokers:
+        _brokers[name] = BROKERS[name]()
+    return _brokers[name]
@@ -0,0 +1,199 @@
+# core/pagination.py
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    (created_at, id) üzerinden keyset (cursor) sayfalama.
+
+    - COUNT(*) yok, OFFSET yok: her sayfa
+      WHERE (created_at, id) < (c, i) ORDER BY created_at DESC, id DESC LIMIT n+1
+      şeklinde index üzerinden range scan'dir.
+    - Cursor opak bir base64 string'dir: "<created_at>|<id>|<yön>".
+    Response: { "next": url|null, "previous": url|null, "results": [...] }
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    # En yeni kayıt başta
+    time_field = "created_at"
+    id_field = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+
+        if reverse:
+            # Önceki sayfa: ters sırada ilerle, sonra çevir
+            queryset = queryset.order_by(self.time_field, self.id_field)
+        else:
+            queryset = queryset.order_by(f"-{self.time_field}", f"-{self.id_field}")
+
+        if cursor:
+            ts, pk, _ = cursor
+            op = "gt" if reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"{self.time_field}__{op}": ts})
+                | Q(**{self.time_field: ts, f"{self.id_field}__{op}": pk})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return rows
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                value = int(raw)
+            except ValueError:
+                value = 0
+            if value > 0:
+                return min(value, self.max_page_size)
+        return self.page_size
+
+    # -------- cursor encode/decode --------
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            ts_raw, pk_raw, direction = raw.split("|")
+            ts = parse_datetime(ts_raw)
+            pk = int(pk_raw)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if ts is None or direction not in ("n", "p"):
+            raise NotFound(self.invalid_cursor_message)
+        return ts, pk, direction == "p"
+
+    def encode_cursor(self, obj, reverse):
+        ts = getattr(obj, self.time_field).isoformat()
+        pk = getattr(obj, self.id_field)
+        raw = f"{ts}|{pk}|{'p' if reverse else 'n'}"
+        encoded = base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque pagination cursor (next/previous).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class LessonRequestPagination(BasePagination):
+    """
+    Varsayılan: KeysetPagination (cursor).
+    Eski istemciler için: ?pagination=offset (veya ?offset=<n>) -> LimitOffsetPagination
+    ({"count", "next", "previous", "results"} şekli korunur).
+    """
+    mode_query_param = "pagination"
+
+    def __init__(self):
+        self.cursor_paginator = KeysetPagination()
+        self.offset_paginator = LimitOffsetPagination()
+        self.active = self.cursor_paginator
+
+    def use_offset(self, request):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode:
+            return mode == "offset"
+        return LimitOffsetPagination.offset_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_offset(request):
+            self.active = self.offset_paginator
+            # Tutarlı sıra: created_at eşitse id ile ayır
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            self.active = self.cursor_paginator
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor_paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        params = self.cursor_paginator.get_schema_operation_parameters(view)
+        params.append({
+            "name": self.mode_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Set to 'offset' to use legacy limit/offset pagination.",
+            "schema": {"type": "string", "enum": ["cursor", "offset"]},
+        })
+        return params + [
+            p for p in self.offset_paginator.get_schema_operation_parameters(view)
+            if p["name"] == LimitOffsetPagination.offset_query_param
+        ]
@@ -0,0 +1,128 @@
+# core/ratings.py
+"""
+Yorum (Review) tabanlı tutor puanı.
+
+- TutorProfile.rating_sum / rating_count çalışan toplamlardır; yorum ekleme, puan
+  değiştirme ve silme, yorumla aynı transaction içinde tek bir F-ifadeli UPDATE ile
+  O(1) uygulanır (bkz. core/signals.py).
+- Aynı UPDATE gösterilen ortalamayı (`rating`, 1 ondalık) ve Bayes düzeltmeli skoru
+  (`rating_score`) yeni toplamlardan yazar; sıralama (`-rating`, `-rating_score`)
+  indeksli kolonlar üzerinden, sorgu anında ortalama hesaplanmaz.
+- Hiç yorumu olmayan tutor'un `rating`'i elle/aktarımla girilmiş değer olarak kalır.
+- `python manage.py recompute_ratings` toplamları Review tablosundan yeniden hesaplar,
+  kaymaları raporlar ve (--dry-run değilse) düzeltir.
+
+Bayes skoru: (C * m + toplam) / (C + adet); m = RATING_PRIOR_MEAN, C = RATING_PRIOR_WEIGHT.
+C = 0 düz ortalamadır; ayarlar değişince skorları recompute_ratings tazeler.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db.models import Case, Count, DecimalField, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Now, NullIf, Round
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from . import recommendations, response_cache
+from .models import Review, TutorProfile
+
+
+def prior():
+    return float(getattr(settings, "RATING_PRIOR_MEAN", 4.0)), float(getattr(settings, "RATING_PRIOR_WEIGHT", 0))
+
+
+def average(total, count):
+    if not count:
+        return None
+    return (Decimal(total) / count).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+
+
+def smoothed(total, count):
+    if not count:
+        return None
+    mean, weight = prior()
+    return (weight * mean + total) / (weight + count)
+
+
+def apply(tutor_id, score_delta, count_delta):
+    """Yorum farkını tek UPDATE ile uygular (toplam, adet, ortalama, skor)."""
+    if not score_delta and not count_delta:
+        return
+    mean, weight = prior()
+    new_sum = F("rating_sum") + score_delta
+    new_count = F("rating_count") + count_delta
+    avg = Cast(new_sum, FloatField()) / NullIf(new_count, 0)
+    TutorProfile.objects.filter(user_id=tutor_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        # Son yorum da silinirse son ortalama kalır
+        rating=Coalesce(Round(avg, 1), F("rating"), output_field=DecimalField(max_digits=2, decimal_places=1)),
+        rating_score=Case(
+            When(
+                GreaterThan(new_count, 0),
+                then=(Value(weight * mean) + Cast(new_sum, FloatField())) / (Value(weight) + new_count),
+            ),
+            default=None,
+            output_field=FloatField(),
+        ),
+        # update() auto_now'ı tetiklemez; delta sync (core/sync.py) için
+        updated_at=Now(),
+    )
+    # queryset.update sinyal göndermez; puan liste ve detay cevaplarında
+    response_cache.bump_tutor(tutor_id)
+    recommendations.snapshot.mark_changed([tutor_id])
+
+
+def aggregate(tutor_ids=None):
+    """tutor_id -> (toplam, adet), Review tablosundan."""
+    reviews = Review.objects.all()
+    if tutor_ids is not None:
+        reviews = reviews.filter(tutor_id__in=tutor_ids)
+    rows = reviews.values("tutor_id").order_by().annotate(total=Sum("score"), count=Count("id"))
+    return {row["tutor_id"]: (row["total"], row["count"]) for row in rows}
+
+
+def recompute(tutor_ids=None, fix=True, batch_size=1000):
+    """
+    Saklanan toplamları Review tablosuyla karşılaştırır.
+    [(tutor_id, (eski_toplam, eski_adet), (doğru_toplam, doğru_adet)), ...] döner.
+    """
+    actual = aggregate(tutor_ids)
+    profiles = TutorProfile.objects.only(
+        "id", "user_id", "rating", "rating_sum", "rating_count", "rating_score", "updated_at"
+    )
+    if tutor_ids is not None:
+        profiles = profiles.filter(user_id__in=tutor_ids)
+
+    drift, changed = [], []
+    for profile in profiles.iterator(chunk_size=batch_size):
+        total, count = actual.get(profile.user_id, (0, 0))
+        if (profile.rating_sum, profile.rating_count) != (total, count):
+            drift.append((profile.user_id, (profile.rating_sum, profile.rating_count), (total, count)))
+        score = smoothed(total, count)
+        rating = average(total, count) if count else profile.rating
+        if (
+            (profile.rating_sum, profile.rating_count) != (total, count)
+            or profile.rating != rating
+            or not _close(profile.rating_score, score)
+        ):
+            profile.rating_sum, profile.rating_count = total, count
+            profile.rating, profile.rating_score = rating, score
+            changed.append(profile)
+
+    if fix and changed:
+        now = timezone.now()
+        for profile in changed:
+            profile.updated_at = now
+        TutorProfile.objects.bulk_update(
+            changed, ["rating_sum", "rating_count", "rating", "rating_score", "updated_at"], batch_size=batch_size
+        )
+        response_cache.bump_on_commit("tutors", *(f"tutor:{p.user_id}" for p in changed))
+        recommendations.snapshot.mark_changed(p.user_id for p in changed)
+    return drift
+
+
+def _close(a, b):
+    if a is None or b is None:
+        return a is b
+    return abs(a - b) < 1e-9
@@ -0,0 +1,376 @@
+# core/recommendations.py
+"""
+Öğrenciye göre tutor önerisi (GET /api/tutors/recommended/).
+
+Tüm tutor'lar her istekte puanlanır; ORM'de bu, tutor başına subject alt sorguları ve
+ifadelerle tam tablo taraması + sıralamadır. Bunun yerine süreç içi, NumPy kolonlarından
+oluşan bir anlık görüntü tutulur:
+
+- user id, ln(saat ücreti), puan (rating_score, yoksa rating), onay oranı (Laplace
+  düzeltmeli, TutorStats'tan) ve subject bit kümeleri (tutor başına uint64 kelimeler).
+- Puanlama birkaç vektör işlemi + argpartition; 100k tutor birkaç ms.
+
+Öğrenci profili geçmiş LessonRequest'lerinden tek sorguyla çıkar: subject ağırlıkları
+(talep sayısına göre) ve talep ettiği tutor'ların ücretlerinin geometrik ortalaması.
+Skor = Σ RECOMMENDATION_WEIGHTS[bileşen] * bileşen, her bileşen [0, 1]:
+- subject: öğrencinin subject ağırlıklarından tutor'un verdiği derslere düşen pay
+- price: exp(-|ln(ücret+1) - ln(referans+1)|); geçmiş yoksa nötr 0.5
+- rating: puan / 5
+- approval: (onay + 1) / (onay + ret + 2)
+Eşit skorlarda küçük user id önce gelir (sayfalar arası kararlı sıra).
+
+Bakım (subject_index ile aynı düzen, artımlı):
+- İlk okumada iki sorguyla kurulur (profil + istatistik, through tablosu).
+- Değişiklikler (core/signals.py, tutor_stats.apply, ratings.apply) commit'te paylaşılan
+  cache'teki bir değişiklik günlüğüne yazılır: sıra numarası + değişen tutor id'leri.
+  Her süreç bir sonraki okumada kaçırdığı kayıtları okur ve yalnızca o satırları iki
+  sorguyla tazeler. Günlük eksikse (süresi dolmuş, cache temizlenmiş) ya da
+  `invalidate()` (toplu yollar) yazıldıysa tamamen yeniden kurulur.
+- RECOMMENDATION_SNAPSHOT_TTL saniyede bir (kaçan durumlara karşı) yeniden kurulur.
+
+`orm_ranking` aynı skorun ORM karşılığıdır (benchmark ve testlerde doğruluk referansı;
+bkz. `manage.py bench_recommendations`).
+"""
+import math
+import threading
+import time
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, FloatField, OuterRef, Value, When
+from django.db.models.functions import Abs, Cast, Coalesce, Exp, Ln
+
+from . import db_router
+
+EPOCH_KEY = "recommendations:epoch"
+# Günlükte tüm snapshot'ı geçersiz kılan kayıt
+FULL_REBUILD = "*"
+WORD_BITS = 64
+# Bayt değeri -> 8 bitin 0/1 vektörü (256, 8)
+BYTE_BITS = ((np.arange(256)[:, None] >> np.arange(8)) & 1).astype(np.float64)
+
+DEFAULT_WEIGHTS = {"subject": 0.5, "price": 0.2, "rating": 0.2, "approval": 0.1}
+
+
+def weights():
+    configured = getattr(settings, "RECOMMENDATION_WEIGHTS", {})
+    return {name: float(configured.get(name, default)) for name, default in DEFAULT_WEIGHTS.items()}
+
+
+class TutorSnapshot:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids = None             # int64, satır -> user id
+        self._row = {}               # user id -> satır
+        self._active = None          # bool; silinen tutor'un satırı yeniden kurulana kadar pasif
+        self._log_rate = None        # float64, ln(hourly_rate + 1)
+        self._rating = None          # float64, 0-5
+        self._approval = None        # float64, Laplace düzeltmeli onay oranı
+        self._bits = None            # uint64 (satır, kelime)
+        self._subject_bit = {}       # subject id -> bit sırası
+        self._epoch = None
+        self._seq = 0
+        self._built_at = 0.0
+
+    # ---------- paylaşılan değişiklik günlüğü ----------
+    @staticmethod
+    def _shared_epoch():
+        epoch = cache.get(EPOCH_KEY)
+        if epoch is None:
+            epoch = uuid.uuid4().hex
+            if not cache.add(EPOCH_KEY, epoch, timeout=None):
+                epoch = cache.get(EPOCH_KEY, epoch)
+        return epoch
+
+    @staticmethod
+    def _seq_key(epoch):
+        return f"recommendations:{epoch}:seq"
+
+    @staticmethod
+    def _change_key(epoch, seq):
+        return f"recommendations:{epoch}:change:{seq}"
+
+    def publish(self, user_ids):
+        """Commit sonrası: günlüğe yeni kayıt (FULL_REBUILD ya da tutor id listesi)."""
+        epoch = self._shared_epoch()
+        seq_key = self._seq_key(epoch)
+        cache.add(seq_key, 0, timeout=None)
+        try:
+            seq = cache.incr(seq_key)
+        except ValueError:
+            # Anahtar arada düştü: okuyucular günlüğü eksik bulup yeniden kurar
+            return
+        ttl = getattr(settings, "RECOMMENDATION_SNAPSHOT_TTL", 300)
+        cache.set(self._change_key(epoch, seq), user_ids, timeout=ttl * 2)
+
+    def mark_changed(self, user_ids):
+        user_ids = sorted(set(user_ids))
+        if user_ids:
+            transaction.on_commit(lambda: self.publish(user_ids))
+
+    def invalidate(self):
+        transaction.on_commit(lambda: self.publish(FULL_REBUILD))
+
+    # ---------- kurulum ----------
+    def _load(self):
+        epoch = self._shared_epoch()
+        seq = cache.get(self._seq_key(epoch), 0)
+        ttl = getattr(settings, "RECOMMENDATION_SNAPSHOT_TTL", 300)
+        with self._lock:
+            # Replika gecikmesi değişikliği kaçırıp günlük kaydını tüketmesin
+            with db_router.primary():
+                if (
+                    self._ids is None
+                    or self._epoch != epoch
+                    or seq < self._seq
+                    or time.monotonic() - self._built_at >= ttl
+                ):
+                    self._build(epoch, seq)
+                elif seq > self._seq:
+                    self._replay(epoch, seq)
+
+    def _replay(self, epoch, seq):
+        missed = range(self._seq + 1, seq + 1)
+        if len(missed) > getattr(settings, "RECOMMENDATION_MAX_REPLAY", 1000):
+            return self._build(epoch, seq)
+        found = cache.get_many([self._change_key(epoch, s) for s in missed])
+        if len(found) != len(missed) or FULL_REBUILD in found.values():
+            return self._build(epoch, seq)
+        self._refresh(sorted({uid for ids in found.values() for uid in ids}))
+        self._seq = seq
+
+    @staticmethod
+    def _profile_rows(user_ids=None):
+        from .models import TutorProfile, User
+
+        profiles = TutorProfile.objects.filter(user__role=User.Role.TUTOR)
+        through = TutorProfile.subjects.through.objects.all()
+        if user_ids is not None:
+            profiles = profiles.filter(user_id__in=user_ids)
+            through = through.filter(tutorprofile__user_id__in=user_ids)
+        rows = profiles.values_list(
+            "user_id", "hourly_rate", "rating", "rating_score",
+            "user__stats__approved_count", "user__stats__rejected_count",
+        )
+        links = through.values_list("tutorprofile__user_id", "subject_id")
+        return rows, links
+
+    def _build(self, epoch, seq):
+        rows, links = self._profile_rows()
+        rows = sorted(rows.iterator(chunk_size=5000))
+        n = len(rows)
+        self._ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        self._row = {uid: i for i, uid in enumerate(self._ids.tolist())}
+        self._active = np.ones(n, dtype=bool)
+        self._log_rate, self._rating, self._approval = self._columns(rows)
+        self._subject_bit = {}
+        self._bits = np.zeros((n, 1), dtype=np.uint64)
+        self._set_links(links.iterator(chunk_size=5000))
+        self._epoch, self._seq, self._built_at = epoch, seq, time.monotonic()
+
+    def _refresh(self, user_ids):
+        rows, links = self._profile_rows(user_ids)
+        rows = list(rows)
+        new = [r[0] for r in rows if r[0] not in self._row]
+        if new:
+            self._grow(new)
+        known = np.array([self._row[uid] for uid in user_ids if uid in self._row], dtype=np.intp)
+        # Satırı dönmeyen (silinmiş / artık tutor olmayan) pasif kalır
+        self._active[known] = False
+        self._bits[known] = 0
+        if rows:
+            target = np.array([self._row[r[0]] for r in rows], dtype=np.intp)
+            self._log_rate[target], self._rating[target], self._approval[target] = self._columns(rows)
+            self._active[target] = True
+        self._set_links(links)
+
+    def _grow(self, user_ids):
+        start = len(self._ids)
+        for offset, uid in enumerate(user_ids):
+            self._row[uid] = start + offset
+        extra = len(user_ids)
+        self._ids = np.concatenate([self._ids, np.asarray(user_ids, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        self._log_rate = np.concatenate([self._log_rate, np.zeros(extra)])
+        self._rating = np.concatenate([self._rating, np.zeros(extra)])
+        self._approval = np.concatenate([self._approval, np.zeros(extra)])
+        self._bits = np.vstack([self._bits, np.zeros((extra, self._bits.shape[1]), dtype=np.uint64)])
+
+    @staticmethod
+    def _columns(rows):
+        """Profil satırları -> (ln(ücret+1), puan, onay oranı) kolonları."""
+        rate = np.array([r[1] for r in rows], dtype=np.float64)
+        rating = np.array([r[3] if r[3] is not None else float(r[2]) for r in rows], dtype=np.float64)
+        approved = np.array([r[4] or 0 for r in rows], dtype=np.float64)
+        rejected = np.array([r[5] or 0 for r in rows], dtype=np.float64)
+        return np.log(rate + 1), rating, (approved + 1) / (approved + rejected + 2)
+
+    def _bit_for(self, subject_id):
+        bit = self._subject_bit.get(subject_id)
+        if bit is None:
+            bit = self._subject_bit[subject_id] = len(self._subject_bit)
+            if bit >= self._bits.shape[1] * WORD_BITS:
+                self._bits = np.hstack([self._bits, np.zeros((len(self._bits), 1), dtype=np.uint64)])
+        return bit
+
+    def _set_links(self, links):
+        rows, bits = [], []
+        for user_id, subject_id in links:
+            i = self._row.get(user_id)
+            if i is not None:
+                rows.append(i)
+                bits.append(self._bit_for(subject_id))
+        if not rows:
+            return
+        bits = np.asarray(bits, dtype=np.uint64)
+        words = (bits // np.uint64(WORD_BITS)).astype(np.intp)
+        masks = np.left_shift(np.uint64(1), bits % np.uint64(WORD_BITS))
+        np.bitwise_or.at(self._bits, (np.asarray(rows, dtype=np.intp), words), masks)
+
+    # ---------- puanlama ----------
+    def rank(self, subject_weights, tutor_counts):
+        """
+        subject_weights: {subject_id: ağırlık}; tutor_counts: {tutor_id: talep sayısı}.
+        Ranking döner (uzunluk: aktif tutor sayısı; dilimlenince sıralı user id'ler).
+        """
+        self._load()
+        with self._lock:
+            w = weights()
+            scores = (w["rating"] / 5) * self._rating + w["approval"] * self._approval
+
+            # Bit başına katsayı; bit kümeleri bayt bayt 256'lık tablolardan toplanır
+            # (subject başına ayrı geçiş yerine 8 subject'e bir geçiş)
+            coef = np.zeros(self._bits.shape[1] * WORD_BITS)
+            total = sum(subject_weights.values())
+            for subject_id, weight in subject_weights.items():
+                bit = self._subject_bit.get(subject_id)
+                if bit is not None:
+                    coef[bit] += w["subject"] * weight / total
+            for byte in np.flatnonzero(coef.reshape(-1, 8).any(axis=1)).tolist():
+                table = BYTE_BITS @ coef[byte * 8:byte * 8 + 8]
+                word, offset = divmod(byte * 8, WORD_BITS)
+                scores += table[(self._bits[:, word] >> np.uint64(offset)) & np.uint64(0xFF)]
+
+            reference = self.reference_log_rate(tutor_counts)
+            if reference is None:
+                scores += w["price"] * 0.5
+            else:
+                scores += w["price"] * np.exp(-np.abs(self._log_rate - reference))
+
+            scores[~self._active] = -np.inf
+            return Ranking(self._ids.copy(), scores, int(self._active.sum()))
+
+    def reference_log_rate(self, tutor_counts):
+        """Talep edilen tutor'ların ln(ücret+1) ortalaması (talep sayısıyla ağırlıklı)."""
+        total = weighted = 0.0
+        for tutor_id, count in tutor_counts.items():
+            i = self._row.get(tutor_id)
+            if i is not None and self._active[i]:
+                weighted += count * self._log_rate[i]
+                total += count
+        return weighted / total if total else None
+
+
+class Ranking:
+    """
+    Sayfalayıcıya (LimitOffsetPagination) verilen tembel dizi: len() aktif tutor sayısı,
+    dilim yalnızca istenen ilk `stop` satırı seçer (argpartition), tamamı sıralanmaz.
+    """
+
+    def __init__(self, ids, scores, count):
+        self.ids = ids
+        self.scores = scores
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("Ranking supports contiguous slices only")
+        start, stop, _ = item.indices(self.count)
+        top = self.top(stop)[start:]
+        return list(zip(self.ids[top].tolist(), self.scores[top].tolist()))
+
+    def top(self, k):
+        """En yüksek skorlu k satırın sırası (skor azalan, user id artan)."""
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        n = len(self.scores)
+        kth = np.partition(self.scores, n - k)[n - k]
+        # Sınırdaki eşitler id ile seçilsin: argpartition'ın keyfi seçimi sayfaları kaydırırdı
+        candidates = np.concatenate([np.flatnonzero(self.scores > kth), np.flatnonzero(self.scores == kth)])
+        order = np.lexsort((self.ids[candidates], -self.scores[candidates]))[:k]
+        return candidates[order]
+
+
+def student_history(student_id):
+    """(subject_id -> talep sayısı, tutor_id -> talep sayısı); tek sorgu."""
+    from .models import ArchivedLessonRequest, LessonRequest
+
+    # Arşivlenmiş eski talepler de geçmişe dahil (UNION ALL; core/archive.py)
+    rows = [
+        model.objects.filter(student_id=student_id)
+        .values_list("subject_id", "tutor_id").order_by().annotate(n=Count("id"))
+        for model in (LessonRequest, ArchivedLessonRequest)
+    ]
+    rows = rows[0].union(rows[1], all=True)
+    subjects, tutors = {}, {}
+    for subject_id, tutor_id, n in rows:
+        subjects[subject_id] = subjects.get(subject_id, 0) + n
+        tutors[tutor_id] = tutors.get(tutor_id, 0) + n
+    return subjects, tutors
+
+
+def recommend(student_id):
+    subjects, tutors = student_history(student_id)
+    return snapshot.rank(subjects, tutors)
+
+
+def orm_ranking(student_id):
+    """
+    Aynı skorun ORM ile hesaplanışı: subject başına EXISTS, ifadeler DB'de, ORDER BY score.
+    (id, score) sıralı User queryset'i döner; dilimlenerek kullanılır.
+    """
+    from .models import TutorProfile, User
+
+    subjects, tutors = student_history(student_id)
+    w = weights()
+    score = Value(w["rating"] / 5) * Coalesce(
+        "tutorprofile__rating_score", Cast("tutorprofile__rating", FloatField()), output_field=FloatField()
+    )
+    approved = Cast(Coalesce("stats__approved_count", 0), FloatField())
+    rejected = Cast(Coalesce("stats__rejected_count", 0), FloatField())
+    score += Value(w["approval"]) * (approved + Value(1.0)) / (approved + rejected + Value(2.0))
+
+    total = sum(subjects.values())
+    through = TutorProfile.subjects.through.objects
+    for subject_id, weight in subjects.items():
+        has = Exists(through.filter(tutorprofile__user_id=OuterRef("id"), subject_id=subject_id))
+        score += Case(When(has, then=Value(w["subject"] * weight / total)), default=Value(0.0))
+
+    # Referans ücret: talep edilen (hâlâ tutor olan) tutor'ların ln(ücret+1) ortalaması
+    rates = dict(
+        TutorProfile.objects.filter(user_id__in=tutors, user__role=User.Role.TUTOR)
+        .values_list("user_id", "hourly_rate")
+    ) if tutors else {}
+    counted = sum(tutors[uid] for uid in rates)
+    if counted:
+        reference = sum(tutors[uid] * math.log(rate + 1) for uid, rate in rates.items()) / counted
+        log_rate = Ln(Cast("tutorprofile__hourly_rate", FloatField()) + Value(1.0))
+        score += Value(w["price"]) * Exp(-Abs(log_rate - Value(reference)))
+    else:
+        score += Value(w["price"] * 0.5)
+
+    return (
+        User.objects.filter(role=User.Role.TUTOR, tutorprofile__isnull=False)
+        .annotate(score=score)
+        .order_by(F("score").desc(), "id")
+        .values_list("id", "score")
+    )
+
+
+snapshot = TutorSnapshot()
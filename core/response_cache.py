@@ -0,0 +1,185 @@
+# core/response_cache.py
+"""
+Public okuma uç noktaları (subjects, tutor list/detail) için response cache.
+
+- Anahtar: view + action + ilgili entity versiyonları + normalize edilmiş query param'lar.
+- Geçersiz kılma: wildcard silme yok. Her entity için bir versiyon sayacı tutulur
+  (`subjects`, `tutors`, `tutor:<id>`); sinyaller sayacı artırır, eski anahtarlar
+  artık hiç okunmaz ve timeout ile düşer (bkz. core/signals.py).
+- ETag / Last-Modified üretilir; If-None-Match / If-Modified-Since -> 304.
+- /api/me cevap cache'lemez; ETag'i yalnızca kullanıcı başına `me:<id>` versiyonundan
+  üretir (304 yolu sorgusuz).
+
+LocMemCache ve Redis (django.core.cache.backends.redis.RedisCache) ile çalışır;
+sayaçlar cache.incr ile atomik artırılır.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import db_router, search
+
+KEY_PREFIX = "rc"
+
+
+# -----------------------------
+# Versiyon sayaçları
+# -----------------------------
+def _version_key(name):
+    return f"{KEY_PREFIX}:ver:{name}"
+
+
+def _initial_version():
+    # Sayaç cache'ten düşerse (eviction/restart) eski anahtarlarla çakışmasın diye
+    # sabit 1 yerine zamana bağlı bir başlangıç değeri
+    return time.time_ns() // 1000
+
+
+def get_versions(names):
+    keys = [_version_key(n) for n in names]
+    found = cache.get_many(keys)
+    missing = [k for k in keys if k not in found]
+    for key in missing:
+        cache.add(key, _initial_version(), timeout=None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return [found.get(k, 0) for k in keys]
+
+
+def bump(*names):
+    for name in names:
+        key = _version_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Anahtar yok (ilk kez ya da cache'ten düşmüş)
+            if not cache.add(key, _initial_version(), timeout=None):
+                cache.incr(key)
+
+
+def bump_on_commit(*names):
+    # Commit'ten önce artırılırsa araya giren bir okuma eski veriyi yeni versiyonla cache'ler
+    transaction.on_commit(lambda: bump(*names))
+
+
+def bump_tutor(user_id):
+    # Public tutor cevapları ve tutor'un kendi /api/me cevabı
+    bump_on_commit("tutors", f"tutor:{user_id}", f"me:{user_id}")
+
+
+def me_versions(user_id):
+    # /api/me: kullanıcı/profil versiyonu + subject adları
+    return [f"me:{user_id}", "subjects"]
+
+
+def etag_for(names):
+    """Versiyonlardan ETag; sorgu açmaz (yalnızca cache)."""
+    raw = ",".join(f"{n}:{v}" for n, v in zip(names, get_versions(names)))
+    return quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# -----------------------------
+# Query normalizasyonu
+# -----------------------------
+def _normalize_param(name, value):
+    if name in ("subject", "facets"):
+        parts = sorted({p.strip() for p in value.split(",") if p.strip()})
+        return ",".join(parts)
+    if name == "search":
+        return search.normalize(value)
+    return value.strip()
+
+
+def normalized_query(request, params):
+    items = []
+    for name in sorted(params):
+        value = request.query_params.get(name)
+        if value not in (None, ""):
+            items.append(f"{name}={_normalize_param(name, value)}")
+    return "&".join(items)
+
+
+# -----------------------------
+# ViewSet mixin
+# -----------------------------
+class CachedResponseMixin:
+    """
+    list/retrieve cevaplarını cache'ler. View'lar şunları tanımlar:
+      cache_query_params: cevabı etkileyen query param'ları
+      get_cache_versions(): anahtara giren entity versiyon isimleri
+    """
+    cache_query_params = ()
+
+    def get_cache_versions(self):
+        return []
+
+    def get_cache_key(self, request):
+        names = self.get_cache_versions()
+        versions = get_versions(names)
+        raw = "|".join([
+            # next/previous linkleri mutlak URL içerdiği için host da anahtarda
+            request.get_host(),
+            self.__class__.__name__,
+            self.action or "",
+            str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, "")),
+            ",".join(f"{n}:{v}" for n, v in zip(names, versions)),
+            normalized_query(request, self.cache_query_params),
+        ])
+        return f"{KEY_PREFIX}:resp:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, producer, request, *args, **kwargs):
+        if not getattr(settings, "RESPONSE_CACHE_ENABLED", True):
+            return producer(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            # Replikadan üretilen eski veri yeni versiyon anahtarıyla timeout boyunca kalırdı
+            with db_router.primary():
+                response = producer(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            body = JSONRenderer().render(response.data)
+            entry = {
+                "data": response.data,
+                "etag": quote_etag(hashlib.sha1(body).hexdigest()),
+                "last_modified": int(timezone.now().timestamp()),
+            }
+            cache.set(key, entry, timeout=getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+        else:
+            response = Response(entry["data"])
+
+        if self.not_modified(request, entry):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        return response
+
+    @staticmethod
+    def not_modified(request, entry):
+        if request.headers.get("If-None-Match"):
+            return etag_matches(request, entry["etag"])
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        return since is not None and entry["last_modified"] <= since
@@ -0,0 +1,94 @@
+# core/schema.py
+"""
+OpenAPI şeması (drf-spectacular) için eklemeler.
+
+- ClaimsJWTAuthentication simplejwt'nin bearer şemasıyla (jwtAuth) belgelenir.
+- Kayıt / giriş DRF view'ı değil, düz async Django view'larıdır (core/async_views.py);
+  spectacular yalnızca APIView'ları tarar. Bu view'lar `documented_by` ile yalnızca
+  şema üretiminde kullanılan bir APIView'a bağlanır; çalışma anındaki callback değişmez.
+"""
+from drf_spectacular import generators
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import generics, permissions, serializers
+
+from .serializers import LoginSerializer, RegisterSerializer
+
+DETAIL = inline_serializer("Detail", fields={"detail": serializers.CharField()})
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "core.authentication.ClaimsJWTAuthentication"
+
+
+def documented_by(schema_view):
+    def decorator(view_func):
+        view_func.schema_view = schema_view
+        return view_func
+
+    return decorator
+
+
+def _documented(callback):
+    schema_view = getattr(callback, "schema_view", None)
+    return schema_view.as_view() if schema_view is not None else callback
+
+
+class EndpointEnumerator(generators.EndpointEnumerator):
+    def should_include_endpoint(self, path, callback):
+        return super().should_include_endpoint(path, _documented(callback))
+
+    def get_allowed_methods(self, callback):
+        return super().get_allowed_methods(_documented(callback))
+
+
+class SchemaGenerator(generators.SchemaGenerator):
+    endpoint_inspector_cls = EndpointEnumerator
+
+    def create_view(self, callback, method, request=None):
+        return super().create_view(_documented(callback), method, request)
+
+
+# -----------------------------
+# Şema view'ları (yalnızca belge)
+# -----------------------------
+def schema_only_post(**schema):
+    """Belgelenen POST; view yönlendirilirse 405 (gerçek uç nokta async view)."""
+    def post(self, request, *args, **kwargs):
+        return self.http_method_not_allowed(request, *args, **kwargs)
+
+    return extend_schema(**schema)(post)
+
+
+class AuthSchemaView(generics.GenericAPIView):
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+
+class RegisterSchemaView(AuthSchemaView):
+    serializer_class = RegisterSerializer
+    post = schema_only_post(
+        operation_id="auth_register",
+        responses={201: RegisterSerializer, 400: None, 429: DETAIL, 503: DETAIL},
+        description="IP başına throttle (429). Parola hash'i sınırlı süreç havuzunda; havuz doluysa 503 + Retry-After.",
+    )
+
+
+class LoginSchemaView(AuthSchemaView):
+    serializer_class = LoginSerializer
+    post = schema_only_post(
+        operation_id="auth_login",
+        responses={
+            200: inline_serializer("TokenPair", fields={
+                "access": serializers.CharField(), "refresh": serializers.CharField(),
+            }),
+            400: None,
+            401: DETAIL,
+            429: DETAIL,
+            503: DETAIL,
+        },
+        description=(
+            "IP ve email başına throttle (429). Parola doğrulaması sınırlı süreç havuzunda; "
+            "havuz doluysa 503 + Retry-After."
+        ),
+    )
@@ -0,0 +1,256 @@
+# core/search.py
+"""
+Tutor arama alt sistemi.
+
+Her tutor için normalize edilmiş, token'lara ayrılmış tek bir arama dokümanı
+(username, ad, soyad, email, bio) `TutorSearchDocument` tablosunda tutulur ve
+User/TutorProfile kaydedildikçe artımlı güncellenir (bkz. core/signals.py).
+
+Backend veritabanına göre seçilir:
+- sqlite   : FTS5 sanal tablosu (rowid = user_id), bm25 ile sıralama
+- postgresql: generated tsvector kolonu + GIN, pg_trgm ile bulanık eşleşme
+- diğerleri: doküman kolonu üzerinde token bazlı LIKE (tek kolon, join yok)
+"""
+import re
+import unicodedata
+
+from django.db import connection as default_connection
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+# Türkçe'ye özgü ve NFKD ile ayrışmayan harfler
+_TRANSLATE = str.maketrans({"ı": "i", "İ": "i", "ß": "ss", "ø": "o", "đ": "d", "ł": "l"})
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+DOCUMENT_TABLE = "core_tutorsearchdocument"
+FTS_TABLE = "core_tutorsearch_fts"
+
+
+def normalize(text):
+    """Küçük harf, aksan temizliği, alfanümerik olmayanlar -> boşluk."""
+    if not text:
+        return ""
+    text = text.translate(_TRANSLATE)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def build_document(username="", first_name="", last_name="", email="", bio=""):
+    parts = [username, first_name, last_name, email, bio]
+    return normalize(" ".join(p for p in parts if p))
+
+
+# -----------------------------
+# Backend'ler
+# -----------------------------
+class BaseSearchBackend:
+    ranked = False
+
+    def install(self, cursor):
+        """Şema kurulumu (migration sırasında çağrılır)."""
+
+    def uninstall(self, cursor):
+        pass
+
+    def index_many(self, cursor, docs):
+        """docs: [(user_id, document), ...] -> dokümanı backend'e yansıt."""
+
+    def remove(self, cursor, user_ids):
+        pass
+
+    def filter(self, qs, query):
+        """
+        User queryset'ini aramaya göre daraltır; ranked backend'lerde
+        `search_rank` annotation'ı ekler (küçük = daha alakalı).
+        """
+        for token in tokenize(query):
+            qs = qs.filter(search_document__document__contains=token)
+        return qs
+
+
+class SqliteFTSBackend(BaseSearchBackend):
+    ranked = True
+
+    def install(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(document, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def uninstall(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def index_many(self, cursor, docs):
+        docs = list(docs)
+        if not docs:
+            return
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(uid,) for uid, _ in docs])
+        cursor.executemany(f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (%s, %s)", docs)
+
+    def remove(self, cursor, user_ids):
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(uid,) for uid in user_ids])
+
+    @staticmethod
+    def match_expression(query):
+        # Her token prefix olarak aranır (klavye vuruşu başına arama)
+        return " ".join(f'"{t}"*' for t in tokenize(query))
+
+    def filter(self, qs, query):
+        match = self.match_expression(query)
+        if not match:
+            return qs
+        user_table = qs.model._meta.db_table
+        # FTS tablosuyla doğrudan join: MATCH tek kez çalışır, bm25 (rank) satır başına
+        # yeniden hesaplanmaz. Korelasyonlu alt sorgu büyük sonuç kümelerinde çok yavaş.
+        return qs.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {user_table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+            select={"search_rank": f"{FTS_TABLE}.rank"},
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    ranked = True
+
+    def install(self, cursor):
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            f"ALTER TABLE {DOCUMENT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS core_tutorsearch_vector_gin "
+            f"ON {DOCUMENT_TABLE} USING gin (search_vector)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS core_tutorsearch_trgm_gin "
+            f"ON {DOCUMENT_TABLE} USING gin (document gin_trgm_ops)"
+        )
+
+    def uninstall(self, cursor):
+        cursor.execute("DROP INDEX IF EXISTS core_tutorsearch_trgm_gin")
+        cursor.execute("DROP INDEX IF EXISTS core_tutorsearch_vector_gin")
+        cursor.execute(f"ALTER TABLE {DOCUMENT_TABLE} DROP COLUMN IF EXISTS search_vector")
+
+    def filter(self, qs, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return qs
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        plain = " ".join(tokens)
+        user_table = qs.model._meta.db_table
+        return qs.filter(
+            id__in=RawSQL(
+                f"SELECT user_id FROM {DOCUMENT_TABLE} "
+                "WHERE search_vector @@ to_tsquery('simple', %s) OR document %% %s",
+                [tsquery, plain],
+            )
+        ).annotate(
+            # ts_rank/similarity büyük = iyi; diğer backend'lerle uyum için negatifle
+            search_rank=RawSQL(
+                f"(SELECT -(ts_rank(search_vector, to_tsquery('simple', %s)) + similarity(document, %s)) "
+                f"FROM {DOCUMENT_TABLE} WHERE user_id = {user_table}.id)",
+                [tsquery, plain],
+                output_field=FloatField(),
+            )
+        )
+
+
+_fts5_available = None
+
+
+def _sqlite_has_fts5(conn):
+    global _fts5_available
+    if _fts5_available is None:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            _fts5_available = bool(cursor.fetchone()[0])
+    return _fts5_available
+
+
+def get_backend(conn=None):
+    conn = conn or default_connection
+    if conn.vendor == "sqlite" and _sqlite_has_fts5(conn):
+        return SqliteFTSBackend()
+    if conn.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return BaseSearchBackend()
+
+
+# -----------------------------
+# İndeksleme
+# -----------------------------
+def index_tutors(user_ids=None, using="default"):
+    """
+    Verilen tutor'ların (None ise hepsinin) arama dokümanını tek seferde yeniden kurar.
+    Sinyaller tek kayıt için, import/rebuild komutları toplu olarak çağırır.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import connections, transaction
+    from .models import TutorSearchDocument
+
+    User = get_user_model()
+    qs = User.objects.using(using).filter(role=User.Role.TUTOR)
+    if user_ids is not None:
+        qs = qs.filter(id__in=list(user_ids))
+    rows = qs.values_list(
+        "id", "username", "first_name", "last_name", "email", "tutorprofile__bio"
+    ).iterator(chunk_size=2000)
+
+    conn = connections[using]
+    backend = get_backend(conn)
+    count = 0
+    batch = []
+
+    def flush():
+        TutorSearchDocument.objects.using(using).bulk_create(
+            [TutorSearchDocument(user_id=uid, document=doc) for uid, doc in batch],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["document"],
+        )
+        with conn.cursor() as cursor:
+            backend.index_many(cursor, batch)
+
+    with transaction.atomic(using=using):
+        for uid, username, first, last, email, bio in rows:
+            batch.append((uid, build_document(username, first, last, email, bio or "")))
+            if len(batch) >= 2000:
+                flush()
+                count += len(batch)
+                batch = []
+        if batch:
+            flush()
+            count += len(batch)
+    return count
+
+
+def remove_tutors(user_ids, using="default"):
+    from django.db import connections
+
+    conn = connections[using]
+    with conn.cursor() as cursor:
+        get_backend(conn).remove(cursor, list(user_ids))
+
+
+def search_tutors(qs, query):
+    """TutorViewSet için giriş noktası: `search_rank` ile daraltılmış queryset."""
+    backend = get_backend()
+    # Normalize edilince boş kalan sorgu (`@`, `-`) filtrelemez; backend'ler rank eklemez
+    if not tokenize(query):
+        return qs.annotate(search_rank=Value(0.0, output_field=FloatField()))
+    qs = backend.filter(qs, query)
+    if not backend.ranked:
+        qs = qs.annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return qs
+
+
+def order_by_relevance(qs, tiebreak="-tutorprofile__rating"):
+    return qs.order_by(F("search_rank").asc(nulls_last=True), tiebreak, "id")
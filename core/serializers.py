@@ -1,13 +1,63 @@
 # core/serializers.py
-from django.db import transaction
+import decimal
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import serializers
 
-from .models import Subject, TutorProfile, StudentProfile, LessonRequest
+from . import availability, notifications, tutor_stats
+from .instrumentation import TimedSerializerMixin
+from .models import Subject, TutorProfile, StudentProfile, LessonRequest, Review
 
 User = get_user_model()
 
 
+# -----------------------
+# Compiled (hızlı) okuma yolu
+# -----------------------
+# DRF alan makinesini (alan başına to_representation, source çözümleme,
+# SerializerMethodField dispatch) atlayıp satırları doğrudan dict'e çevirir.
+# Çıktı, normal serializer ile birebir aynı JSON'dur. settings.COMPILED_READ_SERIALIZERS
+# ile açılır; many=True listelerde child'ın `compiled_representation`'ı kullanılır.
+def decimal_repr(value, max_digits, decimal_places):
+    """serializers.DecimalField(coerce_to_string=True).to_representation ile aynı çıktı."""
+    if value is None:
+        return ""
+    if not isinstance(value, decimal.Decimal):
+        value = decimal.Decimal(str(value).strip())
+    context = decimal.getcontext().copy()
+    context.prec = max_digits
+    return f"{value.quantize(decimal.Decimal('.1') ** decimal_places, context=context):f}"
+
+
+def datetime_repr(value, tz):
+    """serializers.DateTimeField().to_representation (ISO 8601) ile aynı çıktı."""
+    if not value:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def current_field_timezone():
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+class CompiledListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    def to_representation(self, data):
+        compiled = getattr(self.child, "compiled_representation", None)
+        if compiled is None or not getattr(settings, "COMPILED_READ_SERIALIZERS", False):
+            return super().to_representation(data)
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return compiled(iterable)
+
+
 # -----------------------
 # Auth / Register
 # -----------------------
@@ -26,8 +76,13 @@ class RegisterSerializer(serializers.ModelSerializer):
     @transaction.atomic
     def create(self, validated_data):
         pwd = validated_data.pop("password")
+        # Kayıt uç noktası hash'i havuzda önceden üretir (core/hashing.py)
+        encoded = validated_data.pop("password_hash", None)
         user = User(**validated_data)
-        user.set_password(pwd)
+        if encoded:
+            user.password = encoded
+        else:
+            user.set_password(pwd)
         user.save()
         if user.role == "tutor":
             TutorProfile.objects.create(user=user)
@@ -36,6 +91,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+class LoginSerializer(serializers.Serializer):
+    """Giriş gövdesi; doğrulama core/async_views.py'de (hash havuzda)."""
+    email = serializers.CharField()
+    password = serializers.CharField()
+
+
 # -----------------------
 # Subject
 # -----------------------
@@ -48,7 +109,7 @@ class SubjectSerializer(serializers.ModelSerializer):
 # -----------------------
 # Tutor list/detail
 # -----------------------
-class TutorMiniSerializer(serializers.ModelSerializer):
+class TutorMiniSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Beklenen response şekli:
     {
@@ -74,23 +135,60 @@ class TutorMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "name", "subjects", "hourly_rate", "rating", "bio"]
+        list_serializer_class = CompiledListSerializer
 
     def get_name(self, obj):
         full = obj.get_full_name()
         return full if full else (obj.username or obj.email)
 
+    def compiled_representation(self, users):
+        """select_related('tutorprofile') + prefetch_related('tutorprofile__subjects') bekler."""
+        rows = []
+        for obj in users:
+            tp = obj.tutorprofile
+            full = f"{obj.first_name} {obj.last_name}".strip()
+            rows.append({
+                "id": obj.id,
+                "name": full if full else (obj.username or obj.email),
+                "subjects": [{"id": s.id, "name": s.name} for s in tp.subjects.all()],
+                "hourly_rate": tp.hourly_rate,
+                "rating": decimal_repr(tp.rating, 2, 1),
+                "bio": tp.bio,
+            })
+        return rows
+
 
 class TutorDetailSerializer(TutorMiniSerializer):
     """
-    Şimdilik liste ile aynı alanlar. Detayda ekstra alan açmak istersen burada genişlet.
+    Liste alanları + "rating_count", "rating_score" (core/ratings.py) +
+    "stats" (core/tutor_stats.py; materialize edilmiş TutorStats satırı):
+      {"pending_count", "approved_count", "rejected_count", "approval_rate", "avg_response_seconds"}
+    N+1 için ek olarak .select_related("stats") bekler.
     """
-    pass
+    rating_count = serializers.IntegerField(source="tutorprofile.rating_count", read_only=True)
+    rating_score = serializers.FloatField(source="tutorprofile.rating_score", read_only=True)
+    stats = serializers.SerializerMethodField()
+
+    class Meta(TutorMiniSerializer.Meta):
+        fields = TutorMiniSerializer.Meta.fields + ["rating_count", "rating_score", "stats"]
+
+    def get_stats(self, obj):
+        return tutor_stats.stats_repr(getattr(obj, "stats", None))
+
+    def compiled_representation(self, users):
+        users = list(users)
+        rows = super().compiled_representation(users)
+        for row, obj in zip(rows, users):
+            row["rating_count"] = obj.tutorprofile.rating_count
+            row["rating_score"] = obj.tutorprofile.rating_score
+            row["stats"] = self.get_stats(obj)
+        return rows
 
 
 # -----------------------
 # Me (profile)
 # -----------------------
-class MeSerializer(serializers.ModelSerializer):
+class MeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     tutorprofile = serializers.SerializerMethodField()
     studentprofile = serializers.SerializerMethodField()
 
@@ -99,10 +197,11 @@ class MeSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "username", "first_name", "last_name", "role", "tutorprofile", "studentprofile"]
 
     def get_tutorprofile(self, obj):
-        tp = getattr(obj, "tutorprofile", None)
+        # Rol dışındaki profil için ters O2O sorgusu açılmasın
+        tp = getattr(obj, "tutorprofile", None) if obj.role == User.Role.TUTOR else None
         if not tp:
             return None
-        # subjects prefetch edildiyse ek sorgu açılmaz
+        # subjects prefetch edildiyse (PATCH'te set_subjects'te) ek sorgu açılmaz
         return {
             "bio": tp.bio,
             "hourly_rate": tp.hourly_rate,
@@ -111,12 +210,46 @@ class MeSerializer(serializers.ModelSerializer):
         }
 
     def get_studentprofile(self, obj):
-        sp = getattr(obj, "studentprofile", None)
+        sp = getattr(obj, "studentprofile", None) if obj.role == User.Role.STUDENT else None
         if not sp:
             return None
         return {"grade_level": sp.grade_level}
 
 
+def set_subjects(profile, subject_ids):
+    """
+    `profile.subjects.set()` yerine fark: mevcut ve istenen subject'ler birer sorguyla okunur,
+    değişiklik tek DELETE + tek INSERT (eşzamanlı eklemede çakışma yok sayılır, add() gibi).
+    m2m_changed sinyalleri set() ile aynı şekilde, touch_profile=False ile gönderilir.
+    Yeni liste cevap için prefetch edilir; profilin subjects'i önceden prefetch edilmemiş olmalı.
+    Çağıran ardından `profile.save()` yapar (updated_at o kayıtla güncellenir).
+    """
+    through = TutorProfile.subjects.through
+    db = profile._state.db
+    wanted = set(Subject.objects.using(db).filter(id__in=subject_ids).values_list("id", flat=True))
+    current = set(through.objects.using(db).filter(tutorprofile_id=profile.pk).values_list("subject_id", flat=True))
+
+    for action, pk_set, write in (
+        ("remove", current - wanted, lambda ids: through.objects.using(db).filter(
+            tutorprofile_id=profile.pk, subject_id__in=ids).delete()),
+        ("add", wanted - current, lambda ids: through.objects.using(db).bulk_create(
+            [through(tutorprofile_id=profile.pk, subject_id=sid) for sid in ids], ignore_conflicts=True)),
+    ):
+        if not pk_set:
+            continue
+        signal = dict(
+            sender=through, instance=profile, reverse=False, model=Subject, pk_set=pk_set, using=db,
+            touch_profile=False,
+        )
+        models.signals.m2m_changed.send(action=f"pre_{action}", **signal)
+        write(pk_set)
+        models.signals.m2m_changed.send(action=f"post_{action}", **signal)
+
+    models.prefetch_related_objects(
+        [profile], models.Prefetch("subjects", queryset=Subject.objects.using(db).order_by("name")),
+    )
+
+
 class MeUpdateSerializer(serializers.Serializer):
     bio = serializers.CharField(required=False, allow_blank=True)
     hourly_rate = serializers.IntegerField(required=False)
@@ -134,8 +267,7 @@ class MeUpdateSerializer(serializers.Serializer):
                     raise serializers.ValidationError({"hourly_rate": "Must be >= 0"})
                 tp.hourly_rate = validated["hourly_rate"]
             if "subjects" in validated:
-                ids = validated["subjects"]
-                tp.subjects.set(Subject.objects.filter(id__in=ids))
+                set_subjects(tp, validated["subjects"])
             tp.save()
         else:
             sp = instance.studentprofile
@@ -162,6 +294,16 @@ class LessonRequestCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Only students can create lesson requests.")
         if attrs.get("duration_minutes", 0) <= 0:
             raise serializers.ValidationError({"duration_minutes": "Must be > 0"})
+        if attrs["duration_minutes"] > settings.LESSON_MAX_DURATION_MINUTES:
+            raise serializers.ValidationError(
+                {"duration_minutes": f"Must be <= {settings.LESSON_MAX_DURATION_MINUTES}"}
+            )
+        start = attrs["start_time"]
+        end = start + timedelta(minutes=attrs["duration_minutes"])
+        if availability.has_conflict(attrs["tutor_id"], start, end):
+            raise serializers.ValidationError(
+                {"start_time": "Tutor already has an approved lesson at this time."}
+            )
         return attrs
 
     @transaction.atomic
@@ -172,7 +314,7 @@ class LessonRequestCreateSerializer(serializers.ModelSerializer):
         return LessonRequest.objects.create(student=user, tutor=tutor, subject=subject, **validated)
 
 
-class LessonRequestListSerializer(serializers.ModelSerializer):
+class LessonRequestListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     student_email = serializers.EmailField(source="student.email", read_only=True)
     tutor_email = serializers.EmailField(source="tutor.email", read_only=True)
     subject = SubjectSerializer(read_only=True)
@@ -190,9 +332,204 @@ class LessonRequestListSerializer(serializers.ModelSerializer):
             "note",
             "created_at",
         ]
+        list_serializer_class = CompiledListSerializer
+
+    # `.values()` projeksiyonu ile dict satırlardan da üretilebilsin (export vb.)
+    values_fields = (
+        "id", "student__email", "tutor__email", "subject_id", "subject__name",
+        "start_time", "duration_minutes", "status", "note", "created_at",
+    )
+
+    def compiled_representation(self, lesson_requests):
+        """select_related('student', 'tutor', 'subject') bekler."""
+        tz = current_field_timezone()
+        return [
+            {
+                "id": obj.id,
+                "student_email": obj.student.email,
+                "tutor_email": obj.tutor.email,
+                "subject": {"id": obj.subject.id, "name": obj.subject.name},
+                "start_time": datetime_repr(obj.start_time, tz),
+                "duration_minutes": obj.duration_minutes,
+                "status": obj.status,
+                "note": obj.note,
+                "created_at": datetime_repr(obj.created_at, tz),
+            }
+            for obj in lesson_requests
+        ]
+
+    @staticmethod
+    def compile_values_row(row, tz):
+        """`values(*values_fields)` satırını list cevabıyla aynı dict'e çevirir."""
+        return {
+            "id": row["id"],
+            "student_email": row["student__email"],
+            "tutor_email": row["tutor__email"],
+            "subject": {"id": row["subject_id"], "name": row["subject__name"]},
+            "start_time": datetime_repr(row["start_time"], tz),
+            "duration_minutes": row["duration_minutes"],
+            "status": row["status"],
+            "note": row["note"],
+            "created_at": datetime_repr(row["created_at"], tz),
+        }
 
 
 class LessonRequestStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = LessonRequest
         fields = ["status"]
+
+    def validate_status(self, value):
+        if value == LessonRequest.Status.APPROVED and self.instance is not None:
+            self.ensure_slot_free(self.instance)
+        return value
+
+    @staticmethod
+    def ensure_slot_free(instance):
+        if availability.has_conflict(
+            instance.tutor_id, instance.start_time, instance.end_time, exclude_id=instance.id
+        ):
+            raise serializers.ValidationError("Tutor already has an approved lesson at this time.")
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        if validated_data.get("status") == LessonRequest.Status.APPROVED:
+            # Eşzamanlı iki onayı sıraya sok: tutor satırını kilitle ve yeniden kontrol et
+            User.objects.select_for_update().filter(id=instance.tutor_id).first()
+            try:
+                self.ensure_slot_free(instance)
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"status": exc.detail})
+        return super().update(instance, validated_data)
+
+
+class LessonRequestBulkStatusItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=LessonRequest.Status.choices)
+
+
+class LessonRequestBulkStatusSerializer(serializers.Serializer):
+    """
+    POST /api/lesson-requests/bulk-status
+    body: { "items": [ {"id": 1, "status": "approved"}, ... ] }
+
+    Sabit sayıda sorgu: onay varsa tutor satırı kilidi, tek SELECT ... FOR UPDATE (tutor'a ait satırlar),
+    tek çakışma penceresi sorgusu, tek bulk_update, tek TutorStats UPDATE
+    (database bildirim broker'ında + tek INSERT).
+    """
+    MAX_ITEMS = 500
+
+    items = LessonRequestBulkStatusItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+    def validate_items(self, items):
+        ids = [item["id"] for item in items]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each id may appear only once.")
+        return items
+
+    @transaction.atomic
+    def save(self, tutor):
+        items = self.validated_data["items"]
+        if any(item["status"] == LessonRequest.Status.APPROVED for item in items):
+            # Tekil onayla (LessonRequestStatusSerializer.update) aynı kilit ve sıra: önce tutor
+            # satırı, sonra talepler; toplu işlem dışındaki eşzamanlı onay bekler
+            User.objects.select_for_update().filter(id=tutor.id).first()
+        # Yetki: sadece bu tutor'a ait kayıtlar kilitlenir/güncellenir
+        rows = {
+            lr.id: lr
+            for lr in LessonRequest.objects.select_for_update()
+            .filter(tutor=tutor, id__in=[item["id"] for item in items])
+        }
+
+        approving = [rows[i["id"]] for i in items if i["id"] in rows and i["status"] == LessonRequest.Status.APPROVED]
+        busy = None
+        if approving:
+            busy = availability.BusyIntervals.load(
+                tutor.id,
+                min(lr.start_time for lr in approving),
+                max(lr.end_time for lr in approving),
+                exclude_ids=rows.keys(),
+            )
+            # Bu toplu işlemde onaylı kalacak kayıtlar takvimde; onaydan çıkanlar
+            # (sıradan bağımsız olarak) önce serbest bırakılmış sayılır
+            targets = {i["id"]: i["status"] for i in items}
+            for lr in rows.values():
+                if lr.status == LessonRequest.Status.APPROVED and targets[lr.id] == lr.status:
+                    busy.add(lr.start_time, lr.end_time, lr.id)
+
+        results, changed, previous = [], [], {}
+        delta = tutor_stats.Delta()
+        for item in items:
+            lr = rows.get(item["id"])
+            if lr is None:
+                results.append({"id": item["id"], "ok": False, "error": "Not found."})
+                continue
+            new_status = item["status"]
+            if new_status == LessonRequest.Status.APPROVED and lr.status != new_status:
+                if busy.overlaps(lr.start_time, lr.end_time):
+                    results.append({
+                        "id": lr.id, "ok": False,
+                        "error": "Tutor already has an approved lesson at this time.",
+                    })
+                    continue
+                busy.add(lr.start_time, lr.end_time, lr.id)
+            if lr.status != new_status:
+                old_status, lr.status = lr.status, new_status
+                previous.setdefault(lr.id, old_status)
+                delta.transition(old_status, new_status)
+                if lr.mark_status_change(old_status):
+                    delta.responded(lr)
+                changed.append(lr)
+            results.append({"id": lr.id, "ok": True, "status": new_status})
+
+        if changed:
+            # bulk_update sinyal göndermez: TutorStats farkı tek UPDATE ile
+            now = timezone.now()
+            for lr in changed:
+                lr.updated_at = now
+            LessonRequest.objects.bulk_update(changed, ["status", "responded_at", "updated_at"])
+            tutor_stats.apply(tutor.id, delta)
+            notifications.publish_lesson_requests([(lr, previous[lr.id]) for lr in changed])
+        return results
+
+
+# -----------------------
+# Reviews
+# -----------------------
+class ReviewSerializer(serializers.ModelSerializer):
+    """
+    POST /api/reviews   {"lesson_request": <id>, "score": 1-5, "comment": "..."}
+    PATCH /api/reviews/{id}   {"score": .., "comment": ..}
+    Sadece öğrencinin kendi onaylanmış dersleri, ders başına tek yorum.
+    """
+    lesson_request = serializers.PrimaryKeyRelatedField(queryset=LessonRequest.objects.all())
+    score = serializers.IntegerField(min_value=1, max_value=5)
+
+    class Meta:
+        model = Review
+        fields = ["id", "lesson_request", "tutor", "score", "comment", "created_at"]
+        read_only_fields = ["tutor", "created_at"]
+
+    def validate_lesson_request(self, lesson_request):
+        if self.instance is not None:
+            if lesson_request.id != self.instance.lesson_request_id:
+                raise serializers.ValidationError("Cannot move a review to another lesson request.")
+            return lesson_request
+        if lesson_request.student_id != self.context["request"].user.id:
+            raise serializers.ValidationError("You can only review your own lessons.")
+        if lesson_request.status != LessonRequest.Status.APPROVED:
+            raise serializers.ValidationError("Only approved lessons can be reviewed.")
+        if Review.objects.filter(lesson_request=lesson_request).exists():
+            raise serializers.ValidationError("This lesson has already been reviewed.")
+        return lesson_request
+
+    def create(self, validated):
+        lesson_request = validated["lesson_request"]
+        try:
+            with transaction.atomic():
+                return Review.objects.create(
+                    student_id=lesson_request.student_id, tutor_id=lesson_request.tutor_id, **validated
+                )
+        except IntegrityError:
+            # Eşzamanlı ikinci POST exists() kontrolünü geçti; OneToOne kısıtı yakaladı
+            raise serializers.ValidationError({"lesson_request": ["This lesson has already been reviewed."]})
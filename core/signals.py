@@ -0,0 +1,269 @@
+# core/signals.py
+"""
+Denormalize edilmiş yapıların (arama dokümanı, subject indeksi, response cache
+versiyonları vb.) artımlı bakımı.
+CoreConfig.ready() içinde import edilerek bağlanır.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.functions import Now
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import authentication, notifications, ratings, recommendations, response_cache, search, sync, tutor_stats
+from .instrumentation import instrument_connection
+from .models import LessonRequest, Review, StudentProfile, Tombstone, User, Subject, TutorProfile
+from .subject_index import subject_index
+
+
+# İstek ölçümü: her yeni DB bağlantısına sorgu sayacı (core/instrumentation.py)
+connection_created.connect(instrument_connection, dispatch_uid="core.instrumentation.connection")
+
+
+@receiver(connection_created, dispatch_uid="core.db.sqlite_pragmas")
+def configure_sqlite(sender, connection, **kwargs):
+    """SQLite bağlantısı başına PRAGMA'lar (settings.SQLITE_PRAGMAS); istek sorgu sayacına girmez."""
+    if connection.vendor != "sqlite":
+        return
+    for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(post_save, sender=User, dispatch_uid="core.search.user_saved")
+def reindex_tutor_on_user_save(sender, instance, raw=False, **kwargs):
+    if raw or instance.role != User.Role.TUTOR:
+        return
+    search.index_tutors([instance.pk], using=kwargs.get("using") or "default")
+
+
+@receiver(post_save, sender=TutorProfile, dispatch_uid="core.search.profile_saved")
+def reindex_tutor_on_profile_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_tutors([instance.user_id], using=kwargs.get("using") or "default")
+
+
+@receiver(post_delete, sender=User, dispatch_uid="core.search.user_deleted")
+def drop_tutor_from_index(sender, instance, **kwargs):
+    if instance.role == User.Role.TUTOR:
+        search.remove_tutors([instance.pk], using=kwargs.get("using") or "default")
+
+
+# -----------------------------
+# Subject -> tutor indeksi
+# -----------------------------
+@receiver(m2m_changed, sender=TutorProfile.subjects.through, dispatch_uid="core.subject_index.m2m")
+def sync_subject_index(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Subject tarafından yapılan değişiklik: pk_set TutorProfile id'leri, user id değil
+        subject_index.invalidate()
+    elif action == "post_add":
+        subject_index.add(instance.user_id, pk_set)
+    elif action == "post_remove":
+        subject_index.remove(instance.user_id, pk_set)
+    else:
+        subject_index.remove(instance.user_id)
+
+
+@receiver(post_delete, sender=TutorProfile, dispatch_uid="core.subject_index.profile_deleted")
+def drop_profile_from_subject_index(sender, instance, **kwargs):
+    subject_index.remove(instance.user_id)
+
+
+@receiver(post_delete, sender=Subject, dispatch_uid="core.subject_index.subject_deleted")
+def drop_subject_from_index(sender, instance, **kwargs):
+    subject_index.drop_subject(instance.pk)
+
+
+# -----------------------------
+# Öneri snapshot'ı (core/recommendations.py); istatistik ve puan güncellemeleri
+# tutor_stats.apply / ratings.apply içinden işaretlenir
+# -----------------------------
+@receiver([post_save, post_delete], sender=TutorProfile, dispatch_uid="core.recommendations.profile")
+def mark_profile_for_recommendations(sender, instance, raw=False, **kwargs):
+    if not raw:
+        recommendations.snapshot.mark_changed([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid="core.recommendations.user")
+def mark_tutor_for_recommendations(sender, instance, raw=False, created=False, **kwargs):
+    # Yeni tutor'un satırı profil kaydıyla gelir
+    if not raw and not created and instance.role == User.Role.TUTOR:
+        recommendations.snapshot.mark_changed([instance.pk])
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through, dispatch_uid="core.recommendations.m2m")
+def mark_subjects_for_recommendations(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        recommendations.snapshot.invalidate()
+    else:
+        recommendations.snapshot.mark_changed([instance.user_id])
+
+
+@receiver(post_delete, sender=Subject, dispatch_uid="core.recommendations.subject_deleted")
+def drop_subject_from_recommendations(sender, instance, **kwargs):
+    # Through satırları sinyalsiz cascade ile silinir
+    recommendations.snapshot.invalidate()
+
+
+# -----------------------------
+# Response cache versiyonları
+# -----------------------------
+@receiver([post_save, post_delete], sender=Subject, dispatch_uid="core.response_cache.subject")
+def bump_subject_version(sender, instance, **kwargs):
+    response_cache.bump_on_commit("subjects")
+
+
+@receiver([post_save, post_delete], sender=TutorProfile, dispatch_uid="core.response_cache.profile")
+def bump_profile_version(sender, instance, **kwargs):
+    response_cache.bump_tutor(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid="core.response_cache.user")
+def bump_user_version(sender, instance, **kwargs):
+    if instance.role == User.Role.TUTOR:
+        response_cache.bump_tutor(instance.pk)
+    else:
+        response_cache.bump_on_commit(f"me:{instance.pk}")
+
+
+@receiver([post_save, post_delete], sender=StudentProfile, dispatch_uid="core.response_cache.student_profile")
+def bump_student_profile_version(sender, instance, **kwargs):
+    response_cache.bump_on_commit(f"me:{instance.user_id}")
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through, dispatch_uid="core.response_cache.m2m")
+def bump_tutor_subjects_version(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # pk_set TutorProfile id'leri; tüm tutor cevaplarını kapsayan anahtarı artır
+        response_cache.bump_on_commit("subjects")
+    else:
+        response_cache.bump_tutor(instance.user_id)
+
+
+# -----------------------------
+# Claim tabanlı auth: deny-list ve alan cache'i (core/authentication.py)
+# -----------------------------
+@receiver(post_save, sender=User, dispatch_uid="core.authentication.user_saved")
+def refresh_auth_state(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    authentication.invalidate_cached_fields(instance.pk)
+    if getattr(instance, "_auth_state_changed", False):
+        authentication.invalidate_denylist()
+
+
+@receiver(post_delete, sender=User, dispatch_uid="core.authentication.user_deleted")
+def deny_deleted_user(sender, instance, **kwargs):
+    authentication.deny_deleted_user(instance.pk)
+    authentication.invalidate_cached_fields(instance.pk)
+
+
+# -----------------------------
+# TutorStats (core/tutor_stats.py); LessonRequest.save ile aynı transaction
+# -----------------------------
+@receiver(post_save, sender=User, dispatch_uid="core.tutor_stats.user_created")
+def create_tutor_stats(sender, instance, created, raw=False, **kwargs):
+    # Satır kayıtta açılır; talep yolu yalnızca UPDATE yapar
+    if created and not raw and instance.role == User.Role.TUTOR:
+        tutor_stats.ensure_rows([instance.pk])
+
+
+@receiver(post_save, sender=LessonRequest, dispatch_uid="core.tutor_stats.request_saved")
+def update_tutor_stats(sender, instance, raw=False, **kwargs):
+    change = getattr(instance, "_status_change", None)
+    if raw or change is None:
+        return
+    delta = tutor_stats.Delta().transition(*change)
+    if instance._responded:
+        delta.responded(instance)
+    tutor_stats.apply(instance.tutor_id, delta)
+
+
+@receiver(post_delete, sender=LessonRequest, dispatch_uid="core.tutor_stats.request_deleted")
+def drop_from_tutor_stats(sender, instance, **kwargs):
+    delta = tutor_stats.Delta().transition(instance.status, None).responded(instance, sign=-1)
+    tutor_stats.apply(instance.tutor_id, delta, create=False)
+
+
+# -----------------------------
+# Tutor puanı (core/ratings.py); Review.save ile aynı transaction
+# -----------------------------
+@receiver(post_save, sender=Review, dispatch_uid="core.ratings.review_saved")
+def apply_review(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_score, new_score = instance._score_change
+    if old_score is None:
+        ratings.apply(instance.tutor_id, new_score, 1)
+    else:
+        ratings.apply(instance.tutor_id, new_score - old_score, 0)
+
+
+@receiver(post_delete, sender=Review, dispatch_uid="core.ratings.review_deleted")
+def drop_review(sender, instance, **kwargs):
+    ratings.apply(instance.tutor_id, -instance.score, -1)
+
+
+# -----------------------------
+# Delta sync (core/sync.py): tombstone'lar ve TutorProfile.updated_at
+# -----------------------------
+@receiver(post_delete, sender=Subject, dispatch_uid="core.sync.subject_deleted")
+def tombstone_subject(sender, instance, **kwargs):
+    sync.record_deletion(Tombstone.Kind.SUBJECT, instance.pk)
+
+
+@receiver(post_delete, sender=TutorProfile, dispatch_uid="core.sync.profile_deleted")
+def tombstone_tutor(sender, instance, **kwargs):
+    # API'de tutor kimliği user id
+    sync.record_deletion(Tombstone.Kind.TUTOR, instance.user_id)
+
+
+@receiver(post_delete, sender=LessonRequest, dispatch_uid="core.sync.request_deleted")
+def tombstone_lesson_request(sender, instance, **kwargs):
+    sync.record_deletion(
+        Tombstone.Kind.LESSON_REQUEST, instance.pk, student_id=instance.student_id, tutor_id=instance.tutor_id
+    )
+
+
+# Tutor satırında gösterilen ama TutorProfile'da olmayan alanlar
+TUTOR_ROW_USER_FIELDS = {"first_name", "last_name", "username", "email"}
+
+
+@receiver(post_save, sender=User, dispatch_uid="core.sync.user_saved")
+def touch_tutor_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or instance.role != User.Role.TUTOR:
+        return
+    if update_fields is not None and not TUTOR_ROW_USER_FIELDS & set(update_fields):
+        return
+    TutorProfile.objects.filter(user_id=instance.pk).update(updated_at=Now())
+
+
+@receiver(m2m_changed, sender=TutorProfile.subjects.through, dispatch_uid="core.sync.m2m")
+def touch_tutor_on_subjects_change(sender, instance, action, reverse, pk_set, touch_profile=True, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # instance Subject; pk_set TutorProfile id'leri (clear'da None)
+        profiles = TutorProfile.objects.filter(id__in=pk_set) if pk_set else TutorProfile.objects.none()
+        profiles.update(updated_at=Now())
+    elif touch_profile:
+        # set_subjects (core/serializers.py) touch_profile=False gönderir: profil ardından kaydedilir
+        TutorProfile.objects.filter(pk=instance.pk).update(updated_at=Now())
+
+
+# -----------------------------
+# Bildirimler (core/notifications.py): talep oluşturma ve status değişimi
+# -----------------------------
+@receiver(post_save, sender=LessonRequest, dispatch_uid="core.notifications.request_saved")
+def notify_lesson_request(sender, instance, raw=False, **kwargs):
+    change = getattr(instance, "_status_change", None)
+    if raw or change is None:
+        return
+    notifications.publish_lesson_requests([(instance, change[0])])
@@ -0,0 +1,162 @@
+# core/subject_index.py
+"""
+Subject -> tutor user id indeksi (süreç içi).
+
+`?subject=` filtresi eskiden tutorprofile__subjects join'i + DISTINCT ile
+çözülüyordu. Bu modül her subject için sıralı bir tutor user id dizisi tutar;
+filtre böylece DISTINCT'siz bir `id__in` kümesine dönüşür.
+
+- İlk okumada through tablosundan tek sorguyla kurulur.
+- m2m_changed / post_delete sinyalleriyle artımlı güncellenir (core/signals.py).
+- Süreçler arası tutarlılık: paylaşılan cache'te bir versiyon token'ı tutulur;
+  başka bir worker değişiklik yaptığında token değişir ve yerel indeks yeniden kurulur.
+- Yerel değişiklikler commit sonrası uygulanır; SUBJECT_INDEX_TTL saniyede bir (kaçan
+  durumlara karşı) yenilenir.
+"""
+import bisect
+import heapq
+import threading
+import time
+import uuid
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "subject_index:version"
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+class SubjectTutorIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_subject = None      # subject_id -> array('q') (sıralı user id)
+        self._token = None
+        self._built_at = 0.0
+
+    # ---------- paylaşılan versiyon ----------
+    def _shared_token(self):
+        token = cache.get(VERSION_KEY)
+        if token is None:
+            token = _new_token()
+            if not cache.add(VERSION_KEY, token, timeout=None):
+                token = cache.get(VERSION_KEY, token)
+        return token
+
+    def bump_shared_version(self):
+        token = _new_token()
+        cache.set(VERSION_KEY, token, timeout=None)
+        with self._lock:
+            # Kendi yaptığımız değişiklik zaten yerelde uygulandı
+            if self._by_subject is not None:
+                self._token = token
+
+    # ---------- kurulum ----------
+    def _is_fresh(self, token):
+        ttl = getattr(settings, "SUBJECT_INDEX_TTL", 300)
+        return (
+            self._by_subject is not None
+            and self._token == token
+            and time.monotonic() - self._built_at < ttl
+        )
+
+    def _load(self):
+        token = self._shared_token()
+        with self._lock:
+            if self._is_fresh(token):
+                return self._by_subject
+            from .models import TutorProfile
+
+            through = TutorProfile.subjects.through
+            buckets = {}
+            rows = through.objects.values_list("subject_id", "tutorprofile__user_id")
+            for subject_id, user_id in rows.iterator(chunk_size=5000):
+                buckets.setdefault(subject_id, []).append(user_id)
+            self._by_subject = {sid: array("q", sorted(ids)) for sid, ids in buckets.items()}
+            self._token = token
+            self._built_at = time.monotonic()
+            return self._by_subject
+
+    def invalidate(self):
+        def change():
+            self._by_subject = None
+
+        self._after_commit(change)
+
+    # ---------- sorgu ----------
+    def tutor_ids(self, subject_ids, match_all=False):
+        """Sıralı, tekrarsız user id listesi (OR: birleşim, AND: kesişim)."""
+        index = self._load()
+        arrays = [index.get(int(sid), array("q")) for sid in subject_ids]
+        if not arrays:
+            return []
+        if match_all:
+            arrays.sort(key=len)
+            result = set(arrays[0])
+            for arr in arrays[1:]:
+                result.intersection_update(arr)
+                if not result:
+                    break
+            return sorted(result)
+        if len(arrays) == 1:
+            return list(arrays[0])
+        merged = []
+        last = None
+        for uid in heapq.merge(*arrays):
+            if uid != last:
+                merged.append(uid)
+                last = uid
+        return merged
+
+    # ---------- artımlı güncelleme ----------
+    # Yerel indeks de commit'ten sonra değişir: aynı süreçteki diğer istekler commit edilmemiş
+    # bağları görmez, rollback indeksi bozmaz
+    def _after_commit(self, change):
+        def apply():
+            with self._lock:
+                change()
+            self.bump_shared_version()
+
+        transaction.on_commit(apply)
+
+    def add(self, user_id, subject_ids):
+        subject_ids = tuple(subject_ids)
+
+        def change():
+            for sid in subject_ids if self._by_subject is not None else ():
+                arr = self._by_subject.setdefault(sid, array("q"))
+                pos = bisect.bisect_left(arr, user_id)
+                if pos == len(arr) or arr[pos] != user_id:
+                    arr.insert(pos, user_id)
+
+        self._after_commit(change)
+
+    def remove(self, user_id, subject_ids=None):
+        subject_ids = None if subject_ids is None else tuple(subject_ids)
+
+        def change():
+            index = self._by_subject or {}
+            targets = index.keys() if subject_ids is None else subject_ids
+            for sid in list(targets):
+                arr = index.get(sid)
+                if not arr:
+                    continue
+                pos = bisect.bisect_left(arr, user_id)
+                if pos < len(arr) and arr[pos] == user_id:
+                    del arr[pos]
+
+        self._after_commit(change)
+
+    def drop_subject(self, subject_id):
+        def change():
+            if self._by_subject is not None:
+                self._by_subject.pop(subject_id, None)
+
+        self._after_commit(change)
+
+
+subject_index = SubjectTutorIndex()
@@ -0,0 +1,205 @@
+# core/sync.py
+"""
+Mobil istemci için delta sync: GET /api/sync?since=<token>
+
+- Değişiklikler `updated_at` (Subject, TutorProfile, LessonRequest) ve silmeler
+  Tombstone tablosu üzerinden okunur. Dört kaynak tek bir UNION ALL sorgusunda,
+  global (zaman, tür, id) sırasıyla ve kaynak başına indeksli aralık taramasıyla
+  birleştirilir; değişiklik yoksa istek tek sorgudur.
+- Token opak ve monotoniktir: son gönderilen satırın (zaman, tür, id) anahtarı.
+  Aynı zaman damgalı satırlar (bulk_update) sayfa sınırında kaybolmaz.
+- Üst sınır `şimdi - SYNC_SETTLE_SECONDS`: commit'i geciken yazmalar, daha geç
+  zaman damgalı satırlar gönderildikten sonra görünür olup atlanmasın.
+- Tombstone'lar SYNC_TOMBSTONE_TTL sonra silinir; daha eski token 410 alır
+  (istemci sıfırdan senkronize olur).
+
+Cevap satırları liste uç noktalarıyla aynı şekildedir (compiled serializer'lar).
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, IntegerField, Q, Value
+from django.utils import timezone
+
+from .models import LessonRequest, Subject, Tombstone, TutorProfile, User
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+PRUNE_KEY = "sync:tombstones:pruned"
+
+# UNION içinde tür sırası (token'ın ikinci bileşeni)
+SUBJECT, TUTOR, LESSON_REQUEST, DELETED = range(4)
+FEED_KEYS = {SUBJECT: "subjects", TUTOR: "tutors", LESSON_REQUEST: "lesson_requests"}
+TOMBSTONE_KEYS = {
+    Tombstone.Kind.SUBJECT: "subjects",
+    Tombstone.Kind.TUTOR: "tutors",
+    Tombstone.Kind.LESSON_REQUEST: "lesson_requests",
+}
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class TokenExpired(Exception):
+    pass
+
+
+# -----------------------------
+# Token
+# -----------------------------
+def encode_token(key):
+    moment, rank, pk = key
+    micros = (moment - EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{rank}.{pk}"
+
+
+def decode_token(token):
+    if not token:
+        return None
+    try:
+        micros, rank, pk = (int(part) for part in token.split("."))
+    except ValueError:
+        raise InvalidToken("Malformed sync token.")
+    if micros < 0 or rank not in range(4):
+        raise InvalidToken("Malformed sync token.")
+    return EPOCH + timedelta(microseconds=micros), rank, pk
+
+
+# -----------------------------
+# Kaynaklar
+# -----------------------------
+def _after(field, rank, since):
+    """(field, rank, pk) > since koşulu; rank bu kaynak için sabit."""
+    if since is None:
+        return Q()
+    moment, since_rank, since_pk = since
+    if rank > since_rank:
+        return Q(**{f"{field}__gte": moment})
+    if rank < since_rank:
+        return Q(**{f"{field}__gt": moment})
+    return Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": since_pk})
+
+
+def _keys(qs, field, rank, since, until):
+    return (
+        qs.filter(_after(field, rank, since), **{f"{field}__lte": until})
+        .annotate(rank=Value(rank, output_field=IntegerField()), ts=F(field))
+        .order_by()
+        .values_list("ts", "rank", "pk")
+    )
+
+
+def lesson_requests_for(user):
+    if user.role == User.Role.STUDENT:
+        return LessonRequest.objects.filter(student_id=user.pk)
+    if user.role == User.Role.TUTOR:
+        return LessonRequest.objects.filter(tutor_id=user.pk)
+    return LessonRequest.objects.none()
+
+
+def tombstones_for(user):
+    visible = Q(kind__in=[Tombstone.Kind.SUBJECT, Tombstone.Kind.TUTOR])
+    if user.role == User.Role.STUDENT:
+        visible |= Q(kind=Tombstone.Kind.LESSON_REQUEST, student_id=user.pk)
+    elif user.role == User.Role.TUTOR:
+        visible |= Q(kind=Tombstone.Kind.LESSON_REQUEST, tutor_id=user.pk)
+    return Tombstone.objects.filter(visible)
+
+
+# -----------------------------
+# Feed
+# -----------------------------
+def build_feed(user, since, batch_size):
+    """
+    since: decode_token çıktısı (None = baştan).
+    {"token", "has_more", "subjects", "tutors", "lesson_requests", "deleted": {...}} döner.
+    """
+    now = timezone.now()
+    ttl = timedelta(seconds=settings.SYNC_TOMBSTONE_TTL)
+    if since is not None and since[0] < now - ttl:
+        raise TokenExpired()
+    until = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+    union = _keys(Subject.objects.all(), "updated_at", SUBJECT, since, until).union(
+        _keys(TutorProfile.objects.all(), "updated_at", TUTOR, since, until),
+        _keys(lesson_requests_for(user), "updated_at", LESSON_REQUEST, since, until),
+        _keys(tombstones_for(user), "deleted_at", DELETED, since, until),
+        all=True,
+    )
+    keys = list(union.order_by("ts", "rank", "pk")[:batch_size + 1])
+    has_more = len(keys) > batch_size
+    keys = keys[:batch_size]
+
+    ids = {rank: [] for rank in range(4)}
+    for _, rank, pk in keys:
+        ids[rank].append(pk)
+
+    feed = {
+        "token": encode_token(_as_key(keys[-1])) if keys else (encode_token(since) if since else None),
+        "has_more": has_more,
+        "subjects": _subjects(ids[SUBJECT]),
+        "tutors": _tutors(ids[TUTOR]),
+        "lesson_requests": _lesson_requests(ids[LESSON_REQUEST]),
+        "deleted": _deleted(ids[DELETED]),
+    }
+    prune_tombstones(now - ttl)
+    return feed
+
+
+def _as_key(row):
+    ts, rank, pk = row
+    if timezone.is_naive(ts):
+        # SQLite UNION sonucu dönüştürücüsüz gelebilir
+        ts = timezone.make_aware(ts, dt_timezone.utc)
+    return ts, rank, pk
+
+
+def _subjects(ids):
+    if not ids:
+        return []
+    return list(Subject.objects.filter(id__in=ids).order_by("id").values("id", "name"))
+
+
+def _tutors(profile_ids):
+    from .serializers import TutorMiniSerializer
+
+    if not profile_ids:
+        return []
+    users = (
+        User.objects.filter(tutorprofile__id__in=profile_ids)
+        .select_related("tutorprofile")
+        .prefetch_related("tutorprofile__subjects")
+        .order_by("id")
+    )
+    return TutorMiniSerializer().compiled_representation(users)
+
+
+def _lesson_requests(ids):
+    from .serializers import LessonRequestListSerializer
+
+    if not ids:
+        return []
+    qs = LessonRequest.objects.for_list().filter(id__in=ids).order_by("id")
+    return LessonRequestListSerializer().compiled_representation(qs)
+
+
+def _deleted(tombstone_ids):
+    deleted = {key: [] for key in TOMBSTONE_KEYS.values()}
+    if tombstone_ids:
+        for kind, object_id in Tombstone.objects.filter(id__in=tombstone_ids).values_list("kind", "object_id"):
+            deleted[TOMBSTONE_KEYS[kind]].append(object_id)
+    return deleted
+
+
+# -----------------------------
+# Tombstone yazma / budama
+# -----------------------------
+def record_deletion(kind, object_id, student_id=None, tutor_id=None):
+    Tombstone.objects.create(kind=kind, object_id=object_id, student_id=student_id, tutor_id=tutor_id)
+
+
+def prune_tombstones(before):
+    # Saatte en fazla bir kez (süreç başına değil, paylaşılan cache'te)
+    if cache.add(PRUNE_KEY, True, timeout=3600):
+        Tombstone.objects.filter(deleted_at__lt=before).delete()
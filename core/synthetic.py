@@ -0,0 +1,172 @@
+# core/synthetic.py
+"""
+Deterministik sentetik veri üreteci (yük testi / benchmark için).
+
+Aynı seed + aynı boyutlar -> aynı veri. Üretim bulk_create ile yapılır; sinyaller
+tetiklenmediği için türetilmiş yapılar (arama dokümanı, subject indeksi, TutorStats,
+response cache versiyonları) sonunda toplu olarak tazelenir.
+
+Dağılımlar:
+- Tutor başına ders sayısı: 1 + geometrik (çoğu 1-3, az sayıda 6+)
+- Ders popülerliği: Zipf benzeri (ilk subject'ler çok daha kalabalık)
+- Lesson request'ler: son `days` güne yayılmış created_at, 1-14 gün sonrası start_time,
+  eski kayıtlar ağırlıklı olarak approved/rejected, yeniler pending
+"""
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from . import recommendations, response_cache, search, tutor_stats
+from .models import Subject, TutorProfile, StudentProfile, LessonRequest
+from .subject_index import subject_index
+
+User = get_user_model()
+
+SYNTHETIC_PASSWORD = "Passw0rd!"
+
+FIRST_NAMES = ["Ayşe", "Mehmet", "Elif", "Can", "Zeynep", "Emre", "Selin", "Burak", "Deniz", "Ece",
+               "Ali", "Fatma", "Kerem", "Merve", "Oğuz", "Pınar", "Tolga", "Yasemin"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Öztürk", "Aydın", "Arslan", "Doğan",
+              "Kılıç", "Aslan", "Koç", "Kurt", "Özdemir"]
+SUBJECT_NAMES = ["Math", "Physics", "Chemistry", "Biology", "English", "History", "Geography",
+                 "Literature", "Music", "Art", "Programming", "Philosophy", "German", "French",
+                 "Economics", "Statistics"]
+BIO_WORDS = ["deneyimli", "sabırlı", "doktora", "yüksek", "lisans", "sınav", "hazırlık", "ODTÜ",
+             "Boğaziçi", "İTÜ", "online", "birebir", "grup", "ödev", "proje", "olimpiyat"]
+GRADES = ["9", "10", "11", "12", "Üniversite", ""]
+
+
+@dataclass
+class GeneratedData:
+    subjects: int
+    tutors: int
+    students: int
+    lessons: int
+    tutor_ids: list
+    student_ids: list
+    subject_ids: list
+
+
+def _subject_name(i):
+    base = SUBJECT_NAMES[i % len(SUBJECT_NAMES)]
+    return base if i < len(SUBJECT_NAMES) else f"{base} {i // len(SUBJECT_NAMES) + 1}"
+
+
+def generate(tutors=1000, students=5000, subjects=16, lessons=20000, seed=42, days=365,
+             anchor=None, batch_size=2000, stdout=None):
+    """`anchor` (varsayılan: şimdi) zaman dağılımının bittiği an; sabitlenirse çıktı da sabittir."""
+    rng = random.Random(seed)
+    now = (anchor or timezone.now()).replace(microsecond=0)
+    # Tek hash, sabit salt: deterministik ve hızlı (tüm hesapların parolası aynı)
+    password = make_password(SYNTHETIC_PASSWORD, salt="synthetic")
+
+    def log(msg):
+        if stdout is not None:
+            stdout.write(msg)
+
+    with transaction.atomic():
+        subject_objs = Subject.objects.bulk_create(
+            [Subject(name=_subject_name(i)) for i in range(subjects)], batch_size=batch_size
+        )
+        subject_ids = [s.id for s in subject_objs]
+        # Zipf benzeri popülerlik ağırlıkları
+        weights = [1 / (rank + 1) for rank in range(subjects)]
+        log(f"{subjects} subject")
+
+        tutor_ids = []
+        tutor_subjects = {}
+        through = TutorProfile.subjects.through
+        for offset in range(0, tutors, batch_size):
+            users = User.objects.bulk_create([
+                User(
+                    username=f"syn_tutor{i}", email=f"syn_tutor{i}@synthetic.local",
+                    first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                    role=User.Role.TUTOR, password=password,
+                )
+                for i in range(offset, min(offset + batch_size, tutors))
+            ])
+            profiles = TutorProfile.objects.bulk_create([
+                TutorProfile(
+                    user=u,
+                    bio=" ".join(rng.sample(BIO_WORDS, rng.randint(3, 8))),
+                    hourly_rate=rng.randrange(150, 1500, 50),
+                    rating=round(min(5.0, max(0.0, rng.gauss(4.2, 0.6))), 1),
+                )
+                for u in users
+            ])
+            links = []
+            for profile in profiles:
+                fan_out = 1
+                while fan_out < subjects and rng.random() < 0.45:
+                    fan_out += 1
+                chosen = set()
+                while len(chosen) < fan_out:
+                    chosen.add(rng.choices(subject_ids, weights=weights)[0])
+                tutor_subjects[profile.user_id] = sorted(chosen)
+                links.extend(through(tutorprofile_id=profile.id, subject_id=sid) for sid in sorted(chosen))
+            through.objects.bulk_create(links, batch_size=batch_size)
+            search.index_tutors([u.id for u in users])
+            tutor_ids.extend(u.id for u in users)
+        log(f"{tutors} tutor")
+
+        student_ids = []
+        for offset in range(0, students, batch_size):
+            users = User.objects.bulk_create([
+                User(
+                    username=f"syn_student{i}", email=f"syn_student{i}@synthetic.local",
+                    first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                    role=User.Role.STUDENT, password=password,
+                )
+                for i in range(offset, min(offset + batch_size, students))
+            ])
+            StudentProfile.objects.bulk_create(
+                [StudentProfile(user=u, grade_level=rng.choice(GRADES)) for u in users]
+            )
+            student_ids.extend(u.id for u in users)
+        log(f"{students} student")
+
+        for offset in range(0, lessons, batch_size):
+            objs = []
+            for _ in range(min(batch_size, lessons - offset)):
+                tutor_id = rng.choice(tutor_ids)
+                age = timedelta(seconds=rng.randint(0, days * 86400))
+                created = now - age
+                if age > timedelta(days=14):
+                    status = rng.choices(
+                        [LessonRequest.Status.APPROVED, LessonRequest.Status.REJECTED,
+                         LessonRequest.Status.PENDING], weights=[70, 25, 5])[0]
+                else:
+                    status = rng.choices(
+                        [LessonRequest.Status.PENDING, LessonRequest.Status.APPROVED,
+                         LessonRequest.Status.REJECTED], weights=[60, 30, 10])[0]
+                lr = LessonRequest(
+                    student_id=rng.choice(student_ids), tutor_id=tutor_id,
+                    subject_id=rng.choice(tutor_subjects[tutor_id]),
+                    start_time=created + timedelta(days=rng.randint(1, 14), hours=rng.randint(8, 20)),
+                    duration_minutes=rng.choice([30, 45, 60, 60, 90, 120]),
+                    status=status, note="",
+                )
+                lr.synthetic_created_at = created
+                objs.append(lr)
+            LessonRequest.objects.bulk_create(objs)
+            # auto_now_add her zaman "şimdi" yazar; dağıtılmış created_at'i geri koy
+            for lr in objs:
+                lr.created_at = lr.synthetic_created_at
+                if lr.status != LessonRequest.Status.PENDING:
+                    lr.responded_at = min(lr.created_at + timedelta(minutes=rng.randint(5, 4320)), now)
+            LessonRequest.objects.bulk_update(objs, ["created_at", "responded_at"])
+        log(f"{lessons} lesson request")
+        tutor_stats.rebuild(batch_size=batch_size)
+
+    subject_index.invalidate()
+    recommendations.snapshot.invalidate()
+    response_cache.bump_on_commit("subjects", "tutors")
+    return GeneratedData(
+        subjects=subjects, tutors=tutors, students=students, lessons=lessons,
+        tutor_ids=tutor_ids, student_ids=student_ids, subject_ids=subject_ids,
+    )
@@ -1,11 +1,22 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from .models import Subject, TutorProfile, StudentProfile, LessonRequest
+from . import notifications
 
 User = get_user_model()
 
@@ -41,9 +52,10 @@ class AuthAndLessonFlowTests(APITestCase):
         url = "/api/auth/login"
         payload = {"email": email, "password": password}
         res = self.client.post(url, payload, format="json")
-        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=getattr(res, "data", res.content))
-        self.assertIn("access", res.data)
-        return res.data["access"]
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        # Giriş async view (core/async_views.py): DRF Response değil, düz JSON
+        self.assertIn("access", res.json())
+        return res.json()["access"]
 
     def ensure_subject_id(self) -> int:
         """
@@ -143,3 +155,1817 @@ class AuthAndLessonFlowTests(APITestCase):
         # Student approve etmeye çalışır -> 403 beklenir
         res_approve = self.client.patch(f"/api/lesson-requests/{lr_id}/", {"status": "approved"}, format="json")
         self.assertEqual(res_approve.status_code, status.HTTP_403_FORBIDDEN, msg=getattr(res_approve, "data", res_approve.content))
+
+
+class LessonRequestPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            email="pg-student@example.com", username="pg-student", password="testpass123", role="student"
+        )
+        self.tutor = User.objects.create_user(
+            email="pg-tutor@example.com", username="pg-tutor", password="testpass123", role="tutor"
+        )
+        subject = Subject.objects.create(name="Chemistry")
+        start = timezone.now() + timezone.timedelta(days=1)
+        LessonRequest.objects.bulk_create([
+            LessonRequest(student=self.student, tutor=self.tutor, subject=subject,
+                          start_time=start, duration_minutes=30)
+            for _ in range(25)
+        ])
+        self.client.force_authenticate(self.student)
+
+    def test_cursor_pages_cover_all_rows_without_count(self):
+        seen = []
+        url = "/api/lesson-requests/?limit=10"
+        pages = 0
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            seen.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+            pages += 1
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_cursor_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/lesson-requests/?limit=10").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual(
+            [i["id"] for i in back["results"]],
+            [i["id"] for i in first["results"]],
+        )
+
+    def test_invalid_cursor_is_404(self):
+        res = self.client.get("/api/lesson-requests/?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_offset_flag_keeps_legacy_shape(self):
+        res = self.client.get("/api/lesson-requests/?pagination=offset&limit=10&offset=20")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 25)
+        self.assertEqual(len(res.data["results"]), 5)
+
+
+class TutorSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.ayse = User.objects.create_user(
+            email="ayse@example.com", username="ayse", password="testpass123",
+            role="tutor", first_name="Ayşe", last_name="Demir",
+        )
+        TutorProfile.objects.create(user=self.ayse, bio="ODTÜ fizik doktora", rating=4.0)
+        self.mehmet = User.objects.create_user(
+            email="mehmet@example.com", username="mehmet", password="testpass123",
+            role="tutor", first_name="Mehmet", last_name="Kaya",
+        )
+        TutorProfile.objects.create(user=self.mehmet, bio="Matematik ve fizik, fizik sınav hazırlık", rating=4.9)
+
+    def search_ids(self, q, **params):
+        res = self.client.get("/api/tutors/", {"search": q, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [t["id"] for t in res.data["results"]]
+
+    def test_prefix_and_accent_insensitive_match(self):
+        self.assertEqual(self.search_ids("ays"), [self.ayse.id])
+        self.assertEqual(self.search_ids("AYŞE dem"), [self.ayse.id])
+        self.assertEqual(self.search_ids("odtu"), [self.ayse.id])
+        self.assertEqual(self.search_ids("mehmet@example"), [self.mehmet.id])
+        self.assertEqual(self.search_ids("yok-boyle-biri"), [])
+
+    def test_document_follows_profile_updates(self):
+        tp = self.ayse.tutorprofile
+        tp.bio = "Kimya"
+        tp.save()
+        self.assertEqual(self.search_ids("doktora"), [])
+        self.assertEqual(self.search_ids("kimya"), [self.ayse.id])
+
+        self.mehmet.last_name = "Yıldız"
+        self.mehmet.save()
+        self.assertEqual(self.search_ids("yildiz"), [self.mehmet.id])
+
+    def test_relevance_ordering_and_explicit_ordering(self):
+        # "fizik" Mehmet'in bio'sunda iki kez geçiyor
+        self.assertEqual(set(self.search_ids("fizik")), {self.ayse.id, self.mehmet.id})
+        self.assertEqual(self.search_ids("fizik", ordering="rating"), [self.ayse.id, self.mehmet.id])
+
+    def test_query_without_tokens_is_unfiltered(self):
+        # Normalize edilince boş kalan sorgu: filtre yok, sıra rating (500 değil)
+        for q in ("@", "-", " ?! "):
+            self.assertEqual(self.search_ids(q), [self.mehmet.id, self.ayse.id])
+
+
+class TutorSubjectFilterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.math = Subject.objects.create(name="Math")
+        self.physics = Subject.objects.create(name="Physics")
+        self.tutors = []
+        for i, subjects in enumerate([[self.math], [self.physics], [self.math, self.physics], []]):
+            user = User.objects.create_user(
+                email=f"sf{i}@example.com", username=f"sf{i}", password="testpass123", role="tutor"
+            )
+            tp = TutorProfile.objects.create(user=user, rating=i)
+            tp.subjects.set(subjects)
+            self.tutors.append(user)
+
+    def ids(self, **params):
+        res = self.client.get("/api/tutors/", {"ordering": "id", **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [t["id"] for t in res.data["results"]]
+
+    def test_any_and_all_modes(self):
+        t0, t1, t2, _ = self.tutors
+        self.assertEqual(self.ids(subject=self.math.id), [t0.id, t2.id])
+        self.assertEqual(self.ids(subject=f"{self.math.id},{self.physics.id}"), [t0.id, t1.id, t2.id])
+        self.assertEqual(
+            self.ids(subject=f"{self.math.id},{self.physics.id}", subject_mode="all"), [t2.id]
+        )
+
+    def test_no_distinct_or_m2m_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.ids(subject=self.math.id)
+        main = [q["sql"] for q in ctx.captured_queries if '"core_user"' in q["sql"] and "COUNT" not in q["sql"]]
+        self.assertTrue(main)
+        self.assertNotIn("DISTINCT", main[0])
+        self.assertNotIn("core_tutorprofile_subjects", main[0])
+
+    def test_index_follows_m2m_changes(self):
+        t0, t1, t2, t3 = self.tutors
+        self.ids(subject=self.math.id)  # indeksi kur
+        with self.captureOnCommitCallbacks(execute=True):
+            t3.tutorprofile.subjects.add(self.math)
+            t0.tutorprofile.subjects.remove(self.math)
+            t2.tutorprofile.subjects.clear()
+        self.assertEqual(self.ids(subject=self.math.id), [t3.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math.tutors.add(t1.tutorprofile)
+        self.assertEqual(self.ids(subject=self.math.id), [t1.id, t3.id])
+
+    def test_index_ignores_uncommitted_and_rolled_back_links(self):
+        from django.db import transaction
+        from .subject_index import subject_index
+
+        t0, _, t2, t3 = self.tutors
+        self.ids(subject=self.math.id)  # indeksi kur
+        with self.captureOnCommitCallbacks(execute=True):
+            t3.tutorprofile.subjects.add(self.math)
+            # Commit edilmemiş bağ aynı süreçteki okumalara görünmez
+            self.assertEqual(subject_index.tutor_ids([self.math.id]), [t0.id, t2.id])
+            try:
+                with transaction.atomic():
+                    t0.tutorprofile.subjects.remove(self.math)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(subject_index.tutor_ids([self.math.id]), [t0.id, t2.id, t3.id])
+
+    def test_invalid_subject_is_400(self):
+        res = self.client.get("/api/tutors/", {"subject": "abc"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PublicResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.subject = Subject.objects.create(name="Biology")
+        self.tutor = User.objects.create_user(
+            email="rc@example.com", username="rc", password="testpass123", role="tutor"
+        )
+        self.tp = TutorProfile.objects.create(user=self.tutor, hourly_rate=300)
+        self.tp.subjects.add(self.subject)
+
+    def test_second_hit_served_from_cache_with_etag(self):
+        first = self.client.get("/api/tutors/", {"subject": self.subject.id})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", first)
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/tutors/", {"subject": f" {self.subject.id}"})
+        self.assertEqual(second.data, first.data)
+
+        not_modified = self.client.get(
+            "/api/tutors/", {"subject": self.subject.id}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_profile_change_invalidates_list_and_detail(self):
+        self.client.get("/api/tutors/")
+        detail = self.client.get(f"/api/tutors/{self.tutor.id}/")
+        self.assertEqual(detail.data["hourly_rate"], 300)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tp.hourly_rate = 450
+            self.tp.save()
+
+        self.assertEqual(self.client.get(f"/api/tutors/{self.tutor.id}/").data["hourly_rate"], 450)
+        self.assertEqual(self.client.get("/api/tutors/").data["results"][0]["hourly_rate"], 450)
+
+    def test_subject_rename_invalidates_subject_and_tutor_responses(self):
+        etag = self.client.get("/api/subjects/")["ETag"]
+        self.client.get(f"/api/tutors/{self.tutor.id}/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subject.name = "Molecular Biology"
+            self.subject.save()
+
+        res = self.client.get("/api/subjects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        detail = self.client.get(f"/api/tutors/{self.tutor.id}/").data
+        self.assertEqual(detail["subjects"], [{"id": self.subject.id, "name": "Molecular Biology"}])
+
+
+class CompiledSerializerTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        math = Subject.objects.create(name="Math")
+        art = Subject.objects.create(name="Art")
+        self.student = User.objects.create_user(
+            email="cs-student@example.com", username="cs-student", password="testpass123", role="student"
+        )
+        for i, (first, last) in enumerate([("Ayşe", "Demir"), ("", "")]):
+            tutor = User.objects.create_user(
+                email=f"cs{i}@example.com", username=f"cs{i}", password="testpass123",
+                role="tutor", first_name=first, last_name=last,
+            )
+            tp = TutorProfile.objects.create(user=tutor, bio="Bio \u00e7", hourly_rate=250, rating="4.5")
+            tp.subjects.set([math, art][: i + 1])
+            LessonRequest.objects.create(
+                student=self.student, tutor=tutor, subject=math,
+                start_time=timezone.now() + timezone.timedelta(days=i), duration_minutes=45, note="n",
+            )
+
+    def fetch(self, url, compiled):
+        cache.clear()
+        with override_settings(COMPILED_READ_SERIALIZERS=compiled):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.content
+
+    def test_tutor_list_is_byte_identical(self):
+        self.assertEqual(self.fetch("/api/tutors/", False), self.fetch("/api/tutors/", True))
+
+    def test_lesson_request_list_is_byte_identical(self):
+        self.client.force_authenticate(self.student)
+        self.assertEqual(
+            self.fetch("/api/lesson-requests/", False), self.fetch("/api/lesson-requests/", True)
+        )
+
+
+class TutorAvailabilityTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            email="av-student@example.com", username="av-student", password="testpass123", role="student"
+        )
+        self.tutor = User.objects.create_user(
+            email="av-tutor@example.com", username="av-tutor", password="testpass123", role="tutor"
+        )
+        TutorProfile.objects.create(user=self.tutor)
+        self.subject = Subject.objects.create(name="History")
+        self.base = (timezone.now() + timezone.timedelta(days=3)).replace(
+            hour=10, minute=0, second=0, microsecond=0
+        )
+
+    def lesson(self, offset_minutes, duration, status_value="approved"):
+        return LessonRequest.objects.create(
+            student=self.student, tutor=self.tutor, subject=self.subject,
+            start_time=self.base + timezone.timedelta(minutes=offset_minutes),
+            duration_minutes=duration, status=status_value,
+        )
+
+    def test_end_time_is_stored(self):
+        lr = self.lesson(0, 90)
+        self.assertEqual(lr.end_time, self.base + timezone.timedelta(minutes=90))
+
+    def test_create_overlapping_approved_lesson_is_rejected(self):
+        self.lesson(0, 60)
+        self.client.force_authenticate(self.student)
+        payload = {
+            "tutor_id": self.tutor.id, "subject_id": self.subject.id, "duration_minutes": 30,
+            "start_time": (self.base + timezone.timedelta(minutes=45)).isoformat(),
+        }
+        res = self.client.post("/api/lesson-requests/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("start_time", res.data)
+
+        payload["start_time"] = (self.base + timezone.timedelta(minutes=60)).isoformat()
+        res = self.client.post("/api/lesson-requests/", payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, msg=res.data)
+
+    def test_approving_a_conflicting_request_is_rejected(self):
+        self.lesson(0, 60)
+        pending = self.lesson(30, 60, status_value="pending")
+        self.client.force_authenticate(self.tutor)
+        res = self.client.patch(f"/api/lesson-requests/{pending.id}/", {"status": "approved"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.patch(f"/api/lesson-requests/{pending.id}/status/", {"status": "approved"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.patch(f"/api/lesson-requests/{pending.id}/status/", {"status": "rejected"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_availability_merges_busy_intervals(self):
+        self.lesson(0, 60)
+        self.lesson(30, 60)
+        self.lesson(180, 30)
+        self.lesson(300, 30, status_value="pending")
+        window_end = self.base + timezone.timedelta(hours=8)
+        res = self.client.get(
+            f"/api/tutors/{self.tutor.id}/availability/",
+            {"from": self.base.isoformat(), "to": window_end.isoformat()},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["busy"]), 2)
+        self.assertEqual(len(res.data["free"]), 2)
+        self.assertEqual(res.data["free"][0]["start"], res.data["busy"][0]["end"])
+
+    def test_availability_rejects_invalid_window(self):
+        url = f"/api/tutors/{self.tutor.id}/availability/"
+        for value in ("yesterday", "2026-13-01T00:00:00", "2026-02-30T10:00:00"):
+            res = self.client.get(url, {"from": value})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, msg=value)
+            self.assertIn("from", res.data)
+
+    def test_availability_unknown_tutor_is_404(self):
+        for tutor_id in ("abc", self.student.id):
+            res = self.client.get(f"/api/tutors/{tutor_id}/availability/")
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND, msg=tutor_id)
+
+
+class LessonRequestBulkStatusTests(APITestCase):
+    url = "/api/lesson-requests/bulk-status/"
+
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            email="bs-student@example.com", username="bs-student", password="testpass123", role="student"
+        )
+        self.tutor = User.objects.create_user(
+            email="bs-tutor@example.com", username="bs-tutor", password="testpass123", role="tutor"
+        )
+        self.other_tutor = User.objects.create_user(
+            email="bs-other@example.com", username="bs-other", password="testpass123", role="tutor"
+        )
+        self.subject = Subject.objects.create(name="Music")
+        self.base = timezone.now() + timezone.timedelta(days=5)
+
+    def make(self, n, tutor=None, spacing=120, offset=0):
+        return LessonRequest.objects.bulk_create([
+            LessonRequest(
+                student=self.student, tutor=tutor or self.tutor, subject=self.subject,
+                start_time=self.base + timezone.timedelta(minutes=offset + i * spacing), duration_minutes=60,
+            )
+            for i in range(n)
+        ])
+
+    def post(self, items):
+        return self.client.post(self.url, {"items": items}, format="json")
+
+    def test_constant_query_count(self):
+        self.client.force_authenticate(self.tutor)
+        small = self.make(3)
+        # make() bulk_create ile sinyalsiz: TutorStats satırını kur (sabit durum)
+        call_command("rebuild_tutor_stats", stdout=io.StringIO())
+        with CaptureQueriesContext(connection) as few:
+            res = self.post([{"id": lr.id, "status": "approved"} for lr in small])
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.data)
+        many = self.make(60, offset=10_000)
+        with CaptureQueriesContext(connection) as lots:
+            res = self.post([{"id": lr.id, "status": "approved"} for lr in many])
+        self.assertTrue(all(r["ok"] for r in res.data["results"]))
+        self.assertEqual(len(few), len(lots))
+        self.assertEqual(
+            LessonRequest.objects.filter(tutor=self.tutor, status="approved").count(), 63
+        )
+
+    def test_approvals_lock_tutor_row_first(self):
+        lessons = self.make(2)
+        self.client.force_authenticate(self.tutor)
+
+        def locks_tutor_first(items):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.post(items).status_code, status.HTTP_200_OK)
+            sql = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+            return 'FROM "core_user"' in sql[0] and 'FROM "core_lessonrequest"' in sql[1]
+
+        # Tekil onayla aynı kilit sırası: tutor satırı, sonra talepler
+        self.assertTrue(locks_tutor_first([{"id": lessons[0].id, "status": "approved"}]))
+        self.assertFalse(locks_tutor_first([{"id": lessons[1].id, "status": "rejected"}]))
+
+    def test_only_related_tutor_rows_change(self):
+        mine = self.make(1)[0]
+        theirs = self.make(1, tutor=self.other_tutor)[0]
+        self.client.force_authenticate(self.tutor)
+        res = self.post([{"id": mine.id, "status": "rejected"}, {"id": theirs.id, "status": "rejected"}])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"],
+            [{"id": mine.id, "ok": True, "status": "rejected"},
+             {"id": theirs.id, "ok": False, "error": "Not found."}],
+        )
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.status, "pending")
+
+        self.client.force_authenticate(self.student)
+        res = self.post([{"id": mine.id, "status": "approved"}])
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_conflicts_inside_the_batch_are_reported(self):
+        first, overlapping = self.make(2, spacing=30)
+        self.client.force_authenticate(self.tutor)
+        res = self.post([{"id": first.id, "status": "approved"}, {"id": overlapping.id, "status": "approved"}])
+        results = res.data["results"]
+        self.assertTrue(results[0]["ok"])
+        self.assertFalse(results[1]["ok"])
+
+        # Onaylıyı reddedip diğerini aynı istekte onaylamak serbest
+        res = self.post([{"id": overlapping.id, "status": "approved"}, {"id": first.id, "status": "rejected"}])
+        self.assertTrue(all(r["ok"] for r in res.data["results"]))
+
+    def test_duplicate_ids_are_rejected(self):
+        lr = self.make(1)[0]
+        self.client.force_authenticate(self.tutor)
+        res = self.post([{"id": lr.id, "status": "approved"}, {"id": lr.id, "status": "rejected"}])
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImportDataCommandTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        return path
+
+    def run_import(self, *args, **opts):
+        out = io.StringIO()
+        call_command("import_data", *args, stdout=out, **opts)
+        return out.getvalue()
+
+    def test_tutors_students_and_lessons_with_resume(self):
+        tutors = self.write("tutors.jsonl", "\n".join(json.dumps(row) for row in [
+            {"email": "IMP1@example.com", "username": "imp1", "first_name": "Deniz", "password": "pw-123456",
+             "bio": "Fizik", "hourly_rate": 300, "rating": "4.5", "subjects": ["Physics", "Math"]},
+            {"email": "imp2@example.com", "username": "imp2", "bio": "Edebiyat", "subjects": ["Literature"]},
+        ]))
+        students = self.write(
+            "students.csv", "email,username,grade_level\nimps@example.com,imps,10\n"
+        )
+        self.run_import("tutors", tutors, workers=2, chunk_size=1)
+        self.run_import("students", students, workers=0)
+
+        tutor = User.objects.get(email="imp1@example.com")
+        self.assertTrue(tutor.check_password("pw-123456"))
+        self.assertEqual(
+            sorted(tutor.tutorprofile.subjects.values_list("name", flat=True)), ["Math", "Physics"]
+        )
+        self.assertEqual(Subject.objects.count(), 3)
+        res = self.client.get("/api/tutors/", {"search": "deniz"})
+        self.assertEqual([t["id"] for t in res.data["results"]], [tutor.id])
+
+        header = "student_email,tutor_email,subject,start_time,duration_minutes,status,created_at\n"
+        good = "imps@example.com,imp1@example.com,Physics,2024-01-0{d}T10:00:00Z,60,approved,2023-12-01T09:00:00Z\n"
+        bad = "imps@example.com,nobody@example.com,Physics,2024-01-09T10:00:00Z,60,approved,\n"
+        lessons = self.write("lessons.csv", header + good.format(d=1) + good.format(d=2) + bad)
+        with self.assertRaises(CommandError):
+            self.run_import("lessons", lessons, chunk_size=2)
+        self.assertEqual(LessonRequest.objects.count(), 2)
+
+        self.write("lessons.csv", header + good.format(d=1) + good.format(d=2) + good.format(d=3))
+        self.run_import("lessons", lessons, chunk_size=2, resume=True)
+        self.assertEqual(LessonRequest.objects.count(), 3)
+        lr = LessonRequest.objects.order_by("id").first()
+        self.assertEqual(lr.created_at.year, 2023)
+        self.assertEqual(lr.end_time - lr.start_time, timezone.timedelta(minutes=60))
+        self.assertFalse(os.path.exists(lessons + ".import-state.json"))
+
+    def test_lessons_keep_subject_per_row(self):
+        tutors = self.write("tutors.jsonl", json.dumps({"email": "ims@example.com", "username": "ims"}))
+        students = self.write("students.csv", "email,username\nimss@example.com,imss\n")
+        self.run_import("tutors", tutors, workers=0)
+        self.run_import("students", students, workers=0)
+
+        header = "student_email,tutor_email,subject,start_time,duration_minutes\n"
+        row = "imss@example.com,ims@example.com,{s},2024-01-0{d}T10:00:00Z,60\n"
+        lessons = self.write("lessons.csv", header + row.format(s="Art", d=1) + row.format(s="", d=2)
+                             + row.format(s="Music", d=3))
+        with self.assertRaisesMessage(CommandError, "Satır 2: subject boş"):
+            self.run_import("lessons", lessons, chunk_size=3)
+        self.assertFalse(LessonRequest.objects.exists())
+
+        self.write("lessons.csv", header + row.format(s="Art", d=1) + row.format(s="Music", d=2)
+                   + row.format(s="Art", d=3))
+        self.run_import("lessons", lessons, chunk_size=3)
+        self.assertEqual(
+            list(LessonRequest.objects.order_by("start_time").values_list("subject__name", flat=True)),
+            ["Art", "Music", "Art"],
+        )
+
+
+    def test_usernames_default_to_unique_values(self):
+        User.objects.create_user(email="ali@old.com", username="ali", password="pw-123456", role="student")
+        students = self.write("students.csv", "email,username\njohn@a.com,\njohn@b.com,\nali@new.com,\n")
+        self.run_import("students", students, workers=0)
+        self.run_import("students", students, workers=0)  # tekrar: aynı adlar, yeni satır yok
+        self.assertEqual(
+            dict(User.objects.filter(email__in=["john@a.com", "john@b.com", "ali@new.com"])
+                 .values_list("email", "username")),
+            {"john@a.com": "john", "john@b.com": "john@b.com", "ali@new.com": "ali@new.com"},
+        )
+        self.assertEqual(StudentProfile.objects.filter(user__email__startswith="john@").count(), 2)
+
+        taken = self.write("taken.csv", "email,username\nok@example.com,ok\nmallory@example.com,ali\n")
+        with self.assertRaisesMessage(CommandError, "username çakışması: satır 2 (mallory@example.com)"):
+            self.run_import("students", taken, workers=0)
+        self.assertFalse(User.objects.filter(email="ok@example.com").exists())
+
+class SyntheticDataTests(TestCase):
+    def test_generate_is_deterministic_and_consistent(self):
+        from datetime import datetime, timezone as dt_timezone
+        from . import benchmarking, synthetic
+
+        anchor = datetime(2024, 6, 1, tzinfo=dt_timezone.utc)
+        data = synthetic.generate(tutors=20, students=30, subjects=5, lessons=200, seed=7, anchor=anchor)
+        self.assertEqual((data.tutors, data.students, data.lessons), (20, 30, 200))
+        self.assertEqual(LessonRequest.objects.count(), 200)
+        snapshot = list(LessonRequest.objects.order_by("id").values_list(
+            "student__username", "tutor__username", "subject__name", "start_time", "status", "created_at",
+        ))
+        # Ders her zaman eğitmenin verdiği derslerden biri; created_at pencereye yayılmış
+        for lr in LessonRequest.objects.select_related("tutor__tutorprofile"):
+            self.assertIn(lr.subject_id, lr.tutor.tutorprofile.subjects.values_list("id", flat=True))
+        self.assertLess(min(row[5] for row in snapshot), anchor - timezone.timedelta(days=30))
+        tutor = User.objects.get(id=data.tutor_ids[0])
+        self.assertTrue(tutor.check_password(synthetic.SYNTHETIC_PASSWORD))
+
+        LessonRequest.objects.all().delete()
+        TutorProfile.objects.all().delete()
+        StudentProfile.objects.all().delete()
+        User.objects.all().delete()
+        Subject.objects.all().delete()
+        synthetic.generate(tutors=20, students=30, subjects=5, lessons=200, seed=7, anchor=anchor)
+        self.assertEqual(snapshot, list(LessonRequest.objects.order_by("id").values_list(
+            "student__username", "tutor__username", "subject__name", "start_time", "status", "created_at",
+        )))
+
+        summary = benchmarking.percentile_summary([float(i) for i in range(1, 101)])
+        self.assertAlmostEqual(summary["p50"], 50.5)
+        rows = benchmarking.compare_baseline(
+            {"results": {"x": {"latency_ms": {"p95": 10.0}, "queries": 2}}},
+            {"x": {"latency_ms": {"p95": 11.0}, "queries": 3}},
+        )
+        self.assertEqual({(r[1], r[5]) for r in rows}, {("latency_ms.p95", False), ("queries", True)})
+
+
+class RequestInstrumentationTests(APITestCase):
+    def setUp(self):
+        self.tutor = User.objects.create_user(
+            email="it@example.com", username="it", password="pw-123456", role="tutor"
+        )
+        TutorProfile.objects.get_or_create(user=self.tutor)
+        self.tutor.tutorprofile.subjects.add(Subject.objects.create(name="Physics"))
+        from rest_framework_simplejwt.tokens import AccessToken
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.tutor)}")
+
+    def test_metrics_are_recorded_and_exposed(self):
+        from .instrumentation import record_requests
+
+        with record_requests() as recorded:
+            res = self.client.get("/api/me")
+            self.client.patch("/api/me", {"bio": "yeni"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('desc="3 queries"', res["Server-Timing"])
+        self.assertIn("serializer;dur=", res["Server-Timing"])
+        metrics = res.metrics
+        self.assertEqual((metrics.view, metrics.action, metrics.budget), ("MeView", "get", 3))
+        self.assertEqual(metrics.queries, 3)
+        self.assertEqual(metrics.response_bytes, len(res.content))
+        self.assertGreater(metrics.serializer_ms, 0)
+        self.assertEqual([m.action for m in recorded], ["get", "patch"])
+        self.assertLessEqual(recorded[1].queries, recorded[1].budget)
+
+    def test_budget_overrun_fails_in_strict_mode_and_warns_otherwise(self):
+        from unittest import mock
+        from .instrumentation import QueryBudgetExceeded
+        from .views import MeView
+
+        with mock.patch.object(MeView, "query_budget", {"get": 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get("/api/me")
+            with override_settings(QUERY_BUDGET_STRICT=False), \
+                    self.assertLogs("core.requests", level="WARNING") as logs:
+                res = self.client.get("/api/me")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        line = json.loads(logs.records[0].args[0])
+        self.assertEqual((line["view"], line["queries"], line["query_budget"]), ("MeView", 3, 1))
+
+
+class LessonRequestThrottleTests(APITestCase):
+    def setUp(self):
+        from .throttling import LessonRequestThrottle
+        self.throttle_cls = LessonRequestThrottle
+        self.student = User.objects.create_user(
+            email="thr@example.com", username="thr", password="pw-123456", role="student"
+        )
+
+    def hit(self, throttle_now, method="POST", action="create"):
+        from unittest import mock
+        from rest_framework.test import APIRequestFactory
+        from rest_framework.request import Request
+
+        request = Request(getattr(APIRequestFactory(), method.lower())("/api/lesson-requests/"))
+        request.user = self.student
+        view = mock.Mock(action=action)
+        throttle = self.throttle_cls()
+        throttle.timer = lambda: throttle_now
+        return throttle.allow_request(request, view), throttle
+
+    def test_gcra_limit_and_retry_after_in_shared_table(self):
+        from .models import ThrottleBucket
+
+        # 5/hour: art arda 5 istek, sonra her 720 saniyede bir
+        self.assertTrue(all(self.hit(1000.0)[0] for _ in range(5)))
+        allowed, throttle = self.hit(1000.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 720.0)
+        allowed, throttle = self.hit(1500.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 220.0)
+        self.assertTrue(self.hit(1720.0)[0])
+        self.assertFalse(self.hit(1720.0)[0])
+        # GET / create dışı istekler sayılmaz; durum tek satırda
+        self.assertTrue(self.hit(1720.0, method="GET", action="list")[0])
+        self.assertEqual(ThrottleBucket.objects.count(), 1)
+
+    def test_throttled_create_returns_retry_after(self):
+        from .throttling import get_store
+
+        key = self.throttle_cls.cache_format % {"scope": "lesson_request", "ident": self.student.pk}
+        now = timezone.now().timestamp()
+        for _ in range(5):
+            get_store().hit(key, 720.0, 3600.0, now)
+        self.client.force_authenticate(self.student)
+        res = self.client.post("/api/lesson-requests/", {}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(700 <= int(res["Retry-After"]) <= 720)
+
+
+class AsyncReadPathTests(APITestCase):
+    def setUp(self):
+        self.math = Subject.objects.create(name="Math")
+        self.physics = Subject.objects.create(name="Physics")
+        for i, (rate, subjects) in enumerate([(300, [self.math]), (500, [self.math, self.physics]), (400, [])]):
+            user = User.objects.create_user(
+                email=f"at{i}@example.com", username=f"at{i}", password="pw-123456", role="tutor",
+                first_name=f"Ad{i}",
+            )
+            profile, _ = TutorProfile.objects.get_or_create(user=user)
+            profile.hourly_rate = rate
+            profile.bio = f"deneyimli eğitmen {i}"
+            profile.save()
+            profile.subjects.set(subjects)
+        self.tutor_ids = list(User.objects.filter(role="tutor").order_by("id").values_list("id", flat=True))
+
+    def test_responses_match_sync_endpoints(self):
+        paths = [
+            "/api/tutors/",
+            "/api/tutors/?limit=1&offset=1&ordering=hourly_rate",
+            f"/api/tutors/?subject={self.math.id},{self.physics.id}&subject_mode=all",
+            "/api/tutors/?search=deneyimli",
+            f"/api/tutors/{self.tutor_ids[1]}/",
+            "/api/tutors/999999/",
+            "/api/tutors/?subject=abc",
+            f"/api/subjects/{self.physics.id}/",
+            "/api/subjects/999999/",
+        ]
+        for path in paths:
+            sync_res = self.client.get(path)
+            async_res = self.client.get(path.replace("/api/", "/api/async/", 1))
+            self.assertEqual(async_res.status_code, sync_res.status_code, path)
+            # Sayfa linkleri kendi yollarını gösterir; gerisi birebir aynı
+            async_body = async_res.content.decode().replace("/api/async/", "/api/")
+            self.assertEqual(json.loads(async_body), json.loads(sync_res.content), path)
+
+        sync_res = self.client.get("/api/subjects/?limit=1")
+        async_res = self.client.get("/api/async/subjects/?limit=1")
+        self.assertEqual(async_res.json()["results"], sync_res.json()["results"])
+        self.assertEqual(async_res.json()["next"], "http://testserver/api/async/subjects/?limit=1&offset=1")
+
+    def test_async_orm_queries_are_measured(self):
+        res = self.client.get("/api/async/tutors/")
+        self.assertEqual(res.metrics.view, "tutor_list")
+        # count + sayfa + subjects prefetch
+        self.assertEqual(res.metrics.queries, 3)
+        self.assertEqual(self.client.post("/api/async/tutors/").status_code, 405)
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            email="claims@example.com", username="claims", password="pw-123456", role="student",
+            first_name="Ada",
+        )
+        StudentProfile.objects.get_or_create(user=self.user)
+
+    def login(self):
+        res = self.client.post("/api/auth/login", {"email": "claims@example.com", "password": "pw-123456"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.json()["access"]
+
+    def get(self, path, token):
+        return self.client.get(path, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_claims_token_skips_user_lookup(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = self.login()
+        claims = AccessToken(token)
+        self.assertEqual((claims["role"], claims["pv"]), ("student", 0))
+        self.get("/api/lesson-requests/", token)  # deny-list ısınsın
+
+        with CaptureQueriesContext(connection) as with_claims:
+            self.assertEqual(self.get("/api/lesson-requests/", token).status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as legacy:
+            self.get("/api/lesson-requests/", str(AccessToken.for_user(self.user)))
+        self.assertEqual(len(with_claims), len(legacy) - 1)
+        self.assertFalse(any('FROM "core_user"' in q["sql"] for q in with_claims.captured_queries))
+
+    def test_deferred_fields_come_from_cache(self):
+        user = User.from_claims(self.user.id, "student", 0)
+        with self.assertNumQueries(1):
+            self.assertEqual((user.email, user.first_name), ("claims@example.com", "Ada"))
+        with self.assertNumQueries(0):
+            self.assertEqual(User.from_claims(self.user.id, "student", 0).username, "claims")
+
+    def test_role_change_and_deactivation_are_honored(self):
+        token = self.login()
+        self.get("/api/me", token)
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(id=self.user.id)
+            user.role = "tutor"
+            user.save()
+        self.assertEqual(user.profile_version, 1)
+        # Token hâlâ role=student diyor; güncel satır kullanılmalı
+        res = self.client.post(
+            "/api/lesson-requests/bulk-status/", {"items": []}, format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertNotEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save(update_fields=["is_active"])
+        self.assertEqual(self.get("/api/me", token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        token = self.login()
+        self.assertEqual(self.get("/api/me", token).status_code, status.HTTP_200_OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(id=self.user.id).delete()
+        self.assertEqual(self.get("/api/me", token).status_code, status.HTTP_401_UNAUTHORIZED)
+        # Silme DB'de: cache'i boş başka bir worker da reddeder
+        cache.clear()
+        self.assertEqual(self.get("/api/me", token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_schema_documents_bearer_auth(self):
+        schema = self.client.get("/api/schema/", {"format": "json"}).json()
+        self.assertEqual(schema["components"]["securitySchemes"]["jwtAuth"]["scheme"], "bearer")
+        self.assertIn({"jwtAuth": []}, schema["paths"]["/api/me"]["get"]["security"])
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_connection_is_tuned(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite profili")
+        with connection.cursor() as cursor:
+            self.assertEqual(cursor.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+        # PRAGMA'lar istek sorgu sayacına girmez
+        from .signals import configure_sqlite
+
+        with CaptureQueriesContext(connection) as queries, override_settings(SQLITE_PRAGMAS={"busy_timeout": 5000}):
+            configure_sqlite(sender=type(connection), connection=connection)
+        self.assertEqual(len(queries), 0)
+        # journal_mode dosyaya kalıcı yazılır: yalnızca SQLITE_WAL=1 ile
+        from django.conf import settings
+        self.assertEqual("journal_mode" in settings.SQLITE_PRAGMAS, settings.SQLITE_WAL)
+
+class LessonRequestExportTests(APITestCase):
+    def setUp(self):
+        self.subject = Subject.objects.create(name="Math")
+        self.tutor = User.objects.create_user(email="ex_t@example.com", username="ex_t", password="pw-123456", role="tutor")
+        self.student = User.objects.create_user(email="ex_s@example.com", username="ex_s", password="pw-123456", role="student")
+        other = User.objects.create_user(email="ex_o@example.com", username="ex_o", password="pw-123456", role="student")
+        base = timezone.now() + timezone.timedelta(days=2)
+        for i, (student, status_) in enumerate([
+            (self.student, "pending"), (self.student, "approved"), (other, "pending"), (self.student, "rejected"),
+        ]):
+            LessonRequest.objects.create(
+                student=student, tutor=self.tutor, subject=self.subject, status=status_,
+                start_time=base + timezone.timedelta(hours=3 * i), duration_minutes=60, note=f'not, "{i}"',
+            )
+
+    def test_ndjson_matches_list_rows_and_scope(self):
+        self.client.force_authenticate(self.student)
+        res = self.client.get("/api/lesson-requests/export/")
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        listed = self.client.get("/api/lesson-requests/", {"limit": 100}).json()["results"]
+        self.assertEqual(rows, listed)
+        self.assertEqual(len(rows), 3)
+
+        res = self.client.get("/api/lesson-requests/export/", {"format": "ndjson", "status": "approved"})
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual([r["status"] for r in rows], ["approved"])
+
+    def test_csv_export(self):
+        import csv
+        self.client.force_authenticate(self.tutor)
+        res = self.client.get("/api/lesson-requests/export/", {"format": "csv", "role": "tutor"})
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn('filename="lesson-requests.csv"', res["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(b"".join(res.streaming_content).decode())))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]["note"], 'not, "0"')
+        self.assertEqual(rows[-1]["subject_name"], "Math")
+
+    def test_csv_export_neutralizes_formulas(self):
+        import csv
+        LessonRequest.objects.filter(tutor=self.tutor).update(note='=HYPERLINK("http://x","y")')
+        Subject.objects.filter(pk=self.subject.pk).update(name="@SUM(1)")
+        self.client.force_authenticate(self.tutor)
+        res = self.client.get("/api/lesson-requests/export/", {"format": "csv", "role": "tutor"})
+        row = next(csv.DictReader(io.StringIO(b"".join(res.streaming_content).decode())))
+        self.assertEqual(row["note"], '\'=HYPERLINK("http://x","y")')
+        self.assertEqual(row["subject_name"], "'@SUM(1)")
+        # NDJSON ham metni korur
+        res = self.client.get("/api/lesson-requests/export/", {"format": "ndjson", "role": "tutor"})
+        self.assertEqual(json.loads(next(iter(res.streaming_content)))["note"], '=HYPERLINK("http://x","y")')
+
+    def test_anonymous_is_rejected_in_requested_format(self):
+        res = self.client.get("/api/lesson-requests/export/", {"format": "csv"})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(res.content.startswith(b"detail"))
+
+
+class TutorStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.subject = Subject.objects.create(name="Chemistry")
+        self.tutor = User.objects.create_user(email="ts_t@example.com", username="ts_t", password="pw-123456", role="tutor")
+        self.other = User.objects.create_user(email="ts_o@example.com", username="ts_o", password="pw-123456", role="tutor")
+        self.student = User.objects.create_user(email="ts_s@example.com", username="ts_s", password="pw-123456", role="student")
+        for tutor in (self.tutor, self.other):
+            TutorProfile.objects.get_or_create(user=tutor)
+        self.base = timezone.now() + timezone.timedelta(days=3)
+
+    def make(self, tutor, n):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                LessonRequest.objects.create(
+                    student=self.student, tutor=tutor, subject=self.subject,
+                    start_time=self.base + timezone.timedelta(hours=2 * i), duration_minutes=60,
+                )
+                for i in range(n)
+            ]
+
+    def stats(self, tutor):
+        from .models import TutorStats
+        return TutorStats.objects.values(
+            "pending_count", "approved_count", "rejected_count", "responded_count",
+            "response_seconds_total", "approval_rate", "avg_response_seconds",
+        ).get(tutor=tutor)
+
+    def test_incremental_updates_match_rebuild(self):
+        first, second, third = self.make(self.tutor, 3)
+        self.client.force_authenticate(self.tutor)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(f"/api/lesson-requests/{first.id}/status/", {"status": "approved"}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            res = self.client.post("/api/lesson-requests/bulk-status/", {"items": [
+                {"id": second.id, "status": "rejected"}, {"id": third.id, "status": "approved"},
+            ]}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # Onay -> red geçişi tekrar yanıt sayılmaz
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/lesson-requests/{third.id}/", {"status": "rejected"}, format="json")
+        LessonRequest.objects.get(id=first.id).delete()
+
+        incremental = self.stats(self.tutor)
+        self.assertEqual(
+            (incremental["pending_count"], incremental["approved_count"], incremental["rejected_count"]), (0, 0, 2)
+        )
+        self.assertEqual(incremental["responded_count"], 2)
+        self.assertEqual(incremental["approval_rate"], 0.0)
+        call_command("rebuild_tutor_stats", stdout=io.StringIO())
+        self.assertEqual(self.stats(self.tutor), incremental)
+
+    def test_stats_roll_back_with_the_status_change(self):
+        from django.db import transaction
+        lr = self.make(self.tutor, 1)[0]
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            lr.status = LessonRequest.Status.APPROVED
+            lr.save()
+            raise RuntimeError
+        self.assertEqual(self.stats(self.tutor)["pending_count"], 1)
+        self.assertEqual(self.stats(self.tutor)["approved_count"], 0)
+
+    def test_detail_exposes_stats_and_is_invalidated(self):
+        lr = self.make(self.tutor, 2)[0]
+        url = f"/api/tutors/{self.tutor.id}/"
+        data = self.client.get(url).json()
+        self.assertEqual(data["stats"]["pending_count"], 2)
+        self.assertIsNone(data["stats"]["approval_rate"])
+
+        LessonRequest.objects.filter(id=lr.id).update(created_at=timezone.now() - timezone.timedelta(minutes=10))
+        lr.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            lr.status = LessonRequest.Status.APPROVED
+            lr.save(update_fields=["status"])
+        lr.refresh_from_db()
+        self.assertIsNotNone(lr.responded_at)
+        data = self.client.get(url).json()
+        self.assertEqual((data["stats"]["pending_count"], data["stats"]["approved_count"]), (1, 1))
+        self.assertEqual(data["stats"]["approval_rate"], 1.0)
+        self.assertGreaterEqual(data["stats"]["avg_response_seconds"], 599)
+        self.assertEqual(self.client.get(f"/api/async/tutors/{self.tutor.id}/").json(), data)
+
+    def test_ordering_by_stats(self):
+        approved = self.make(self.tutor, 2)
+        rejected = self.make(self.other, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            for lr in approved:
+                lr.status = LessonRequest.Status.APPROVED
+                lr.save()
+            rejected[0].status = LessonRequest.Status.REJECTED
+            rejected[0].save()
+        newcomer = User.objects.create_user(email="ts_n@example.com", username="ts_n", password="pw-123456", role="tutor")
+        TutorProfile.objects.get_or_create(user=newcomer)
+
+        def ids(ordering):
+            res = self.client.get("/api/tutors/", {"ordering": ordering})
+            return [row["id"] for row in res.json()["results"]]
+
+        self.assertEqual(ids("-approval_rate"), [self.tutor.id, self.other.id, newcomer.id])
+        self.assertEqual(ids("approval_rate"), [self.other.id, self.tutor.id, newcomer.id])
+        self.assertEqual(ids("-approved_count")[0], self.tutor.id)
+
+        # Sıralı liste cache'i istatistik değişince tazelenir
+        with self.captureOnCommitCallbacks(execute=True):
+            for lr in self.make(self.other, 3):
+                lr.status = LessonRequest.Status.APPROVED
+                lr.save()
+        self.assertEqual(ids("-approved_count")[0], self.other.id)
+
+
+@override_settings(RATING_PRIOR_MEAN=3.0, RATING_PRIOR_WEIGHT=2)
+class ReviewRatingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.subject = Subject.objects.create(name="Biology")
+        self.student = User.objects.create_user(email="rv_s@example.com", username="rv_s", password="pw-123456", role="student")
+        self.other_student = User.objects.create_user(email="rv_o@example.com", username="rv_o", password="pw-123456", role="student")
+        self.tutor = User.objects.create_user(email="rv_t@example.com", username="rv_t", password="pw-123456", role="tutor")
+        self.rival = User.objects.create_user(email="rv_r@example.com", username="rv_r", password="pw-123456", role="tutor")
+        TutorProfile.objects.get_or_create(user=self.tutor, defaults={"rating": "2.0"})
+        TutorProfile.objects.get_or_create(user=self.rival, defaults={"rating": "4.0"})
+        self.base = timezone.now() - timezone.timedelta(days=10)
+
+    def lesson(self, tutor=None, status_="approved", student=None, hours=0):
+        return LessonRequest.objects.create(
+            student=student or self.student, tutor=tutor or self.tutor, subject=self.subject, status=status_,
+            start_time=self.base + timezone.timedelta(hours=hours), duration_minutes=60,
+        )
+
+    def review(self, lesson, score, user=None):
+        self.client.force_authenticate(user or self.student)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/reviews/", {"lesson_request": lesson.id, "score": score}, format="json")
+
+    def profile(self, tutor=None):
+        return TutorProfile.objects.get(user=tutor or self.tutor)
+
+    def test_review_updates_running_totals(self):
+        self.assertEqual(self.review(self.lesson(hours=0), 5).status_code, status.HTTP_201_CREATED)
+        res = self.review(self.lesson(hours=2), 4)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, msg=res.data)
+        profile = self.profile()
+        self.assertEqual((profile.rating_sum, profile.rating_count), (9, 2))
+        self.assertEqual(str(profile.rating), "4.5")
+        # (C * m + toplam) / (C + adet) = (2 * 3 + 9) / 4
+        self.assertAlmostEqual(profile.rating_score, 3.75)
+
+        self.client.force_authenticate(self.student)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(f"/api/reviews/{res.data['id']}/", {"score": 2}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(str(self.profile().rating), "3.5")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.delete(f"/api/reviews/{res.data['id']}/")
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        profile = self.profile()
+        self.assertEqual((profile.rating_sum, profile.rating_count, str(profile.rating)), (5, 1, "5.0"))
+
+        detail = self.client.get(f"/api/tutors/{self.tutor.id}/").json()
+        self.assertEqual((detail["rating"], detail["rating_count"]), ("5.0", 1))
+        self.assertAlmostEqual(detail["rating_score"], 11 / 3)
+
+    def test_only_own_approved_lessons_once(self):
+        pending = self.lesson(status_="pending")
+        approved = self.lesson(hours=2)
+        self.assertEqual(self.review(pending, 5).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.review(approved, 5, user=self.other_student).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.review(approved, 6).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.review(approved, 5).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.review(approved, 4).status_code, status.HTTP_400_BAD_REQUEST)
+
+        # exists() kontrolünü eşzamanlı geçen ikinci POST: kısıt 500 değil 400 döner
+        from unittest import mock
+        from .serializers import ReviewSerializer
+        with mock.patch.object(ReviewSerializer, "validate_lesson_request", lambda self, value: value):
+            res = self.review(approved, 3)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("lesson_request", res.json())
+
+        self.client.force_authenticate(self.tutor)
+        self.assertEqual(self.review(self.lesson(hours=4), 5, user=self.tutor).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(None)
+        res = self.client.get("/api/reviews/", {"tutor": self.tutor.id})
+        self.assertEqual([r["score"] for r in res.json()["results"]], [5])
+
+    def test_ordering_uses_stored_rating(self):
+        # Yorumsuz tutor elle girilmiş puanını korur
+        self.assertEqual(self.client.get("/api/tutors/").json()["results"][0]["id"], self.rival.id)
+        self.review(self.lesson(hours=0), 5)
+        self.review(self.lesson(hours=2), 5)
+        ids = [r["id"] for r in self.client.get("/api/tutors/", {"ordering": "-rating"}).json()["results"]]
+        self.assertEqual(ids, [self.tutor.id, self.rival.id])
+        ids = [r["id"] for r in self.client.get("/api/tutors/", {"ordering": "-rating_score"}).json()["results"]]
+        self.assertEqual(ids, [self.tutor.id, self.rival.id])
+
+    def test_recompute_detects_and_fixes_drift(self):
+        self.review(self.lesson(hours=0), 4)
+        self.review(self.lesson(hours=2), 3)
+        out = io.StringIO()
+        call_command("recompute_ratings", "--fail-on-drift", stdout=out)
+        self.assertIn("0 kayma", out.getvalue())
+
+        TutorProfile.objects.filter(user=self.tutor).update(rating_sum=40, rating_count=9)
+        with self.assertRaises(CommandError):
+            call_command("recompute_ratings", "--dry-run", "--fail-on-drift", stdout=io.StringIO())
+        self.assertEqual(self.profile().rating_sum, 40)
+        out = io.StringIO()
+        call_command("recompute_ratings", stdout=out)
+        self.assertIn(f"tutor {self.tutor.id}: 40/9 -> 7/2", out.getvalue())
+        profile = self.profile()
+        self.assertEqual((profile.rating_sum, profile.rating_count, str(profile.rating)), (7, 2, "3.5"))
+        self.assertAlmostEqual(profile.rating_score, 13 / 4)
+
+    def test_schema_generation_does_not_need_tutor_param(self):
+        from .views import ReviewViewSet
+        view = ReviewViewSet(action="list", swagger_fake_view=True)
+        self.assertFalse(view.get_queryset().exists())
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class DeltaSyncTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.subject = Subject.objects.create(name="Geography")
+        self.tutor = User.objects.create_user(email="sy_t@example.com", username="sy_t", password="pw-123456", role="tutor")
+        TutorProfile.objects.get_or_create(user=self.tutor)
+        self.student = User.objects.create_user(email="sy_s@example.com", username="sy_s", password="pw-123456", role="student")
+        self.other = User.objects.create_user(email="sy_o@example.com", username="sy_o", password="pw-123456", role="student")
+        self.base = timezone.now() + timezone.timedelta(days=4)
+
+    def lesson(self, student=None, hours=0):
+        return LessonRequest.objects.create(
+            student=student or self.student, tutor=self.tutor, subject=self.subject,
+            start_time=self.base + timezone.timedelta(hours=hours), duration_minutes=60,
+        )
+
+    def sync(self, token=None, user=None, **params):
+        self.client.force_authenticate(user or self.student)
+        if token:
+            params["since"] = token
+        res = self.client.get("/api/sync", params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        return res.json()
+
+    def test_initial_then_incremental_changes_and_deletes(self):
+        mine = self.lesson()
+        theirs = self.lesson(student=self.other, hours=2)
+        feed = self.sync()
+        self.assertEqual([s["id"] for s in feed["subjects"]], [self.subject.id])
+        self.assertEqual([t["id"] for t in feed["tutors"]], [self.tutor.id])
+        self.assertEqual([lr["id"] for lr in feed["lesson_requests"]], [mine.id])
+        self.assertFalse(feed["has_more"])
+
+        # Değişiklik yoksa tek sorgu
+        with CaptureQueriesContext(connection) as queries:
+            warm = self.sync(feed["token"])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(warm["token"], feed["token"])
+        self.assertEqual(warm["lesson_requests"], [])
+
+        self.client.force_authenticate(self.tutor)
+        self.client.post("/api/lesson-requests/bulk-status/", {"items": [
+            {"id": mine.id, "status": "approved"}, {"id": theirs.id, "status": "rejected"},
+        ]}, format="json")
+        self.tutor.first_name = "Yeni"
+        self.tutor.save()
+        feed = self.sync(feed["token"])
+        self.assertEqual([(lr["id"], lr["status"]) for lr in feed["lesson_requests"]], [(mine.id, "approved")])
+        self.assertEqual([t["name"] for t in feed["tutors"]], ["Yeni"])
+
+        token, mine_id, theirs_id = feed["token"], mine.id, theirs.id
+        mine.delete()
+        theirs.delete()
+        feed = self.sync(token)
+        self.assertEqual(feed["deleted"], {"subjects": [], "tutors": [], "lesson_requests": [mine_id]})
+        self.assertEqual(self.sync(token, user=self.other)["deleted"]["lesson_requests"], [theirs_id])
+
+    def test_batches_do_not_lose_rows_with_equal_timestamps(self):
+        lessons = [self.lesson(hours=2 * i) for i in range(5)]
+        LessonRequest.objects.update(updated_at=timezone.now() - timezone.timedelta(seconds=5))
+        seen, token, pages = [], None, 0
+        while True:
+            feed = self.sync(token, limit=2)
+            seen += [lr["id"] for lr in feed["lesson_requests"]]
+            token, pages = feed["token"], pages + 1
+            if not feed["has_more"]:
+                break
+        self.assertEqual(sorted(seen), sorted(lr.id for lr in lessons))
+        self.assertEqual(pages, 4)
+
+    def test_bad_and_expired_tokens(self):
+        self.client.force_authenticate(self.student)
+        res = self.client.get("/api/sync", {"since": "nope"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.get("/api/sync", {"since": "1000000.0.1"})
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+        self.assertEqual(res.json()["code"], "resync_required")
+
+    def test_response_is_compressed(self):
+        for i in range(10):
+            self.lesson(hours=2 * i)
+        self.client.force_authenticate(self.student)
+        res = self.client.get("/api/sync", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        import gzip
+        self.assertEqual(len(json.loads(gzip.decompress(res.content))["lesson_requests"]), 10)
+
+
+class NotificationTests(APITestCase):
+    def setUp(self):
+        from .authentication import ClaimsAccessToken
+
+        cache.clear()
+        notifications._brokers.clear()
+        self.addCleanup(notifications._brokers.clear)
+        self.subject = Subject.objects.create(name="Chemistry")
+        self.tutor = User.objects.create_user(email="nt_t@example.com", username="nt_t", password="pw-123456", role="tutor")
+        TutorProfile.objects.get_or_create(user=self.tutor)
+        self.student = User.objects.create_user(email="nt_s@example.com", username="nt_s", password="pw-123456", role="student")
+        self.other = User.objects.create_user(email="nt_o@example.com", username="nt_o", password="pw-123456", role="student")
+        self.tokens = {u.id: str(ClaimsAccessToken.for_user(u)) for u in (self.tutor, self.student, self.other)}
+        self.base = timezone.now() + timezone.timedelta(days=5)
+
+    def lesson(self, hours=0):
+        return LessonRequest.objects.create(
+            student=self.student, tutor=self.tutor, subject=self.subject,
+            start_time=self.base + timezone.timedelta(hours=hours), duration_minutes=60,
+        )
+
+    def poll(self, user, **params):
+        params.setdefault("timeout", 0)
+        res = self.client.get("/api/notifications/poll", params, HTTP_AUTHORIZATION=f"Bearer {self.tokens[user.id]}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        return res.json()
+
+    def test_requires_authentication(self):
+        for path in ("/api/notifications/poll", "/api/notifications/stream"):
+            self.assertEqual(self.client.get(path).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_events_reach_both_parties_and_replay_after_id(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = self.lesson()
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.status = "approved"
+            lesson.save()
+
+        feed = self.poll(self.student, after=0)
+        self.assertEqual(
+            [(e["type"], e["lesson_request"]["previous_status"]) for e in feed["events"]],
+            [("lesson_request.created", None), ("lesson_request.status_changed", "pending")],
+        )
+        self.assertEqual(feed["last_event_id"], feed["events"][-1]["id"])
+        self.assertEqual(len(self.poll(self.tutor, after=0)["events"]), 2)
+        self.assertEqual(self.poll(self.other, after=0)["events"], [])
+        self.assertEqual(self.poll(self.student, after=feed["last_event_id"])["events"], [])
+        res = self.client.get("/api/notifications/poll", {"after": "x"}, HTTP_AUTHORIZATION=f"Bearer {self.tokens[self.student.id]}")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(NOTIFICATIONS_BROKER="database")
+    def test_database_broker_writes_in_transaction(self):
+        from .models import NotificationEvent
+
+        lessons = [self.lesson(hours=2 * i) for i in range(3)]
+        self.client.force_authenticate(self.tutor)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post("/api/lesson-requests/bulk-status/", {"items": [
+                {"id": lr.id, "status": "approved"} for lr in lessons
+            ]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        self.assertEqual(sum('INSERT INTO "core_notificationevent"' in q["sql"] for q in queries.captured_queries), 1)
+        # 3 oluşturma + 3 onay, her biri öğrenci ve tutor için
+        self.assertEqual(NotificationEvent.objects.count(), 12)
+        self.client.force_authenticate(None)
+
+        first = NotificationEvent.objects.filter(user_id=self.student.id).order_by("id")[3]
+        feed = self.poll(self.student, after=first.id - 1)
+        self.assertEqual([e["lesson_request"]["status"] for e in feed["events"]], ["approved"] * 3)
+
+    def test_database_poller_delivers_late_commits_once(self):
+        from .models import NotificationEvent
+
+        events = [NotificationEvent.objects.create(user_id=self.student.id, payload={"n": i}) for i in range(3)]
+        late_id = events[1].id
+        events[1].delete()
+        cursor = notifications.PollCursor.start(window=10)
+        self.assertEqual(cursor.fetch(), [])
+        # Daha düşük id'li olay, daha yüksek id okunduktan sonra commit oldu
+        NotificationEvent.objects.create(id=late_id, user_id=self.student.id, payload={"n": "late"})
+        new = NotificationEvent.objects.create(user_id=self.student.id, payload={"n": "new"})
+        self.assertEqual([row[0] for row in cursor.fetch()], [late_id, new.id])
+        self.assertEqual(cursor.fetch(), [])
+
+    async def test_long_poll_wakes_on_publish_and_stream_delivers(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        auth = {"authorization": f"Bearer {self.tokens[self.student.id]}"}
+        broker = notifications.get_broker()
+        event = notifications.lesson_request_event(
+            LessonRequest(id=7, student_id=self.student.id, tutor_id=self.tutor.id, status="rejected"), "pending",
+        )
+
+        async def subscribed():
+            while self.student.id not in broker._subscribers:
+                await asyncio.sleep(0.01)
+
+        waiting = asyncio.ensure_future(client.get("/api/notifications/poll", {"timeout": 5}, headers=auth))
+        await asyncio.wait_for(subscribed(), 5)
+        broker.dispatch([([self.student.id], event)])
+        res = await asyncio.wait_for(waiting, 5)
+        self.assertEqual([e["lesson_request"]["id"] for e in res.json()["events"]], [7])
+        first_id = res.json()["last_event_id"]
+
+        broker.dispatch([([self.student.id], event)])
+        res = await client.get("/api/notifications/stream", headers={**auth, "last-event-id": str(first_id)})
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        chunks = aiter(res.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+        self.assertIn(f"id: {first_id + 1}\nevent: lesson_request.status_changed".encode(), await anext(chunks))
+        broker.dispatch([([self.student.id], event)])
+        self.assertIn(f"id: {first_id + 2}\n".encode(), await asyncio.wait_for(anext(chunks), 5))
+        await chunks.aclose()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(APITestCase):
+    # "replica" testte primary'den bağımsız, boş bir DB: replikasyon hiç yetişmemiş gibi
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        from .authentication import ClaimsAccessToken
+
+        cache.clear()
+        self.subject = Subject.objects.create(name="Music")
+        self.tutor = User.objects.create_user(email="rr_t@example.com", username="rr_t", password="pw-123456", role="tutor")
+        TutorProfile.objects.get_or_create(user=self.tutor)
+        self.student = User.objects.create_user(email="rr_s@example.com", username="rr_s", password="pw-123456", role="student")
+        self.other = User.objects.create_user(email="rr_o@example.com", username="rr_o", password="pw-123456", role="student")
+        self.tokens = {u.id: f"Bearer {ClaimsAccessToken.for_user(u)}" for u in (self.student, self.other)}
+        LessonRequest.objects.create(
+            student=self.other, tutor=self.tutor, subject=self.subject,
+            start_time=timezone.now() + timezone.timedelta(days=3), duration_minutes=60,
+        )
+
+    def list_ids(self, user):
+        res = self.client.get("/api/lesson-requests/", HTTP_AUTHORIZATION=self.tokens[user.id])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [lr["id"] for lr in res.json()["results"]]
+
+    def test_reads_go_to_replica_until_client_writes(self):
+        # Yazmamış istemci replikadan okur (replikada henüz satır yok)
+        self.assertEqual(self.list_ids(self.other), [])
+
+        res = self.client.post("/api/lesson-requests/", {
+            "tutor_id": self.tutor.id, "subject_id": self.subject.id,
+            "start_time": (timezone.now() + timezone.timedelta(days=4)).isoformat(), "duration_minutes": 60,
+        }, format="json", HTTP_AUTHORIZATION=self.tokens[self.student.id])
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, msg=res.content)
+        self.assertIn("db_pin", res.cookies)
+        self.assertEqual(self.list_ids(self.student), [res.data["id"]])
+
+        # Cookie taşımayan istemci: kullanıcı başına cache pin'i
+        self.client.cookies.clear()
+        self.assertEqual(self.list_ids(self.student), [res.data["id"]])
+
+        cache.clear()
+        self.assertEqual(self.list_ids(self.student), [])
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_sync_reads_primary(self):
+        res = self.client.get("/api/sync", HTTP_AUTHORIZATION=self.tokens[self.other.id])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["lesson_requests"]), 1)
+
+    def test_auth_reads_primary(self):
+        from .authentication import DENYLIST_KEY
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.list_ids(self.other)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.is_active = False
+            self.other.save()
+        # Replika pasifleştirmeyi görmedi; deny-list yine de primary'den kurulur
+        cache.delete(DENYLIST_KEY)
+        res = self.client.get("/api/lesson-requests/", HTTP_AUTHORIZATION=self.tokens[self.other.id])
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Claim'siz token: kullanıcı satırı da primary'den
+        legacy = f"Bearer {AccessToken.for_user(self.student)}"
+        res = self.client.get("/api/lesson-requests/", HTTP_AUTHORIZATION=legacy)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_writes_and_background_reads_use_primary(self):
+        from .db_router import PrimaryReplicaRouter
+
+        router = PrimaryReplicaRouter()
+        self.assertIsNone(router.db_for_read(LessonRequest))
+        self.assertEqual(router.db_for_write(LessonRequest), "default")
+        self.assertEqual(LessonRequest.objects.count(), 1)
+
+
+class MeProfileTests(APITestCase):
+    def setUp(self):
+        from .authentication import ClaimsAccessToken
+
+        cache.clear()
+        self.math, self.physics, self.music = (Subject.objects.create(name=n) for n in ("Math", "Physics", "Music"))
+        self.tutor = User.objects.create_user(email="me_t@example.com", username="me_t", password="pw-123456", role="tutor")
+        profile, _ = TutorProfile.objects.get_or_create(user=self.tutor)
+        profile.subjects.set([self.math, self.physics])
+        self.student = User.objects.create_user(email="me_s@example.com", username="me_s", password="pw-123456", role="student")
+        StudentProfile.objects.get_or_create(user=self.student)
+        self.auth = {u.id: f"Bearer {ClaimsAccessToken.for_user(u)}" for u in (self.tutor, self.student)}
+
+    def me(self, user, method="get", data=None, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)("/api/me", data, format="json", HTTP_AUTHORIZATION=self.auth[user.id], **headers)
+
+    def test_patch_diffs_subjects_and_builds_response_in_memory(self):
+        self.me(self.tutor)  # deny-list ve alan cache'i ısınsın
+        with CaptureQueriesContext(connection) as queries:
+            res = self.me(self.tutor, "patch", {"bio": "yeni", "subjects": [self.physics.id, self.music.id, 999]})
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        self.assertEqual(res.data["tutorprofile"]["bio"], "yeni")
+        self.assertEqual([s["name"] for s in res.data["tutorprofile"]["subjects"]], ["Music", "Physics"])
+
+        through = connection.ops.quote_name(TutorProfile.subjects.through._meta.db_table)
+        sql = [q["sql"] for q in queries.captured_queries]
+        self.assertEqual(sum(s.startswith("DELETE") and through in s for s in sql), 1)
+        self.assertEqual(sum(s.startswith("INSERT") and through in s for s in sql), 1)
+        # Farkı çıkaran okuma + cevap için tek prefetch; profil yeniden okunmaz
+        self.assertEqual(sum(s.startswith("SELECT") and 'FROM "core_subject"' in s for s in sql), 2)
+        self.assertEqual(
+            sorted(self.tutor.tutorprofile.subjects.values_list("name", flat=True)), ["Music", "Physics"],
+        )
+        res = self.client.get("/api/tutors/", {"subject": self.music.id})
+        self.assertEqual([t["id"] for t in res.json()["results"]], [self.tutor.id])
+
+        # Değişiklik yoksa yazma yok
+        with CaptureQueriesContext(connection) as queries:
+            self.me(self.tutor, "patch", {"subjects": [self.physics.id, self.music.id]})
+        self.assertFalse(any(through in q["sql"] and not q["sql"].startswith("SELECT") for q in queries.captured_queries))
+
+    # Eşzamanlı yazmayı taklit eden sorgu view bütçesine sayılır
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_patch_tolerates_concurrent_subject_add(self):
+        from django.db.models.signals import m2m_changed
+
+        through = TutorProfile.subjects.through
+
+        def concurrent_add(action, instance, touch_profile=True, **kwargs):
+            # Aynı subject'i ekleyen eşzamanlı PATCH fark okunduktan sonra commit etti
+            if action == "pre_add":
+                self.assertFalse(touch_profile)
+                through.objects.create(tutorprofile_id=instance.pk, subject_id=self.music.id)
+
+        m2m_changed.connect(concurrent_add, sender=through, dispatch_uid="test.concurrent_add")
+        self.addCleanup(m2m_changed.disconnect, sender=through, dispatch_uid="test.concurrent_add")
+        res = self.me(self.tutor, "patch", {"subjects": [self.math.id, self.music.id]})
+        self.assertEqual(res.status_code, status.HTTP_200_OK, msg=res.content)
+        self.assertEqual([s["name"] for s in res.data["tutorprofile"]["subjects"]], ["Math", "Music"])
+
+    def test_conditional_get(self):
+        res = self.me(self.student)
+        etag = res["ETag"]
+        self.assertEqual(res["Cache-Control"], "private, no-cache")
+        with CaptureQueriesContext(connection) as queries:
+            res = self.me(self.student, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 0)
+
+        res = self.me(self.student, "patch", {"grade_level": "11"})
+        self.assertEqual(res.data["studentprofile"], {"grade_level": "11"})
+        res = self.me(self.student, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.me(self.student, HTTP_IF_NONE_MATCH=res["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Tutor: subject adı ve puan değişimi de ETag'i değiştirir
+        etag = self.me(self.tutor)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math.name = "Mathematics"
+            self.math.save()
+        self.assertEqual(self.me(self.tutor, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class TutorRecommendationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.math = Subject.objects.create(name="Math")
+        self.physics = Subject.objects.create(name="Physics")
+        self.student = User.objects.create_user(email="rec_s@example.com", username="rec_s", password="pw-123456", role="student")
+        self.booked = self.make_tutor("booked", 100, "4.0", [self.math])
+        self.pricey = self.make_tutor("pricey", 1000, "4.0", [self.math])
+        self.physicist = self.make_tutor("physicist", 100, "5.0", [self.physics])
+        with self.captureOnCommitCallbacks(execute=True):
+            LessonRequest.objects.create(
+                student=self.student, tutor=self.booked, subject=self.math,
+                start_time=timezone.now() + timezone.timedelta(days=2), duration_minutes=60,
+            )
+        self.client.force_authenticate(self.student)
+
+    def make_tutor(self, name, rate, rating, subjects):
+        with self.captureOnCommitCallbacks(execute=True):
+            tutor = User.objects.create_user(
+                email=f"rec_{name}@example.com", username=f"rec_{name}", password="pw-123456", role="tutor"
+            )
+            profile, _ = TutorProfile.objects.get_or_create(user=tutor)
+            profile.hourly_rate, profile.rating = rate, rating
+            profile.save()
+            profile.subjects.set(subjects)
+        return tutor
+
+    def recommended(self, **params):
+        res = self.client.get("/api/tutors/recommended/", params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_ranks_by_subject_price_and_rating(self):
+        from .recommendations import orm_ranking
+        data = self.recommended()
+        self.assertEqual(data["count"], 3)
+        ids = [row["id"] for row in data["results"]]
+        self.assertEqual(ids, [self.booked.id, self.pricey.id, self.physicist.id])
+        self.assertEqual(ids, [uid for uid, _ in orm_ranking(self.student.id)])
+        first = data["results"][0]
+        self.assertEqual(first["subjects"], [{"id": self.math.id, "name": "Math"}])
+        self.assertEqual(first["hourly_rate"], 100)
+        scores = [row["score"] for row in data["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_pagination_is_stable(self):
+        page = self.recommended(limit=2, offset=1)
+        self.assertEqual([row["id"] for row in page["results"]], [self.pricey.id, self.physicist.id])
+        self.assertIsNone(page["next"])
+
+    def test_profile_changes_are_applied_incrementally(self):
+        from .recommendations import snapshot
+        self.recommended()
+        built_at = snapshot._built_at
+        newcomer = self.make_tutor("newcomer", 100, "5.0", [self.math])
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(id=self.pricey.id).delete()
+        ids = [row["id"] for row in self.recommended()["results"]]
+        self.assertEqual(ids, [newcomer.id, self.booked.id, self.physicist.id])
+        # Değişiklik günlüğünden uygulandı, yeniden kurulmadı
+        self.assertEqual(snapshot._built_at, built_at)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer.tutorprofile.subjects.set([self.physics])
+        ids = [row["id"] for row in self.recommended()["results"]]
+        self.assertEqual(ids[0], self.booked.id)
+
+    def test_other_process_replays_the_change_log(self):
+        from .recommendations import TutorSnapshot
+        other = TutorSnapshot()
+        other._load()
+        built_at = other._built_at
+        with self.captureOnCommitCallbacks(execute=True):
+            TutorProfile.objects.filter(user=self.pricey).get().save()
+            self.pricey.tutorprofile.subjects.add(self.physics)
+        ranking = other.rank({self.physics.id: 1}, {})
+        self.assertEqual([uid for uid, _ in ranking[:2]], [self.physicist.id, self.pricey.id])
+        self.assertEqual(other._built_at, built_at)
+
+    def test_students_only(self):
+        self.client.force_authenticate(self.booked)
+        self.assertEqual(self.client.get("/api/tutors/recommended/").status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(None)
+        self.assertIn(
+            self.client.get("/api/tutors/recommended/").status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+
+class TutorFacetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.math = Subject.objects.create(name="Math")
+        self.physics = Subject.objects.create(name="Physics")
+        self.tutors = []
+        for i, (rate, rating, subjects) in enumerate([
+            (200, "4.8", [self.math]),
+            (600, "3.5", [self.math, self.physics]),
+            (1600, "4.2", [self.physics]),
+        ]):
+            user = User.objects.create_user(
+                email=f"fc{i}@example.com", username=f"fc{i}", first_name="Facet", password="testpass123", role="tutor"
+            )
+            tp = TutorProfile.objects.create(user=user, hourly_rate=rate, rating=rating)
+            tp.subjects.set(subjects)
+            self.tutors.append(user)
+
+    def facets(self, **params):
+        res = self.client.get("/api/tutors/", {"facets": "subject,hourly_rate,rating", **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data["facets"]
+
+    def test_response_cache_keys_on_facets(self):
+        url = "/api/tutors/"
+        for order in (["", "subject", "rating", "rating,subject"], ["rating,subject", "subject", "", "rating"]):
+            cache.clear()
+            for _ in range(2):  # ikinci tur cache'ten
+                for value in order:
+                    body = self.client.get(url, {"facets": value} if value else {}).json()
+                    expected = sorted(value.split(",")) if value else []
+                    self.assertEqual(sorted(body.get("facets", {})), expected, msg=(order, value))
+
+    def test_counts_for_filtered_result_set(self):
+        data = self.facets()
+        self.assertEqual(data["subject"], [
+            {"id": self.math.id, "name": "Math", "count": 2},
+            {"id": self.physics.id, "name": "Physics", "count": 2},
+        ])
+        self.assertEqual([b["count"] for b in data["hourly_rate"]], [1, 0, 1, 0, 0, 1])
+        self.assertEqual(data["hourly_rate"][-1], {"min": 1500, "max": None, "count": 1})
+        self.assertEqual([b["count"] for b in data["rating"]], [0, 0, 0, 1, 1, 1])
+
+        data = self.facets(subject=self.physics.id)
+        self.assertEqual([(row["name"], row["count"]) for row in data["subject"]], [("Physics", 2), ("Math", 1)])
+        self.assertEqual(sum(b["count"] for b in data["hourly_rate"]), 2)
+        self.assertEqual(self.facets(search="nomatch")["subject"], [])
+        self.assertEqual(sum(b["count"] for b in self.facets(search="facet")["rating"]), 3)
+
+    def test_single_query_and_shared_across_pages(self):
+        from . import facets
+        with CaptureQueriesContext(connection) as ctx:
+            facets.compute(User.objects.filter(role="tutor"), ["hourly_rate", "rating", "subject"])
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.facets(limit=1)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.facets(limit=2, ordering="-hourly_rate")
+        # Sayfa yeni, fasetler filtre kümesi cache'inden
+        self.assertFalse(any("GROUP BY" in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(data["subject"][0]["count"], 2)
+
+    def test_invalidated_on_profile_change(self):
+        self.facets()
+        with self.captureOnCommitCallbacks(execute=True):
+            tp = self.tutors[0].tutorprofile
+            tp.hourly_rate = 1200
+            tp.save()
+        self.assertEqual([b["count"] for b in self.facets()["hourly_rate"]], [0, 0, 1, 0, 1, 1])
+
+    def test_unknown_facet_is_rejected(self):
+        res = self.client.get("/api/tutors/", {"facets": "subject,colour"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("facets", res.data)
+
+    def test_pages_without_facets_are_unchanged(self):
+        res = self.client.get("/api/tutors/")
+        self.assertNotIn("facets", res.data)
+
+
+class PasswordHashingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="hash@example.com", username="hash", password="pw-123456", role="student"
+        )
+
+    def login(self, password="pw-123456"):
+        return self.client.post("/api/auth/login", {"email": "hash@example.com", "password": password}, format="json")
+
+    def test_register_and_login(self):
+        res = self.client.post("/api/auth/register", {
+            "email": "new@example.com", "username": "new", "password": "pw-123456", "role": "tutor",
+        }, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.json()["role"], "tutor")
+        self.assertTrue(User.objects.get(email="new@example.com").check_password("pw-123456"))
+        self.assertTrue(TutorProfile.objects.filter(user__email="new@example.com").exists())
+
+        res = self.client.post("/api/auth/register", {
+            "email": "new@example.com", "username": "new2", "password": "pw-123456", "role": "tutor",
+        }, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", res.json())
+
+        self.assertEqual(set(self.login().json()), {"access", "refresh"})
+
+    def test_invalid_credentials(self):
+        res = self.login("wrong-password")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res["WWW-Authenticate"], 'Bearer realm="api"')
+        res = self.client.post("/api/auth/login", {"email": "nobody@example.com", "password": "x"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        res = self.client.post("/api/auth/login", {"email": "hash@example.com"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", res.json())
+
+    @override_settings(PASSWORD_HASH_MAX_PENDING=1)
+    def test_saturated_pool_returns_503(self):
+        from . import hashing
+        _, slots = hashing.pool._current()
+        slots.acquire()
+        try:
+            res = self.login()
+        finally:
+            slots.release()
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res["Retry-After"], "1")
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        from django.contrib.auth.hashers import make_password
+        User.objects.filter(pk=self.user.pk).update(password=make_password("pw-123456", hasher="pbkdf2_sha1"))
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        # Aynı parola: mevcut token'lar geçerli kalır
+        self.assertEqual(user.profile_version, self.user.profile_version)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_process_pool(self):
+        from . import hashing
+        self.addCleanup(hashing.pool.shutdown)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login("wrong-password").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_and_register_are_throttled(self):
+        for _ in range(5):
+            self.assertEqual(self.login("wrong-password").status_code, status.HTTP_401_UNAUTHORIZED)
+        res = self.login()
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(700 <= int(res["Retry-After"]) <= 720)
+        # Email kovası IP'den bağımsız: başka adresten de aynı hesaba deneme yok
+        res = self.client.post("/api/auth/login", {"email": "HASH@example.com", "password": "x"},
+                               format="json", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        for i in range(6):
+            res = self.client.post("/api/auth/register", {
+                "email": f"thr{i}@example.com", "username": f"thr{i}", "password": "pw-123456", "role": "student",
+            }, format="json")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+        self.assertEqual(User.objects.filter(email__startswith="thr").count(), 5)
+
+    def test_auth_endpoints_in_schema(self):
+        paths = self.client.get("/api/schema/", {"format": "json"}).json()["paths"]
+        self.assertEqual(paths["/api/auth/register"]["post"]["operationId"], "auth_register")
+        login = paths["/api/auth/login"]["post"]
+        self.assertEqual(login["operationId"], "auth_login")
+        self.assertEqual(set(login["responses"]), {"200", "400", "401", "429", "503"})
+        # Şema view'ı yalnızca belge: doğrudan çağrılırsa 405
+        from rest_framework.test import APIRequestFactory
+        from .schema import LoginSchemaView
+        res = LoginSchemaView.as_view()(APIRequestFactory().post("/", {}, format="json"))
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class LessonRequestArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            email="ar-student@example.com", username="ar-student", password="pw-123456", role="student"
+        )
+        self.tutor = User.objects.create_user(
+            email="ar-tutor@example.com", username="ar-tutor", password="pw-123456", role="tutor"
+        )
+        subject = Subject.objects.create(name="History")
+        now = timezone.now()
+        self.lessons = []
+        # 6 eski (biri yorumlu), 4 güncel; created_at'ler karışık sırada
+        for i in range(10):
+            days = 400 if i % 5 < 3 else 3
+            lr = LessonRequest.objects.create(
+                student=self.student, tutor=self.tutor, subject=subject, duration_minutes=60,
+                start_time=now - timezone.timedelta(days=days), status="approved" if i % 2 else "rejected",
+            )
+            LessonRequest.objects.filter(pk=lr.pk).update(created_at=now - timezone.timedelta(hours=(i * 7) % 10))
+            self.lessons.append(lr)
+        from .models import Review
+        self.reviewed = self.lessons[1]
+        Review.objects.create(lesson_request=self.reviewed, student=self.student, tutor=self.tutor, score=5)
+        self.old_ids = {lr.id for i, lr in enumerate(self.lessons) if i % 5 < 3} - {self.reviewed.id}
+        self.client.force_authenticate(self.student)
+
+    def ids(self, url, **params):
+        return [row["id"] for row in self.client.get(url, params).json()["results"]]
+
+    def stats(self):
+        from .models import TutorStats
+        return TutorStats.objects.values("approved_count", "rejected_count", "responded_count").get(tutor=self.tutor)
+
+    def test_archive_runs_in_resumable_batches(self):
+        from .models import ArchivedLessonRequest, Tombstone
+        before = self.stats()
+        out = io.StringIO()
+        call_command("archive_lesson_requests", "--dry-run", stdout=out)
+        self.assertIn("5 talep", out.getvalue())
+        # Yarıda kesilen koşu: sonraki koşu kalanları taşır
+        call_command("archive_lesson_requests", "--batch-size", "2", "--max-batches", "1", stdout=io.StringIO())
+        self.assertEqual(ArchivedLessonRequest.objects.count(), 2)
+        call_command("archive_lesson_requests", "--batch-size", "2", stdout=io.StringIO())
+
+        self.assertEqual(set(ArchivedLessonRequest.objects.values_list("id", flat=True)), self.old_ids)
+        self.assertFalse(LessonRequest.objects.filter(id__in=self.old_ids).exists())
+        self.assertTrue(LessonRequest.objects.filter(id=self.reviewed.id).exists())
+        archived = ArchivedLessonRequest.objects.get(id=min(self.old_ids))
+        original = next(lr for lr in self.lessons if lr.id == archived.id)
+        self.assertEqual((archived.status, archived.end_time), (original.status, original.end_time))
+        # Sinyalsiz: sayaçlar ve sync tombstone'ları değişmez; rebuild arşivi de sayar
+        self.assertEqual(self.stats(), before)
+        self.assertFalse(Tombstone.objects.exists())
+        from . import tutor_stats
+        tutor_stats.rebuild([self.tutor.id])
+        self.assertEqual(self.stats(), before)
+
+    def test_list_reads_hot_table_unless_include_archived(self):
+        url = "/api/lesson-requests/"
+        expected = self.ids(url, limit=100)
+        exported = [json.loads(line)["id"] for line in b"".join(
+            self.client.get(f"{url}export/", {"format": "ndjson"}).streaming_content
+        ).decode().splitlines()]
+        call_command("archive_lesson_requests", stdout=io.StringIO())
+
+        self.assertEqual(set(self.ids(url, limit=100)), set(expected) - self.old_ids)
+        # Birleşik liste: sıra ve cursor sayfaları arşivlemeden öncekiyle aynı
+        seen, next_url = [], f"{url}?include_archived=1&limit=3"
+        while next_url:
+            page = self.client.get(next_url).json()
+            seen.extend(row["id"] for row in page["results"])
+            next_url = page["next"]
+        self.assertEqual(seen, expected)
+        back = self.client.get(self.client.get(f"{url}?include_archived=1&limit=3").json()["next"]).json()
+        self.assertEqual(self.ids(back["previous"]), expected[:3])
+
+        res = self.client.get(url, {"include_archived": "1", "pagination": "offset", "limit": 4, "offset": 4})
+        self.assertEqual(res.json()["count"], 10)
+        self.assertEqual([row["id"] for row in res.json()["results"]], expected[4:8])
+        archived_row = next(row for row in self.client.get(url, {"include_archived": "1", "limit": 100}).json()["results"]
+                            if row["id"] in self.old_ids)
+        self.assertEqual(archived_row["student_email"], self.student.email)
+        self.assertEqual(archived_row["subject"]["name"], "History")
+
+        res = self.client.get(f"{url}export/", {"format": "ndjson", "include_archived": "1"})
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], exported)
+
+    def test_archived_rows_keep_recommendation_history(self):
+        from . import recommendations
+        before = recommendations.student_history(self.student.id)
+        call_command("archive_lesson_requests", stdout=io.StringIO())
+        self.assertEqual(recommendations.student_history(self.student.id), before)
@@ -1,8 +1,123 @@
 # core/throttling.py
+"""
+Süreçler arası paylaşılan, GCRA (generic cell rate algorithm) tabanlı throttle.
+
+SimpleRateThrottle anahtar başına zaman damgası listesi tutar (her istekte oku-değiştir-yaz,
+locmem'de süreç başına ayrı sayaç). GCRA ise anahtar başına tek bir sayı saklar:
+TAT (theoretical arrival time). "N/period" oranı için:
+  interval = period / N,  pencere = period
+  yeni_tat = max(tat, şimdi) + interval;  yeni_tat - pencere > şimdi ise reddet
+Bu, art arda en fazla N isteğe izin verir, sonra her `interval`de bir yenisi açılır.
+Bekleme süresi (Retry-After) doğrudan hesaplanır: yeni_tat - pencere - şimdi.
+
+Depolar (settings.THROTTLE_STORE):
+- "redis": tek Lua script, Redis saatine göre atomik (REDIS_URL varsa varsayılan)
+- "db": ThrottleBucket tablosunda tek koşullu UPDATE (Redis yoksa varsayılan)
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 from rest_framework.throttling import SimpleRateThrottle
 
+from . import db_router
+from .models import ThrottleBucket
+
+GCRA_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local new_tat = tat + interval
+local wait = new_tat - window - now
+if wait > 0 then
+  return {0, tostring(wait)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+class RedisThrottleStore:
+    key_prefix = "throttle:gcra:"
+
+    def __init__(self):
+        # django.core.cache.backends.redis.RedisCache'in bağlantı havuzunu paylaş
+        client = cache._cache.get_client(write=True)
+        self.script = client.register_script(GCRA_LUA)
+
+    def hit(self, key, interval, window, now):
+        allowed, wait = self.script(keys=[self.key_prefix + key], args=[interval, window])
+        return bool(int(allowed)), float(wait)
+
+
+class DatabaseThrottleStore:
+    # Süresi dolmuş kovaların temizliği: süreç başına en fazla bu aralıkla bir kez
+    prune_interval = 60.0
+
+    def __init__(self):
+        self.next_prune = 0.0
+
+    def hit(self, key, interval, window, now):
+        # tat <= şimdi + pencere - interval  <=>  max(tat, şimdi) + interval - pencere <= şimdi
+        updated = ThrottleBucket.objects.filter(key=key, tat__lte=now + window - interval).update(
+            tat=Greatest(F("tat"), Value(now)) + interval
+        )
+        if updated:
+            return True, 0.0
+
+        # Ya anahtar yok (ilk istek) ya da limit dolu
+        try:
+            with transaction.atomic():
+                ThrottleBucket.objects.create(key=key, tat=now + interval)
+        except IntegrityError:
+            # GET isteklerinde okuma replikaya gider; gecikmeli kova limiti atlatmasın
+            with db_router.primary():
+                tat = ThrottleBucket.objects.filter(key=key).values_list("tat", flat=True).first()
+            if tat is None:
+                # Arada temizlendi; baştan dene
+                return self.hit(key, interval, window, now)
+            return False, max(0.0, tat + interval - window - now)
+
+        if now >= self.next_prune:
+            self.next_prune = now + self.prune_interval
+            ThrottleBucket.objects.filter(tat__lt=now).delete()
+        return True, 0.0
+
+
+STORES = {"redis": RedisThrottleStore, "db": DatabaseThrottleStore}
+_stores = {}
 
-class LessonRequestThrottle(SimpleRateThrottle):
+
+def get_store():
+    name = getattr(settings, "THROTTLE_STORE", "db")
+    if name not in _stores:
+        _stores[name] = STORES[name]()
+    return _stores[name]
+
+
+class GCRAThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle'ın oran/anahtar ayrıştırmasını kullanır; sayaç GCRA deposunda."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        window = float(self.duration)
+        interval = window / self.num_requests
+        allowed, self._wait = get_store().hit(self.key, interval, window, self.timer())
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class LessonRequestThrottle(GCRAThrottle):
     """
     Kullanıcı (auth ise user.pk, değilse IP) başına,
     SADECE ders talebi oluşturma (create/POST) işlemlerini rate limit eder.
@@ -23,3 +138,24 @@ class LessonRequestThrottle(SimpleRateThrottle):
         if not (is_create_action or is_post):
             return True
         return super().allow_request(request, view)
+
+
+class AuthThrottle(GCRAThrottle):
+    """
+    Kayıt / giriş (DRF dışı async view'lar, core/async_views.py): IP başına ve girişte
+    email başına ayrı kova. Kovalardan biri doluysa istek reddedilir; hash'e geçilmez.
+    """
+    scope = "auth"
+
+    def allow(self, request, action, *idents):
+        window = float(self.duration)
+        interval = window / self.num_requests
+        now = self.timer()
+        self._wait = 0.0
+        allowed = True
+        for ident in (self.get_ident(request), *idents):
+            key = self.cache_format % {"scope": self.scope, "ident": f"{action}:{ident}"}
+            ok, wait = get_store().hit(key, interval, window, now)
+            if not ok:
+                allowed, self._wait = False, max(self._wait, wait)
+        return allowed
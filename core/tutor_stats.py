@@ -0,0 +1,171 @@
+# core/tutor_stats.py
+"""
+TutorStats bakımı (tutor başına talep sayıları, onay oranı, ortalama yanıt süresi).
+
+- Artımlı: LessonRequest oluşturma / status değişimi / silme, kaydı yapan
+  transaction içinde tek bir F-ifadeli UPDATE ile sayaçları kaydırır (bkz. core/signals.py).
+  Oran ve ortalama aynı UPDATE'te yeni sayaçlardan hesaplanır; okuma tarafında
+  GROUP BY yok, sıralama indeksli kolonlar üzerinden.
+- Toplu: bulk_update / import gibi sinyalsiz yollar `apply` ya da `rebuild` çağırır;
+  `python manage.py rebuild_tutor_stats` her şeyi LessonRequest + ArchivedLessonRequest'ten
+  yeniden kurar (arşivleme sayaçlara dokunmaz; core/archive.py).
+
+Response cache: tutor detayı `tutor:<id>`, istatistiğe göre sıralanan listeler
+`tutor_stats` versiyonuna bağlı; rebuild ikisini de kapsayan `tutor_stats:rebuild`'i artırır.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Greatest, NullIf
+
+from . import recommendations, response_cache
+from .models import ArchivedLessonRequest, LessonRequest, TutorStats, User
+
+STATUS_FIELDS = {
+    LessonRequest.Status.PENDING: "pending_count",
+    LessonRequest.Status.APPROVED: "approved_count",
+    LessonRequest.Status.REJECTED: "rejected_count",
+}
+# ?ordering anahtarı -> TutorStats kolonu (TutorViewSet)
+ORDERING_FIELDS = {
+    "approval_rate": "approval_rate",
+    "response_time": "avg_response_seconds",
+    "approved_count": "approved_count",
+}
+
+
+class Delta(Counter):
+    """Sayaç farkları: {"pending_count": -1, "approved_count": 1, ...}"""
+
+    def transition(self, old_status, new_status):
+        if old_status is not None:
+            self[STATUS_FIELDS[old_status]] -= 1
+        if new_status is not None:
+            self[STATUS_FIELDS[new_status]] += 1
+        return self
+
+    def responded(self, lesson_request, sign=1):
+        if lesson_request.responded_at is not None:
+            seconds = (lesson_request.responded_at - lesson_request.created_at).total_seconds()
+            self["responded_count"] += sign
+            self["response_seconds_total"] += sign * max(int(seconds), 0)
+        return self
+
+
+def _ratio(numerator, denominator):
+    return Cast(numerator, FloatField()) / NullIf(denominator, 0)
+
+
+def apply(tutor_id, delta, create=True):
+    """
+    Farkları tek UPDATE ile uygular. Satır normalde tutor oluşturulurken açılır;
+    yoksa (eski veri, sonradan tutor olan kullanıcı) tutor'un istatistiği LessonRequest'ten
+    kurulur. `create=False` ise (silme) atlanır.
+    """
+    delta = {name: value for name, value in delta.items() if value}
+    if not delta:
+        return
+    # Sinyalsiz yollardan (bulk_create vb.) kalan kayma sayaçları negatife itmesin;
+    # bir sonraki rebuild düzeltir
+    new = {name: Greatest(F(name) + delta.get(name, 0), Value(0)) for name in (
+        "pending_count", "approved_count", "rejected_count", "responded_count", "response_seconds_total",
+    )}
+    updated = TutorStats.objects.filter(tutor_id=tutor_id).update(
+        **{name: new[name] for name in delta},
+        approval_rate=_ratio(new["approved_count"], new["approved_count"] + new["rejected_count"]),
+        avg_response_seconds=_ratio(new["response_seconds_total"], new["responded_count"]),
+    )
+    if not updated and create:
+        try:
+            with transaction.atomic():
+                rebuild([tutor_id], bump=False)
+        except IntegrityError:
+            # Eşzamanlı ilk talep satırı bizden önce oluşturdu
+            return apply(tutor_id, delta, create=False)
+    response_cache.bump_on_commit(f"tutor:{tutor_id}", "tutor_stats")
+    recommendations.snapshot.mark_changed([tutor_id])
+
+
+def ensure_rows(tutor_ids):
+    """Yeni tutor'lar için boş satır (var olanlara dokunmaz)."""
+    TutorStats.objects.bulk_create([TutorStats(tutor_id=tid) for tid in tutor_ids], ignore_conflicts=True)
+
+
+def aggregate(*querysets):
+    """tutor_id -> TutorStats alanları (queryset başına tek GROUP BY sorgusu; sıcak + arşiv)."""
+    responded = Q(responded_at__isnull=False)
+    totals = {}
+    for queryset in querysets:
+        for row in queryset.values("tutor_id").order_by().annotate(
+            pending=Count("id", filter=Q(status=LessonRequest.Status.PENDING)),
+            approved=Count("id", filter=Q(status=LessonRequest.Status.APPROVED)),
+            rejected=Count("id", filter=Q(status=LessonRequest.Status.REJECTED)),
+            responded=Count("id", filter=responded),
+            response_total=Sum(
+                ExpressionWrapper(F("responded_at") - F("created_at"), output_field=DurationField()),
+                filter=responded,
+            ),
+        ):
+            total = totals.setdefault(row["tutor_id"], Counter())
+            total.update({
+                "pending": row["pending"], "approved": row["approved"], "rejected": row["rejected"],
+                "responded": row["responded"],
+                "seconds": int(row["response_total"].total_seconds()) if row["response_total"] else 0,
+            })
+    result = {}
+    for tutor_id, row in totals.items():
+        decided = row["approved"] + row["rejected"]
+        seconds = row["seconds"]
+        result[tutor_id] = dict(
+            pending_count=row["pending"],
+            approved_count=row["approved"],
+            rejected_count=row["rejected"],
+            responded_count=row["responded"],
+            response_seconds_total=seconds,
+            approval_rate=row["approved"] / decided if decided else None,
+            avg_response_seconds=seconds / row["responded"] if row["responded"] else None,
+        )
+    return result
+
+
+@transaction.atomic
+def rebuild(tutor_ids=None, batch_size=1000, bump=True):
+    """Verilen (ya da tüm) tutor'ların satırlarını LessonRequest'ten yeniden kurar; satır sayısı döner."""
+    tutors = User.objects.filter(role=User.Role.TUTOR)
+    requests = LessonRequest.objects.all()
+    # Arşivlenmiş talepler de sayılır: sayaçlar ömür boyu (core/archive.py)
+    archived = ArchivedLessonRequest.objects.all()
+    existing = TutorStats.objects.all()
+    if tutor_ids is not None:
+        tutor_ids = list(tutor_ids)
+        tutors = tutors.filter(id__in=tutor_ids)
+        requests = requests.filter(tutor_id__in=tutor_ids)
+        archived = archived.filter(tutor_id__in=tutor_ids)
+        existing = existing.filter(tutor_id__in=tutor_ids)
+
+    stats = aggregate(requests, archived)
+    existing.delete()
+    # Talebi olmayan tutor'lar da sıfır satırla: sayaç sıralamasında NULL'a düşmesinler
+    rows = [TutorStats(tutor_id=tid, **stats.get(tid, {})) for tid in tutors.values_list("id", flat=True)]
+    TutorStats.objects.bulk_create(rows, batch_size=batch_size)
+    if bump:
+        response_cache.bump_on_commit("tutor_stats:rebuild", "tutor_stats")
+        recommendations.snapshot.invalidate()
+    return len(rows)
+
+
+def stats_repr(stats):
+    """API çıktısı; satırı olmayan tutor için sıfır/null."""
+    if stats is None:
+        return {
+            "pending_count": 0, "approved_count": 0, "rejected_count": 0,
+            "approval_rate": None, "avg_response_seconds": None,
+        }
+    return {
+        "pending_count": stats.pending_count,
+        "approved_count": stats.approved_count,
+        "rejected_count": stats.rejected_count,
+        "approval_rate": stats.approval_rate,
+        "avg_response_seconds": stats.avg_response_seconds,
+    }
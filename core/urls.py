@@ -1,15 +1,27 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RegisterView, LoginView, MeView, SubjectViewSet, TutorViewSet, LessonRequestViewSet
+from . import async_views
+from .views import MeView, SubjectViewSet, TutorViewSet, LessonRequestViewSet, ReviewViewSet, SyncView
 
 router = DefaultRouter()
 router.register("subjects", SubjectViewSet, basename="subject")
 router.register("tutors", TutorViewSet, basename="tutor")
 router.register("lesson-requests", LessonRequestViewSet, basename="lesson-request")
+router.register("reviews", ReviewViewSet, basename="review")
 
 urlpatterns = [
-    path("auth/register", RegisterView.as_view(), name="register"),
-    path("auth/login", LoginView.as_view(), name="login"),
+    # Parola hash'i süreç havuzunda (core/hashing.py); ASGI altında event loop'u tutmaz
+    path("auth/register", async_views.register, name="register"),
+    path("auth/login", async_views.login, name="login"),
     path("me", MeView.as_view(), name="me"),
+    path("sync", SyncView.as_view(), name="sync"),
+    # ASGI-native okuma yolu (core/async_views.py); sync router uç noktalarıyla aynı cevaplar
+    path("async/tutors/", async_views.tutor_list, name="async-tutor-list"),
+    path("async/tutors/<int:id>/", async_views.tutor_detail, name="async-tutor-detail"),
+    path("async/subjects/", async_views.subject_list, name="async-subject-list"),
+    path("async/subjects/<int:id>/", async_views.subject_detail, name="async-subject-detail"),
+    # Bildirimler (ASGI altında çalıştırın; config/asgi.py)
+    path("notifications/stream", async_views.notification_stream, name="notification-stream"),
+    path("notifications/poll", async_views.notification_poll, name="notification-poll"),
     path("", include(router.urls)),
 ]
@@ -1,15 +1,27 @@
 # core/views.py
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
 from rest_framework import viewsets, mixins, permissions, generics, status
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.decorators import action
-from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .models import Subject, LessonRequest
+from . import archive, availability, facets, recommendations, response_cache, search, sync, tutor_stats
+from .export import CSVRenderer, NDJSONRenderer, stream_csv, stream_ndjson
+from .models import ArchivedLessonRequest, Subject, TutorProfile, LessonRequest, Review
+from .pagination import LessonRequestPagination
+from .permissions import IsStudent
+from .response_cache import CachedResponseMixin
+from .subject_index import subject_index
 from .serializers import (
-    RegisterSerializer,
     SubjectSerializer,
     TutorMiniSerializer,
     TutorDetailSerializer,
@@ -18,43 +30,36 @@ from .serializers import (
     LessonRequestCreateSerializer,
     LessonRequestListSerializer,
     LessonRequestStatusSerializer,
+    LessonRequestBulkStatusSerializer,
+    ReviewSerializer,
+    current_field_timezone,
+    datetime_repr,
 )
 
 User = get_user_model()
 
 
-# -------------------------
-# Auth
-# -------------------------
-class RegisterView(generics.CreateAPIView):
-    """
-    POST /api/auth/register
-    body: { email, username, role: student|tutor, password }
-    """
-    serializer_class = RegisterSerializer
-    permission_classes = [permissions.AllowAny]
-
-
-class LoginView(TokenObtainPairView):
-    """
-    POST /api/auth/login
-    body: { email, password }
-    response: { access, refresh }
-    """
-    permission_classes = [permissions.AllowAny]
-
-
 # -------------------------
 # Me (profil)
 # -------------------------
 class MeView(generics.GenericAPIView):
     """
-    GET /api/me
-    PATCH /api/me
+    GET /api/me   (ETag; If-None-Match eşleşirse sorgusuz 304)
+    PATCH /api/me (cevap güncellenen nesnelerden, yeniden okuma yok)
     """
     permission_classes = [permissions.IsAuthenticated]
+    # İstek başına azami SQL sorgusu (JWT ile kullanıcı yükleme dahil); bkz. core/instrumentation.py.
+    # PATCH: subject farkı (oku + DELETE + INSERT) ve arama dokümanı yenilemesi dahil en kötü durum
+    query_budget = {"get": 3, "patch": 15}
+    # ETag versiyonu primary'deki son yazmayı gösterir; gövde replikadan eski gelmesin
+    replica_reads = False
 
     def get(self, request):
+        # Versiyon sorgudan önce okunur: araya yazma girerse ETag eski kalır, istemci bir sonraki
+        # istekte yeniden 200 alır (tersi eski gövdeyi yeni ETag'le sabitlerdi)
+        etag = response_cache.etag_for(response_cache.me_versions(request.user.pk))
+        if response_cache.etag_matches(request, etag):
+            return self.with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
         # N+1 önleme: profil ve subjects'i tek hamlede getir
         user = (
             User.objects.filter(id=request.user.id)
@@ -62,97 +67,248 @@ class MeView(generics.GenericAPIView):
             .prefetch_related("tutorprofile__subjects")
             .get()
         )
-        return Response(MeSerializer(user).data)
+        return self.with_etag(Response(MeSerializer(user).data), etag)
 
     def patch(self, request):
         ser = MeUpdateSerializer(data=request.data, partial=True)
         ser.is_valid(raise_exception=True)
-        ser.update(request.user, ser.validated_data)
+        # Kullanıcı ve profil tek sorguda; güncelleme ve cevap bu nesnelerden
+        users = User.objects.filter(id=request.user.id).select_related("tutorprofile", "studentprofile")
+        if "subjects" not in ser.validated_data:
+            # Değişiyorsa yeni liste set_subjects'te prefetch edilir
+            users = users.prefetch_related("tutorprofile__subjects")
+        user = ser.update(users.get(), ser.validated_data)
+        # Versiyon commit'te artırıldı (on_commit); yeni ETag bir sonraki GET'te 304 verir
+        etag = response_cache.etag_for(response_cache.me_versions(user.pk))
+        return self.with_etag(Response(MeSerializer(user).data, status=status.HTTP_200_OK), etag)
 
-        # Güncel değeri optimize şekilde tekrar oku
-        user = (
-            User.objects.filter(id=request.user.id)
-            .select_related("tutorprofile", "studentprofile")
-            .prefetch_related("tutorprofile__subjects")
-            .get()
-        )
-        return Response(MeSerializer(user).data, status=status.HTTP_200_OK)
+    @staticmethod
+    def with_etag(response, etag):
+        response["ETag"] = etag
+        # Kullanıcıya özel: paylaşımlı cache'lerde tutulmasın, her açılışta doğrulansın
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
 
 # -------------------------
 # Subject
 # -------------------------
-class SubjectViewSet(mixins.ListModelMixin,
+class SubjectViewSet(CachedResponseMixin,
+                     mixins.ListModelMixin,
                      mixins.RetrieveModelMixin,
                      viewsets.GenericViewSet):
     """
     GET /api/subjects
     GET /api/subjects/{id}
+    (response cache + ETag; bkz. core/response_cache.py)
     """
     queryset = Subject.objects.all().order_by("name")
     serializer_class = SubjectSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "id"
+    cache_query_params = ("limit", "offset")
+
+    def get_cache_versions(self):
+        return ["subjects"]
 
 
 # -------------------------
 # Tutors
 # -------------------------
-class TutorViewSet(mixins.ListModelMixin,
+def tutor_queryset(params):
+    """
+    Tutor list/detail queryset'i (sync TutorViewSet ve core/async_views.py ortak kullanır).
+    N+1 önleme:
+    - O2O: tutorprofile -> select_related (detay ayrıca stats)
+    - M2M: tutorprofile.subjects -> prefetch_related
+    """
+    qs = (
+        User.objects.filter(role="tutor")
+        .select_related("tutorprofile")
+        .prefetch_related("tutorprofile__subjects")
+    )
+
+    # Filtreler: ?subject=1,3 (herhangi biri) / &subject_mode=all (hepsi)
+    subject_ids = parse_subject_ids(params)
+    if subject_ids:
+        match_all = params.get("subject_mode") == "all"
+        qs = filter_by_subjects(qs, subject_ids, match_all)
+
+    # Arama: önceden hesaplanmış doküman üzerinden (bkz. core/search.py)
+    query = params.get("search")
+    if query:
+        qs = search.search_tutors(qs, query)
+
+    # Sıralama (güvenli harita)
+    requested = params.get("ordering")
+    if query and not requested:
+        # Arama varken varsayılan sıra: alaka düzeyi
+        return search.order_by_relevance(qs)
+    requested = requested or "-rating"
+    safe_order_map = {
+        "rating": "tutorprofile__rating",
+        "-rating": "-tutorprofile__rating",
+        "hourly_rate": "tutorprofile__hourly_rate",
+        "-hourly_rate": "-tutorprofile__hourly_rate",
+        "id": "id",
+        "-id": "-id",
+        # Bayes düzeltmeli puan (core/ratings.py); yorumu olmayanlar sonda
+        "rating_score": F("tutorprofile__rating_score").asc(nulls_last=True),
+        "-rating_score": F("tutorprofile__rating_score").desc(nulls_last=True),
+    }
+    # Materialize edilmiş istatistikler (TutorStats, indeksli); satırı olmayanlar sonda
+    for key, column in tutor_stats.ORDERING_FIELDS.items():
+        safe_order_map[key] = F(f"stats__{column}").asc(nulls_last=True)
+        safe_order_map[f"-{key}"] = F(f"stats__{column}").desc(nulls_last=True)
+    ordering = safe_order_map.get(requested, "-tutorprofile__rating")
+    # Filtreler id__in/tekil join ile çözüldüğü için DISTINCT gerekmiyor
+    return qs.order_by(ordering)
+
+
+def parse_subject_ids(params):
+    raw = params.get("subject")
+    if not raw:
+        return []
+    try:
+        return sorted({int(part) for part in raw.split(",") if part.strip()})
+    except ValueError:
+        raise ValidationError({"subject": "Expected a subject id or comma separated ids."})
+
+
+def filter_by_subjects(qs, subject_ids, match_all):
+    """
+    Subject -> tutor indeksi (core/subject_index.py) ile id__in; M2M join + DISTINCT yok.
+    Küme çok büyükse parametre limitine takılmamak için through tablosuna alt sorgu.
+    """
+    tutor_ids = subject_index.tutor_ids(subject_ids, match_all=match_all)
+    if len(tutor_ids) <= settings.SUBJECT_INDEX_MAX_IN:
+        return qs.filter(id__in=tutor_ids)
+
+    through = TutorProfile.subjects.through.objects
+    if match_all:
+        for sid in subject_ids:
+            qs = qs.filter(id__in=through.filter(subject_id=sid).values("tutorprofile__user_id"))
+        return qs
+    return qs.filter(
+        id__in=through.filter(subject_id__in=subject_ids).values("tutorprofile__user_id")
+    )
+
+
+class TutorViewSet(CachedResponseMixin,
+                   mixins.ListModelMixin,
                    mixins.RetrieveModelMixin,
                    viewsets.GenericViewSet):
     """
-    GET /api/tutors?subject=<id>&ordering=-rating&search=<q>
+    GET /api/tutors?subject=<id>[,<id>...]&subject_mode=any|all&ordering=-rating&search=<q>
+        &facets=subject,hourly_rate,rating (sayfayla birlikte sonuç kümesinin faset sayıları; core/facets.py)
+        (ordering: rating, rating_score, hourly_rate, id, approval_rate, response_time, approved_count;
+         '-' ile azalan)
+        (search verilip ordering verilmezse alaka düzeyine göre sıralanır)
     GET /api/tutors/{id}
+    GET /api/tutors/{id}/availability?from=&to=
+    GET /api/tutors/recommended?limit=&offset= (öğrenciye göre sıralı; bkz. core/recommendations.py)
+    (list/retrieve: response cache + ETag; bkz. core/response_cache.py)
     """
     permission_classes = [permissions.AllowAny]
     lookup_field = "id"
+    # facets: cevaba yalnızca cache kaçırıldığında eklenir, anahtarda olmalı
+    cache_query_params = ("subject", "subject_mode", "search", "ordering", "limit", "offset", "facets")
+    # Sayfa boyutundan bağımsız olmalı (N+1 olursa aşılır)
+    # recommended: geçmiş + sayfa + subjects, snapshot değişiklik günlüğünü uygularsa +2
+    query_budget = {"list": 5, "retrieve": 4, "availability": 3, "recommended": 5}
 
-    def get_queryset(self):
-        """
-        N+1 önleme:
-        - O2O: tutorprofile -> select_related
-        - M2M: tutorprofile.subjects -> prefetch_related
-        """
-        qs = (
-            User.objects.filter(role="tutor")
-            .select_related("tutorprofile")
-            .prefetch_related("tutorprofile__subjects")
-        )
-
-        # Filtreler
-        subject_id = self.request.query_params.get("subject")
-        if subject_id:
-            qs = qs.filter(tutorprofile__subjects__id=subject_id)
-
-        search = self.request.query_params.get("search")
-        if search:
-            qs = qs.filter(
-                Q(username__icontains=search)
-                | Q(first_name__icontains=search)
-                | Q(last_name__icontains=search)
-                | Q(email__icontains=search)
-                | Q(tutorprofile__bio__icontains=search)
-            )
+    def get_cache_versions(self):
+        # Subject adları her tutor cevabında gömülü
+        if self.action == "retrieve":
+            return ["subjects", "tutor_stats:rebuild", f"tutor:{self.kwargs.get(self.lookup_field)}"]
+        ordering = self.request.query_params.get("ordering", "").lstrip("-")
+        if ordering in tutor_stats.ORDERING_FIELDS:
+            # Sıra her talep/status değişiminde kayabilir
+            return ["subjects", "tutors", "tutor_stats"]
+        return ["subjects", "tutors"]
 
-        # Sıralama (güvenli harita)
-        requested = self.request.query_params.get("ordering") or "-rating"
-        safe_order_map = {
-            "rating": "tutorprofile__rating",
-            "-rating": "-tutorprofile__rating",
-            "hourly_rate": "tutorprofile__hourly_rate",
-            "-hourly_rate": "-tutorprofile__hourly_rate",
-            "id": "id",
-            "-id": "-id",
-        }
-        ordering = safe_order_map.get(requested, "-tutorprofile__rating")
-        return qs.order_by(ordering).distinct()
+    def get_queryset(self):
+        qs = tutor_queryset(self.request.query_params)
+        if self.action == "retrieve":
+            qs = qs.select_related("stats")
+        return qs
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return TutorDetailSerializer
         return TutorMiniSerializer
 
+    def list(self, request, *args, **kwargs):
+        # Geçersiz faset adı cache'e ve sayfa sorgusuna gitmeden 400
+        self.facet_names = facets.parse_facets(request.query_params)
+        return super().list(request, *args, **kwargs)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.action == "list" and self.facet_names:
+            response.data["facets"] = facets.cached(self.request, self.get_queryset(), self.facet_names)
+        return response
+
+    @action(methods=["get"], detail=True, url_path="availability")
+    def availability(self, request, id=None):
+        """
+        GET /api/tutors/{id}/availability?from=<iso>&to=<iso>
+        Onaylı derslerden birleştirilmiş dolu aralıklar ve aradaki boş slotlar.
+        Varsayılan pencere: şimdiden itibaren 7 gün, en fazla 31 gün.
+        """
+        # generics sürümü geçersiz id'yi (ValueError) 404'e çevirir
+        tutor = generics.get_object_or_404(User, id=id, role=User.Role.TUTOR)
+        start = self.parse_window_param("from") or timezone.now()
+        end = self.parse_window_param("to") or start + timedelta(days=7)
+        if end <= start:
+            raise ValidationError({"to": "Must be later than 'from'."})
+        if end - start > timedelta(days=31):
+            raise ValidationError({"to": "Window must not exceed 31 days."})
+
+        busy, free = availability.free_slots(tutor.id, start, end)
+        tz = current_field_timezone()
+
+        def fmt(intervals):
+            return [{"start": datetime_repr(s, tz), "end": datetime_repr(e, tz)} for s, e in intervals]
+
+        return Response({
+            "tutor_id": tutor.id,
+            "from": datetime_repr(start, tz),
+            "to": datetime_repr(end, tz),
+            "busy": fmt(busy),
+            "free": fmt(free),
+        })
+
+    @action(methods=["get"], detail=False, url_path="recommended", permission_classes=[IsStudent])
+    def recommended(self, request):
+        """
+        Tüm tutor'lar çağıran öğrencinin geçmişine göre puanlanır (NumPy snapshot);
+        sayfadaki tutor'lar liste satırı + "score" olarak döner. Öğrenciye özel: cache'lenmez.
+        """
+        page = self.paginate_queryset(recommendations.recommend(request.user.id))
+        scores = dict(page)
+        users = {u.id: u for u in tutor_queryset({}).filter(id__in=scores).order_by()}
+        ordered = [users[uid] for uid in scores if uid in users]
+        rows = self.get_serializer(ordered, many=True).data
+        for row in rows:
+            row["score"] = round(scores[row["id"]], 4)
+        return self.get_paginated_response(rows)
+
+    def parse_window_param(self, name):
+        raw = self.request.query_params.get(name)
+        if not raw:
+            return None
+        try:
+            value = parse_datetime(raw)
+        except ValueError:
+            # Biçimi doğru ama aralık dışı (ay 13 vb.)
+            value = None
+        if value is None:
+            raise ValidationError({name: "Expected an ISO 8601 datetime."})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
 
 # -------------------------
 # Lesson Requests
@@ -164,19 +320,44 @@ class LessonRequestViewSet(mixins.ListModelMixin,
                            viewsets.GenericViewSet):
     """
     GET /api/lesson-requests?role=student|tutor&status=pending|approved|rejected
+        (varsayılan cursor sayfalama; eski istemciler: &pagination=offset;
+        arşivlenmiş eski talepler de: &include_archived=1)
     POST /api/lesson-requests
     PATCH /api/lesson-requests/{id} (sadece ilgili tutor status günceller)
+    POST /api/lesson-requests/bulk-status (toplu status geçişi, sadece ilgili tutor)
+    GET /api/lesson-requests/export?format=ndjson|csv (akışlı tam dışa aktarım)
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = LessonRequestPagination
     lookup_field = "id"
+    # bulk_status kalem sayısından bağımsız sabit sayıda sorgu yapar;
+    # yazma yolları TutorStats için +1 UPDATE ve database bildirim broker'ı için +1 INSERT içerir
+    query_budget = {
+        # include_archived: sayfa satırları iki tablodan ayrı ayrı okunur
+        "list": 4,
+        "retrieve": 2,
+        "create": 13,
+        "partial_update": 12,
+        "update": 12,
+        "set_status": 10,
+        "bulk_status": 8,
+        # Satırlar cevap akarken okunur; burada yalnızca auth
+        "export": 1,
+    }
 
     def get_queryset(self):
         """
         N+1 önleme:
         - FK: student, tutor, subject -> select_related
         """
-        base = LessonRequest.objects.select_related("student", "tutor", "subject")
+        qs = self.scope(LessonRequest.objects.select_related("student", "tutor", "subject"))
+        # ?include_archived=1: list/export arşivle birleşik (core/archive.py)
+        if self.action in ("list", "export") and archive.include_archived(self.request):
+            archived = self.scope(ArchivedLessonRequest.objects.select_related("student", "tutor", "subject"))
+            return archive.CombinedLessonRequests(qs, archived)
+        return qs
 
+    def scope(self, base):
         user = self.request.user
         role_q = self.request.query_params.get("role")
 
@@ -193,24 +374,62 @@ class LessonRequestViewSet(mixins.ListModelMixin,
         if status_q:
             qs = qs.filter(status=status_q)
 
-        return qs.order_by("-created_at")
+        # (status, created_at) index'i ile uyumlu; id eşitlikte sırayı sabitler
+        return qs.order_by("-created_at", "-id")
 
     def get_serializer_class(self):
         if self.action == "create":
             return LessonRequestCreateSerializer
         if self.action in ("update", "partial_update"):
             return LessonRequestStatusSerializer
+        if self.action == "bulk_status":
+            return LessonRequestBulkStatusSerializer
         return LessonRequestListSerializer
 
     def perform_update(self, serializer):
         """
         Status güncelleme yetkisi: sadece ilgili 'tutor' kullanıcı.
+        (Status değişimi bildirimi LessonRequest post_save'inde; core/notifications.py)
         """
         instance = self.get_object()
         if self.request.user != instance.tutor:
             raise PermissionDenied("Only the related tutor can update the status.")
         serializer.save()
 
+    @action(
+        methods=["get"], detail=False, url_path="export",
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+    )
+    def export(self, request):
+        """
+        GET /api/lesson-requests/export?format=ndjson|csv[&role=..&status=..&include_archived=1]
+        Tüm geçmişi sayfalamadan akıtır; kapsam list ile aynı (get_queryset).
+        """
+        qs = self.get_queryset()
+        tz = current_field_timezone()
+        if request.accepted_renderer.format == "csv":
+            stream, filename = stream_csv(qs, tz), "lesson-requests.csv"
+        else:
+            stream, filename = stream_ndjson(qs, tz), "lesson-requests.ndjson"
+        response = StreamingHttpResponse(stream, content_type=request.accepted_renderer.media_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(methods=["post"], detail=False, url_path="bulk-status", throttle_classes=[])
+    def bulk_status(self, request):
+        """
+        POST /api/lesson-requests/bulk-status
+        body: { "items": [ {"id": 1, "status": "approved"}, ... ] }
+        response: { "results": [ {"id": 1, "ok": true, "status": "approved"},
+                                 {"id": 2, "ok": false, "error": "..."} ] }
+        Sadece isteği yapan tutor'a ait kayıtlar değişir; diğer id'ler "Not found." döner.
+        """
+        if request.user.role != User.Role.TUTOR:
+            raise PermissionDenied("Only tutors can update lesson request statuses.")
+        ser = LessonRequestBulkStatusSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        return Response({"results": ser.save(tutor=request.user)}, status=status.HTTP_200_OK)
+
     # Opsiyonel: ayrı bir status endpoint'i de istersen
     @action(methods=["patch"], detail=True, url_path="status")
     def set_status(self, request, id=None):
@@ -226,3 +445,89 @@ class LessonRequestViewSet(mixins.ListModelMixin,
             .get(id=instance.id)
         )
         return Response(LessonRequestListSerializer(refreshed).data, status=status.HTTP_200_OK)
+
+
+# -------------------------
+# Reviews
+# -------------------------
+class ReviewViewSet(mixins.ListModelMixin,
+                    mixins.CreateModelMixin,
+                    mixins.UpdateModelMixin,
+                    mixins.DestroyModelMixin,
+                    viewsets.GenericViewSet):
+    """
+    GET    /api/reviews?tutor=<id>   (herkese açık; tutor verilmezse öğrencinin kendi yorumları)
+    POST   /api/reviews              (student, onaylanmış kendi dersi için)
+    PATCH  /api/reviews/{id}         (yorum sahibi)
+    DELETE /api/reviews/{id}         (yorum sahibi)
+    Tutor puanı yorumla aynı transaction'da güncellenir (core/ratings.py).
+    """
+    serializer_class = ReviewSerializer
+    lookup_field = "id"
+    http_method_names = ["get", "post", "patch", "delete", "head", "options"]
+    # Ders başına tek yorum zaten sınır; ders talebi kotasından düşmesin
+    throttle_classes = []
+    # create: ders talebi, tekrar kontrolü, INSERT + savepoint (eşzamanlı tekrar), puan UPDATE
+    query_budget = {"list": 2, "create": 6, "partial_update": 3, "destroy": 3}
+
+    def get_permissions(self):
+        if self.action == "list":
+            return [permissions.AllowAny()]
+        return [IsStudent()]
+
+    def get_queryset(self):
+        qs = Review.objects.order_by("-created_at", "-id")
+        if getattr(self, "swagger_fake_view", False):
+            # Şema üretimi (drf-spectacular): istek parametresi yok
+            return qs.none()
+        if self.action != "list":
+            return qs.filter(student=self.request.user)
+        tutor = self.request.query_params.get("tutor")
+        if tutor:
+            try:
+                return qs.filter(tutor_id=int(tutor))
+            except ValueError:
+                raise ValidationError({"tutor": "Expected a tutor id."})
+        if self.request.user.is_authenticated:
+            return qs.filter(student=self.request.user)
+        raise ValidationError({"tutor": "This query parameter is required."})
+
+
+# -------------------------
+# Delta sync (mobil)
+# -------------------------
+@method_decorator(gzip_page, name="dispatch")
+class SyncView(generics.GenericAPIView):
+    """
+    GET /api/sync?since=<token>&limit=<n>
+    response: { "token": "...", "has_more": false,
+                "subjects": [...], "tutors": [...], "lesson_requests": [...],
+                "deleted": {"subjects": [id..], "tutors": [id..], "lesson_requests": [id..]} }
+    İlk çağrıda `since` verilmez; sonraki çağrılarda dönen token kullanılır,
+    has_more false olana kadar devam edilir. 410 -> token çok eski, baştan senkronize ol.
+    Satırlar liste uç noktalarıyla aynı şekildedir (bkz. core/sync.py).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    # Birleşik değişiklik sorgusu + tür başına satır okuma (+ saatlik tombstone budaması)
+    query_budget = 7
+    # Replika gecikmesi token'ın satır atlamasına yol açar (core/db_router.py)
+    replica_reads = False
+
+    def get(self, request):
+        try:
+            since = sync.decode_token(request.query_params.get("since"))
+        except sync.InvalidToken as exc:
+            raise ValidationError({"since": str(exc)})
+        limit = request.query_params.get("limit") or settings.SYNC_BATCH_SIZE
+        try:
+            limit = min(max(int(limit), 1), settings.SYNC_BATCH_SIZE)
+        except ValueError:
+            raise ValidationError({"limit": "Expected an integer."})
+        try:
+            feed = sync.build_feed(request.user, since, limit)
+        except sync.TokenExpired:
+            return Response(
+                {"detail": "Sync token expired; resync from scratch.", "code": "resync_required"},
+                status=status.HTTP_410_GONE,
+            )
+        return Response(feed)
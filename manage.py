@@ -7,6 +7,9 @@ import sys
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    if sys.argv[1:2] == ['test']:
+        # Test ayarları (config/settings.py TESTING)
+        os.environ.setdefault('DJANGO_TESTING', '1')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: